@@ -1,8 +1,21 @@
 import os
+import hashlib
+import secrets
+import time
+import asyncio
 import yaml
 import httpx
-from fastapi import FastAPI, Depends, HTTPException, Path, Query, File, UploadFile
-from fastapi.responses import JSONResponse
+from typing import Optional
+from urllib.parse import urlsplit
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _YamlLoader
+
+from fastapi import FastAPI, Depends, HTTPException, Path, Query, File, UploadFile, Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
 from backend.auth import get_current_user
 from backend.models import (
     WorkspaceCreateRequest,
@@ -18,31 +31,68 @@ from backend.k8s_client import (
     delete_kubedev_environment,
     scale_deployment,
     delete_namespace,
+    POOL_MAXSIZE,
+    USER_LABEL,
+    user_label_value,
 )
 
 
-app = FastAPI(title="KubeDev Auto System API", version="0.2.0")
+app = FastAPI(title="KubeDev Auto System API", version="0.2.0", default_response_class=ORJSONResponse)
+
+# Namespace holding the KubeDevEnvironment CRs
+CTRL_NS = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
+
+# Shared client so .gitpod.yml fetches reuse pooled connections
+_http_client = httpx.AsyncClient(timeout=5.0)
+
+
+@app.on_event("shutdown")
+async def _close_http_client():
+    await _http_client.aclose()
+
+
+# Parsed .gitpod.yml per raw URL: {raw_url: (expires_at, etag, parsed)}
+# Repos without a .gitpod.yml are cached as {} for a shorter TTL.
+GITPOD_CACHE_TTL = 300.0
+GITPOD_NEGATIVE_CACHE_TTL = 60.0
+GITPOD_CACHE_MAXSIZE = 1024
+_gitpod_cache: dict[str, tuple[float, Optional[str], dict]] = {}
+
 
+def _store_gitpod_cache(raw_url: str, ttl: float, etag: Optional[str], parsed: dict):
+    _gitpod_cache.pop(raw_url, None)
+    if len(_gitpod_cache) >= GITPOD_CACHE_MAXSIZE:
+        _gitpod_cache.pop(next(iter(_gitpod_cache)))
+    _gitpod_cache[raw_url] = (time.monotonic() + ttl, etag, parsed)
 
-def parse_gitpod_yaml(repo_url: str):
+
+async def parse_gitpod_yaml(repo_url: str):
     # Very thin subset: image, tasks.command, ports
+    url = urlsplit(repo_url)
+    path = url.path.removesuffix('.git')
+    if url.hostname == 'github.com':
+        raw_url = f"https://raw.githubusercontent.com{path}/HEAD/.gitpod.yml"
+    elif url.hostname == 'gitlab.com':
+        raw_url = f"https://gitlab.com{path}/-/raw/HEAD/.gitpod.yml"
+    else:
+        return {}
     try:
-        if repo_url.endswith('.git'):
-            raw_base = repo_url[:-4]
-        else:
-            raw_base = repo_url
-        if 'github.com' in raw_base:
-            parts = raw_base.split('github.com/')[-1]
-            raw_url = f"https://raw.githubusercontent.com/{parts}/HEAD/.gitpod.yml"
-        elif 'gitlab.com' in raw_base:
-            parts = raw_base.split('gitlab.com/')[-1]
-            raw_url = f"https://gitlab.com/{parts}/-/raw/HEAD/.gitpod.yml"
-        else:
-            return {}
-        r = httpx.get(raw_url, timeout=5.0)
+        cached = _gitpod_cache.get(raw_url)
+        headers = {}
+        if cached:
+            expires_at, etag, parsed = cached
+            if time.monotonic() < expires_at:
+                return parsed
+            if etag:
+                headers['If-None-Match'] = etag
+        r = await _http_client.get(raw_url, headers=headers)
+        if r.status_code == 304 and cached:
+            _store_gitpod_cache(raw_url, GITPOD_CACHE_TTL, cached[1], cached[2])
+            return cached[2]
         if r.status_code != 200:
+            _store_gitpod_cache(raw_url, GITPOD_NEGATIVE_CACHE_TTL, None, {})
             return {}
-        data = yaml.safe_load(r.text) or {}
+        data = yaml.load(r.content, Loader=_YamlLoader) or {}
         out = {}
         if isinstance(data.get('image'), str):
             out['image'] = data['image']
@@ -63,6 +113,7 @@ def parse_gitpod_yaml(repo_url: str):
                     out['ports'].append(p)
                 elif isinstance(p, dict) and isinstance(p.get('port'), int):
                     out['ports'].append(p['port'])
+        _store_gitpod_cache(raw_url, GITPOD_CACHE_TTL, r.headers.get('etag'), out)
         return out
     except Exception:
         return {}
@@ -70,7 +121,6 @@ def parse_gitpod_yaml(repo_url: str):
 
 @app.post("/me/workspaces", response_model=WorkspaceCreateResponse)
 async def create_workspace(payload: WorkspaceCreateRequest, user=Depends(get_current_user)):
-    ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
     env_name = f"env-{user['id']}-{payload.name}"
 
     spec = {
@@ -85,7 +135,7 @@ async def create_workspace(payload: WorkspaceCreateRequest, user=Depends(get_cur
     spec = {k: v for k, v in spec.items() if v is not None}
 
     if payload.gitpod_compat and payload.git_repository:
-        compat = parse_gitpod_yaml(str(payload.git_repository))
+        compat = await parse_gitpod_yaml(str(payload.git_repository))
         for k, v in compat.items():
             if k == 'commands':
                 spec.setdefault('commands', {})
@@ -97,79 +147,102 @@ async def create_workspace(payload: WorkspaceCreateRequest, user=Depends(get_cur
             else:
                 spec.setdefault(k, v)
 
-    created = create_kubedev_environment(env_name, ctrl_ns, spec)
+    created = await asyncio.to_thread(create_kubedev_environment, env_name, CTRL_NS, spec)
     status = created.get('status') or {}
     return WorkspaceCreateResponse(id=env_name, status=status.get('phase', 'Pending'), namespace=status.get('namespace'), ideUrl=status.get('ideUrl'))
 
 
+def _workspaces_etag(items: list[dict]) -> str:
+    digest = hashlib.blake2b(
+        b"|".join(
+            f"{it['metadata']['name']}:{it['metadata'].get('resourceVersion', '')}".encode()
+            for it in sorted(items, key=lambda it: it['metadata']['name'])
+        ),
+        digest_size=16,
+    ).hexdigest()
+    return f'"{digest}"'
+
+
+_WORKSPACE_ITEMS = TypeAdapter(list[WorkspaceItem])
+
+
+def _workspace_item(it: dict) -> dict:
+    spec = it.get('spec', {})
+    st = it.get('status', {})
+    return {
+        "id": it['metadata']['name'],
+        "userName": spec.get('userName', ''),
+        "status": st.get('phase'),
+        "namespace": st.get('namespace'),
+        "ideUrl": st.get('ideUrl'),
+        "createdAt": it['metadata'].get('creationTimestamp'),
+        "templateId": spec.get('templateId'),
+    }
+
+
 @app.get("/me/workspaces", response_model=list[WorkspaceItem])
-async def list_my_workspaces(user=Depends(get_current_user)):
-    ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
-    items = list_kubedev_environments(ctrl_ns)
-    out: list[WorkspaceItem] = []
-    for it in items:
-        spec = it.get('spec', {})
-        if spec.get('userName') != user['name']:
-            continue
-        st = it.get('status', {})
-        out.append(
-            WorkspaceItem(
-                id=it['metadata']['name'],
-                userName=spec.get('userName', ''),
-                status=st.get('phase'),
-                namespace=st.get('namespace'),
-                ideUrl=st.get('ideUrl'),
-                createdAt=it['metadata'].get('creationTimestamp'),
-                templateId=spec.get('templateId'),
-            )
-        )
-    return out
+async def list_my_workspaces(request: Request, response: Response, user=Depends(get_current_user)):
+    selector = f"{USER_LABEL}={user_label_value(user['name'])}"
+    # CRs created before the owner label existed (or by paths that don't set it) are matched by spec only
+    labelled, unlabelled = await asyncio.gather(
+        asyncio.to_thread(list_kubedev_environments, CTRL_NS, selector),
+        asyncio.to_thread(list_kubedev_environments, CTRL_NS, f"!{USER_LABEL}"),
+    )
+    items = labelled + unlabelled
+    # Sanitized label values can collide; keep the exact owner check
+    items = [it for it in items if it.get('spec', {}).get('userName') == user['name']]
+
+    # Polling clients get 304 while none of their CRs changed
+    etag = _workspaces_etag(items)
+    if etag in (t.strip() for t in request.headers.get('if-none-match', '').split(',')):
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
+    # One validation call for the whole list instead of one model construction per item
+    return _WORKSPACE_ITEMS.validate_python([_workspace_item(it) for it in items])
+
+
+async def owned_workspace(wid: str = Path(...), user=Depends(get_current_user)):
+    """Fetch the workspace CR and ensure it belongs to the caller -> (cr, namespace)"""
+    cr = await asyncio.to_thread(get_kubedev_environment, wid, CTRL_NS)
+    if cr.get('spec', {}).get('userName') != user['name']:
+        raise HTTPException(status_code=403, detail="Forbidden")
+    return cr, (cr.get('status') or {}).get('namespace')
 
 
 @app.post("/me/workspaces/{wid}/stop")
-async def stop_workspace(wid: str = Path(...), user=Depends(get_current_user)):
-    ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
-    cr = get_kubedev_environment(wid, ctrl_ns)
-    spec = cr.get('spec', {})
-    if spec.get('userName') != user['name']:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    ns = (cr.get('status') or {}).get('namespace')
+async def stop_workspace(wid: str = Path(...), owned=Depends(owned_workspace)):
+    _, ns = owned
     if not ns:
         raise HTTPException(status_code=409, detail="Workspace not ready")
-    scale_deployment(ns, f"ide-{wid}", 0)
+    await asyncio.to_thread(scale_deployment, ns, f"ide-{wid}", 0)
     return {"status": "Hibernating"}
 
 
 @app.post("/me/workspaces/{wid}/start")
-async def start_workspace(wid: str = Path(...), user=Depends(get_current_user)):
-    ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
-    cr = get_kubedev_environment(wid, ctrl_ns)
-    spec = cr.get('spec', {})
-    if spec.get('userName') != user['name']:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    ns = (cr.get('status') or {}).get('namespace')
+async def start_workspace(wid: str = Path(...), owned=Depends(owned_workspace)):
+    _, ns = owned
     if not ns:
         raise HTTPException(status_code=409, detail="Workspace not ready")
-    scale_deployment(ns, f"ide-{wid}", 1)
+    await asyncio.to_thread(scale_deployment, ns, f"ide-{wid}", 1)
     return {"status": "Running"}
 
 
 @app.delete("/me/workspaces/{wid}")
 async def delete_workspace(wid: str = Path(...),
                            delete_namespace_first: bool = Query(True),
-                           user=Depends(get_current_user)):
-    ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
-    cr = get_kubedev_environment(wid, ctrl_ns)
-    spec = cr.get('spec', {})
-    if spec.get('userName') != user['name']:
-        raise HTTPException(status_code=403, detail="Forbidden")
-    ns = (cr.get('status') or {}).get('namespace')
+                           owned=Depends(owned_workspace)):
+    _, ns = owned
     if delete_namespace_first and ns:
-        delete_namespace(ns)
-    delete_kubedev_environment(wid, ctrl_ns)
+        await asyncio.to_thread(delete_namespace, ns)
+    await asyncio.to_thread(delete_kubedev_environment, wid, CTRL_NS)
     return {"deleted": wid}
 
 
+# Max concurrent CR creations per batch request (never more than the ApiClient has pooled connections)
+BATCH_CREATE_CONCURRENCY = min(16, POOL_MAXSIZE)
+
+
 def _ensure_admin(user: dict):
     if user.get('role') != 'admin':
         raise HTTPException(status_code=403, detail="Admin only")
@@ -178,10 +251,9 @@ def _ensure_admin(user: dict):
 @app.post("/admin/workspaces/batch", response_model=AdminBatchCreateResponse)
 async def admin_batch_create(payload: AdminBatchCreateRequest, user=Depends(get_current_user)):
     _ensure_admin(user)
-    ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
-    created_list: list[WorkspaceCreateResponse] = []
-    failed: list[str] = []
-    for uname in payload.users:
+    sem = asyncio.Semaphore(BATCH_CREATE_CONCURRENCY)
+
+    async def _create_one(uname: str):
         env_name = f"env-{uname}-{payload.name}"
         spec = {
             "userName": uname,
@@ -193,12 +265,19 @@ async def admin_batch_create(payload: AdminBatchCreateRequest, user=Depends(get_
             "mode": payload.mode,
         }
         spec = {k: v for k, v in spec.items() if v is not None}
-        try:
-            created = create_kubedev_environment(env_name, ctrl_ns, spec)
-            st = created.get('status') or {}
-            created_list.append(WorkspaceCreateResponse(id=env_name, status=st.get('phase', 'Pending'), namespace=st.get('namespace'), ideUrl=st.get('ideUrl')))
-        except Exception as e:
-            failed.append(f"{uname}: {e}")
+        async with sem:
+            created = await asyncio.to_thread(create_kubedev_environment, env_name, CTRL_NS, spec)
+        st = created.get('status') or {}
+        return WorkspaceCreateResponse(id=env_name, status=st.get('phase', 'Pending'), namespace=st.get('namespace'), ideUrl=st.get('ideUrl'))
+
+    results = await asyncio.gather(*(_create_one(uname) for uname in payload.users), return_exceptions=True)
+    created_list: list[WorkspaceCreateResponse] = []
+    failed: list[str] = []
+    for uname, result in zip(payload.users, results):
+        if isinstance(result, Exception):
+            failed.append(f"{uname}: {result}")
+        else:
+            created_list.append(result)
     return AdminBatchCreateResponse(created=created_list, failed=failed)
 
 
@@ -260,12 +339,10 @@ async def upload_environment_yaml(
             spec.update({k: v for k, v in kube_spec.items() if v is not None})
 
         # Generate environment name
-        import uuid
-        env_name = f"env-{user_name}-{str(uuid.uuid4())[:8]}"
+        env_name = f"env-{user_name}-{secrets.token_hex(4)}"
 
         # Create KubeDevEnvironment CR
-        ctrl_ns = os.getenv("KUBEDEV_CTRL_NS", "kubedev-users")
-        created = create_kubedev_environment(env_name, ctrl_ns, spec)
+        created = await asyncio.to_thread(create_kubedev_environment, env_name, CTRL_NS, spec)
         status = created.get('status') or {}
 
         return {
@@ -286,4 +363,4 @@ async def upload_environment_yaml(
 
 @app.get("/healthz")
 async def healthz():
-    return JSONResponse({"status": "ok"})
+    return {"status": "ok"}
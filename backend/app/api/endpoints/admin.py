@@ -3,29 +3,36 @@ Admin API Endpoints
 관리자용 모니터링 및 관리 기능 API
 """
 
+import asyncio
+from collections import Counter
+
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
+from sqlalchemy import func, case
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
-from app.core.dependencies import get_admin_user
-from app.models.environment import EnvironmentInstance
+from app.core.dependencies import CurrentUser, get_admin_user
+from app.models.environment import EnvironmentInstance, EnvironmentStatus
 from app.models.user import User
 from app.models.project_template import ProjectTemplate
-from app.services.kubernetes_service import KubernetesService
+from app.services.kubernetes_service import get_kubernetes_service
 
 router = APIRouter()
 
+# 만료 환경 정리 시 동시에 삭제할 최대 환경 수
+CLEANUP_CONCURRENCY = 8
+
 
 @router.get("/overview")
 async def get_admin_overview():
     """관리자 대시보드 전체 현황"""
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
 
         # K8s 클러스터 전체 현황
-        cluster_info = await k8s_service.get_cluster_overview()
+        cluster_info = await k8s_service.get_cluster_overview_cached()
 
         return {
             "cluster_overview": cluster_info,
@@ -42,18 +49,21 @@ async def get_all_environments_admin(
     user_id: Optional[int] = Query(None, description="Filter by user"),
     namespace: Optional[str] = Query(None, description="Filter by namespace"),
     created_by: Optional[int] = Query(None, description="Filter by creator (관계자별 필터링)"),
-    admin_user: User = Depends(get_admin_user),
+    admin_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """모든 환경의 상태 조회 (Admin용) - K8s 실시간 데이터"""
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
 
         # K8s에서 실시간 환경 상태 조회
         k8s_environments = await k8s_service.get_all_environments_status()
 
         # 데이터베이스 환경 정보와 매칭 (created_by 필터링 추가)
-        db_query = db.query(EnvironmentInstance)
+        db_query = db.query(EnvironmentInstance).options(
+            joinedload(EnvironmentInstance.user),
+            joinedload(EnvironmentInstance.template)
+        )
 
         # 관계자별 필터링 (해당 관계자가 생성한 사용자의 환경만)
         if created_by:
@@ -64,16 +74,17 @@ async def get_all_environments_admin(
 
         db_environments = db_query.all()
 
+        # 네임스페이스 → DB 환경 인덱스 (먼저 조회된 환경 우선)
+        db_env_by_namespace = {}
+        for db_env in db_environments:
+            db_env_by_namespace.setdefault(db_env.k8s_namespace, db_env)
+
         # 환경 정보 통합
         combined_environments = []
 
         for k8s_env in k8s_environments:
             # 데이터베이스에서 매칭되는 환경 찾기
-            matching_db_env = None
-            for db_env in db_environments:
-                if db_env.k8s_namespace == k8s_env['namespace']:
-                    matching_db_env = db_env
-                    break
+            matching_db_env = db_env_by_namespace.get(k8s_env['namespace'])
 
             # 필터 적용
             if status and k8s_env['status'].lower() != status.lower():
@@ -120,7 +131,7 @@ async def get_all_environments_admin(
 async def get_namespace_details_admin(namespace: str):
     """특정 네임스페이스 상세 정보 (Admin용)"""
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
 
         # K8s에서 네임스페이스 상세 정보 조회
         namespace_info = await k8s_service.get_namespace_details(namespace)
@@ -143,25 +154,21 @@ async def get_resource_usage_summary(
 ):
     """전체 리소스 사용량 요약"""
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
 
-        # 클러스터 전체 현황
-        cluster_overview = await k8s_service.get_cluster_overview()
-
-        # 모든 KubeDev 환경의 리소스 사용량
-        environments = await k8s_service.get_all_environments_status()
-
-        # 리소스 사용량 집계
-        total_cpu_usage = 0
-        total_memory_usage = 0
-        total_environments = len(environments)
-        active_environments = sum(1 for env in environments if env['status'] == 'Running')
+        # 클러스터 전체 현황과 모든 KubeDev 환경의 리소스 사용량을 동시에 조회
+        cluster_overview, environments = await asyncio.gather(
+            k8s_service.get_cluster_overview_cached(),
+            k8s_service.get_all_environments_status_cached()
+        )
 
-        # ResourceQuota 정보 집계
+        # 상태별 개수와 ResourceQuota 정보를 한 번의 순회로 집계
+        status_counts = Counter()
         quotas_summary = []
         for env in environments:
-            if env.get('resource_quota'):
-                quota = env['resource_quota']
+            status_counts[env['status']] += 1
+            quota = env.get('resource_quota')
+            if quota:
                 quotas_summary.append({
                     "namespace": env['namespace'],
                     "limits": quota.get('limits', {}),
@@ -171,10 +178,10 @@ async def get_resource_usage_summary(
 
         return {
             "summary": {
-                "total_environments": total_environments,
-                "active_environments": active_environments,
-                "pending_environments": sum(1 for env in environments if env['status'] == 'Pending'),
-                "failed_environments": sum(1 for env in environments if env['status'] == 'Failed')
+                "total_environments": len(environments),
+                "active_environments": status_counts['Running'],
+                "pending_environments": status_counts['Pending'],
+                "failed_environments": status_counts['Failed']
             },
             "cluster_info": cluster_overview,
             "resource_quotas": quotas_summary,
@@ -194,27 +201,40 @@ async def get_users_activity(
     """사용자 활동 현황"""
     try:
         # 최근 활동한 사용자들 조회
-        active_users = db.query(User).join(EnvironmentInstance).filter(
-            EnvironmentInstance.created_at >= datetime.utcnow() - timedelta(days=7)
-        ).limit(limit).all()
+        # 최근 7일 내 환경을 생성한 사용자 (EXISTS로 중복 행 없이 조회)
+        since = datetime.utcnow() - timedelta(days=7)
+        recent_env_exists = db.query(EnvironmentInstance.id).filter(
+            EnvironmentInstance.user_id == User.id,
+            EnvironmentInstance.created_at >= since
+        ).exists()
+        active_users = db.query(User).filter(recent_env_exists).order_by(User.id).limit(limit).all()
+
+        # 사용자별 환경 통계를 한 번의 GROUP BY 쿼리로 집계
+        user_ids = [user.id for user in active_users]
+        env_stats = {}
+        if user_ids:
+            rows = db.query(
+                EnvironmentInstance.user_id,
+                func.count(EnvironmentInstance.id),
+                func.sum(case((EnvironmentInstance.status == EnvironmentStatus.RUNNING, 1), else_=0)),
+                func.max(EnvironmentInstance.created_at)
+            ).filter(
+                EnvironmentInstance.user_id.in_(user_ids)
+            ).group_by(EnvironmentInstance.user_id).all()
+            env_stats = {user_id: (total, active, last) for user_id, total, active, last in rows}
 
         users_activity = []
         for user in active_users:
-            # 해당 사용자의 환경 개수
-            user_environments = db.query(EnvironmentInstance).filter(
-                EnvironmentInstance.user_id == user.id
-            ).all()
+            total, active, last_activity = env_stats.get(user.id, (0, 0, None))
 
             users_activity.append({
                 "user_id": user.id,
                 "email": user.email,
                 "name": user.name,
                 "role": user.role.value,
-                "total_environments": len(user_environments),
-                "active_environments": sum(1 for env in user_environments
-                                         if env.status.value == 'running'),
-                "last_activity": max([env.created_at for env in user_environments])
-                                if user_environments else None,
+                "total_environments": total,
+                "active_environments": int(active or 0),
+                "last_activity": last_activity,
             })
 
         return {
@@ -232,28 +252,29 @@ async def get_templates_usage(db: Session = Depends(get_db)):
     """템플릿 사용 현황"""
     try:
         # 모든 템플릿과 사용 횟수 조회
-        templates = db.query(ProjectTemplate).all()
+        templates = db.query(ProjectTemplate).options(joinedload(ProjectTemplate.creator)).all()
+
+        # 템플릿별 전체/활성 환경 개수를 조건부 집계로 한 번에 조회
+        is_active = EnvironmentInstance.status.in_([
+            EnvironmentStatus.RUNNING, EnvironmentStatus.PENDING, EnvironmentStatus.CREATING
+        ])
+        rows = db.query(
+            EnvironmentInstance.template_id,
+            func.count(EnvironmentInstance.id),
+            func.sum(case((is_active, 1), else_=0))
+        ).group_by(EnvironmentInstance.template_id).all()
+        usage_by_template = {template_id: (total, int(active or 0)) for template_id, total, active in rows}
 
         templates_usage = []
         for template in templates:
-            # 해당 템플릿으로 생성된 환경 개수
-            environment_count = db.query(EnvironmentInstance).filter(
-                EnvironmentInstance.template_id == template.id
-            ).count()
-
-            # 현재 활성화된 환경 개수
-            active_count = db.query(EnvironmentInstance).filter(
-                EnvironmentInstance.template_id == template.id,
-                EnvironmentInstance.status.in_(['running', 'pending', 'creating'])
-            ).count()
-
+            total_usage, current_active = usage_by_template.get(template.id, (0, 0))
             templates_usage.append({
                 "template_id": template.id,
                 "name": template.name,
                 "description": template.description,
                 "status": template.status.value,
-                "total_usage": environment_count,
-                "current_active": active_count,
+                "total_usage": total_usage,
+                "current_active": current_active,
                 "created_by": template.creator.email if template.creator else "unknown",
                 "created_at": template.created_at,
                 "resource_limits": template.resource_limits
@@ -277,35 +298,36 @@ async def cleanup_expired_environments(
     """만료된 환경 정리"""
     try:
         # 만료된 환경 찾기
-        expired_environments = db.query(EnvironmentInstance).filter(
+        expired_environments = db.query(EnvironmentInstance).options(
+            joinedload(EnvironmentInstance.user)
+        ).filter(
             EnvironmentInstance.expires_at < datetime.utcnow(),
             EnvironmentInstance.status.in_(['running', 'stopped'])
         ).all()
 
-        cleanup_results = []
-
-        for env in expired_environments:
-            result = {
+        cleanup_results = [
+            {
                 "environment_id": env.id,
                 "name": env.name,
                 "user_email": env.user.email,
                 "expires_at": env.expires_at,
                 "action": "would_delete" if dry_run else "deleted"
             }
-
-            if not dry_run:
-                try:
-                    # 실제 정리 작업 수행
-                    from app.services.environment_service import EnvironmentService
-                    env_service = EnvironmentService(db)
-                    await env_service.delete_environment(env.id)
+            for env in expired_environments
+        ]
+
+        if not dry_run and expired_environments:
+            # 실제 정리 작업 수행 (K8s 삭제만 동시 실행, DB 삭제는 한 세션에서 순차 처리)
+            from app.services.environment_service import EnvironmentService
+            env_service = EnvironmentService(db)
+            errors = await env_service.delete_environments(expired_environments, CLEANUP_CONCURRENCY)
+            for result, cleanup_error in zip(cleanup_results, errors):
+                if cleanup_error is None:
                     result["status"] = "success"
-                except Exception as cleanup_error:
+                else:
                     result["status"] = "failed"
                     result["error"] = str(cleanup_error)
 
-            cleanup_results.append(result)
-
         return {
             "cleaned_up": len(cleanup_results),
             "dry_run": dry_run,
@@ -321,45 +343,60 @@ async def cleanup_expired_environments(
 async def get_system_alerts(db: Session = Depends(get_db)):
     """시스템 알림 및 경고"""
     try:
-        alerts = []
+        def _collect_db_alerts():
+            db_alerts = []
+
+            # 1. 만료 임박 환경
+            soon_to_expire = db.query(EnvironmentInstance).options(
+                joinedload(EnvironmentInstance.user)
+            ).filter(
+                EnvironmentInstance.expires_at < datetime.utcnow() + timedelta(hours=1),
+                EnvironmentInstance.expires_at > datetime.utcnow(),
+                EnvironmentInstance.status.in_(['running'])
+            ).all()
 
-        # 1. 만료 임박 환경
-        soon_to_expire = db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.expires_at < datetime.utcnow() + timedelta(hours=1),
-            EnvironmentInstance.expires_at > datetime.utcnow(),
-            EnvironmentInstance.status.in_(['running'])
-        ).all()
+            for env in soon_to_expire:
+                db_alerts.append({
+                    "type": "warning",
+                    "category": "expiration",
+                    "message": f"Environment '{env.name}' will expire in less than 1 hour",
+                    "environment_id": env.id,
+                    "user_email": env.user.email,
+                    "expires_at": env.expires_at
+                })
 
-        for env in soon_to_expire:
-            alerts.append({
-                "type": "warning",
-                "category": "expiration",
-                "message": f"Environment '{env.name}' will expire in less than 1 hour",
-                "environment_id": env.id,
-                "user_email": env.user.email,
-                "expires_at": env.expires_at
-            })
+            # 2. 오류 상태 환경
+            failed_environments = db.query(EnvironmentInstance).options(
+                joinedload(EnvironmentInstance.user)
+            ).filter(
+                EnvironmentInstance.status == 'error'
+            ).all()
 
-        # 2. 오류 상태 환경
-        failed_environments = db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.status == 'error'
-        ).all()
+            for env in failed_environments:
+                db_alerts.append({
+                    "type": "error",
+                    "category": "environment_failed",
+                    "message": f"Environment '{env.name}' is in failed state",
+                    "environment_id": env.id,
+                    "user_email": env.user.email,
+                    "status_message": env.status_message
+                })
 
-        for env in failed_environments:
-            alerts.append({
-                "type": "error",
-                "category": "environment_failed",
-                "message": f"Environment '{env.name}' is in failed state",
-                "environment_id": env.id,
-                "user_email": env.user.email,
-                "status_message": env.status_message
-            })
+            return db_alerts
 
-        # 3. 리소스 사용률 높은 환경 (실제로는 K8s metrics에서 가져와야 함)
-        try:
-            k8s_service = KubernetesService()
-            environments = await k8s_service.get_all_environments_status()
+        # DB 조회(세션은 한 스레드에서만 사용)와 K8s 조회를 동시에 실행
+        k8s_service = get_kubernetes_service()
+        alerts, environments = await asyncio.gather(
+            asyncio.to_thread(_collect_db_alerts),
+            k8s_service.get_all_environments_status_cached(),
+            return_exceptions=True
+        )
+        if isinstance(alerts, Exception):
+            raise alerts
 
+        # 3. 리소스 사용률 높은 환경 (실제로는 K8s metrics에서 가져와야 함)
+        # K8s 조회 실패는 무시
+        if not isinstance(environments, Exception):
             for env in environments:
                 if env.get('resource_quota'):
                     quota = env['resource_quota']
@@ -375,9 +412,6 @@ async def get_system_alerts(db: Session = Depends(get_db)):
                             "cpu_usage": f"{cpu_util}%",
                             "memory_usage": f"{mem_util}%"
                         })
-        except Exception:
-            # K8s 조회 실패는 무시
-            pass
 
         return {
             "alerts": alerts,
@@ -393,7 +427,7 @@ async def get_system_alerts(db: Session = Depends(get_db)):
 async def get_live_metrics(namespace: str):
     """특정 네임스페이스의 실시간 메트릭"""
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
 
         metrics = await k8s_service.get_live_resource_metrics(namespace)
 
@@ -90,7 +90,7 @@ async def get_my_environment(
 ):
     """현재 로그인한 사용자의 환경 정보 조회 (간단한 JWT 없이)"""
     from app.models.environment import EnvironmentInstance, EnvironmentStatus
-    from app.services.kubernetes_service import KubernetesService
+    from app.services.kubernetes_service import get_kubernetes_service
     from fastapi import Request
 
     # TODO: 임시 구현 - JWT 토큰 인증으로 개선 필요
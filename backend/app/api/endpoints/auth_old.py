@@ -12,9 +12,10 @@ from app.core.security import (
     authenticate_user,
     create_user_token,
     generate_api_key,
-    generate_access_code
+    generate_access_code,
+    invalidate_user_cache
 )
-from app.core.dependencies import get_current_user, get_admin_user
+from app.core.dependencies import CurrentUser, get_current_user, get_admin_user
 from app.models.user import User, UserRole
 from app.schemas.user import (
     UserCreate,
@@ -69,7 +70,7 @@ async def login(
 @router.post("/create-user", response_model=UserResponse)
 async def create_user(
     user_data: UserCreate,
-    admin_user: User = Depends(get_admin_user),
+    admin_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """새 사용자 생성 (관리자 전용)"""
@@ -118,33 +119,50 @@ async def create_user(
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
 ):
     """현재 사용자 정보 조회"""
     log.info("Fetching current user info", user_id=current_user.id)
-    return current_user
+    # 인증 의존성은 일부 컬럼만 담으므로 응답용 전체 행을 조회
+    user = db.get(User, current_user.id)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+    return user
 
 
 @router.patch("/me", response_model=UserResponse)
 async def update_current_user(
     user_update: UserUpdate,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """현재 사용자 정보 수정"""
-    log.info("Updating current user", user_id=current_user.id, update_data=user_update.dict(exclude_unset=True))
+    log.info("Updating current user", user_id=current_user.id, update_data=user_update.model_dump(exclude_unset=True))
+    # 인증 의존성의 CurrentUser는 읽기 전용이므로 수정할 ORM 행을 조회
+    user = db.get(User, current_user.id)
+    if not user:
+        log.warning("User update failed: user not found", user_id=current_user.id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found"
+        )
+
     try:
         # 본인은 역할 변경 불가
-        update_data = user_update.dict(exclude_unset=True, exclude={"role"})
+        update_data = user_update.model_dump(exclude_unset=True, exclude={"role"})
 
         # 업데이트 적용
         for field, value in update_data.items():
-            setattr(current_user, field, value)
+            setattr(user, field, value)
 
         db.commit()
-        db.refresh(current_user)
-        log.info("User updated successfully", user_id=current_user.id)
-        return current_user
+        db.refresh(user)
+        log.info("User updated successfully", user_id=user.id)
+        return user
 
     except HTTPException:
         raise
@@ -158,7 +176,7 @@ async def update_current_user(
 
 
 @router.post("/logout")
-async def logout(current_user: User = Depends(get_current_user)):
+async def logout(current_user: CurrentUser = Depends(get_current_user)):
     """사용자 로그아웃 (클라이언트에서 토큰 삭제)"""
     log.info("User logged out", user_id=current_user.id)
     # JWT는 stateless이므로 서버에서 할 일은 없음
@@ -169,7 +187,7 @@ async def logout(current_user: User = Depends(get_current_user)):
 @router.post("/api-keys")
 async def create_api_key(
     description: str,
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """API 키 생성"""
     log.info("Creating API key", user_id=current_user.id, description=description)
@@ -195,7 +213,7 @@ async def create_api_key(
 # Admin 전용 엔드포인트
 @router.get("/users", response_model=list[UserResponse])
 async def list_users(
-    admin_user: User = Depends(get_admin_user),
+    admin_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """모든 사용자 목록 (Admin 전용)"""
@@ -209,7 +227,7 @@ async def list_users(
 async def update_user_admin(
     user_id: int,
     user_update: UserUpdate,
-    admin_user: User = Depends(get_admin_user),
+    admin_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """사용자 정보 수정 (Admin 전용)"""
@@ -223,7 +241,7 @@ async def update_user_admin(
         )
 
     try:
-        update_data = user_update.dict(exclude_unset=True)
+        update_data = user_update.model_dump(exclude_unset=True)
 
         # 업데이트 적용
         for field, value in update_data.items():
@@ -248,7 +266,7 @@ async def update_user_admin(
 @router.delete("/users/{user_id}")
 async def delete_user(
     user_id: int,
-    admin_user: User = Depends(get_admin_user),
+    admin_user: CurrentUser = Depends(get_admin_user),
     db: Session = Depends(get_db)
 ):
     """사용자 삭제 (Admin 전용)"""
@@ -287,6 +305,7 @@ async def delete_user(
         # 사용자 비활성화 (완전 삭제 대신)
         target_user.is_active = False
         db.commit()
+        invalidate_user_cache(user_id)
         log.info("User deactivated successfully", target_user_id=user_id)
         return {"message": "User deactivated successfully"}
 
@@ -0,0 +1,89 @@
+"""
+Batch API Endpoints
+여러 API 호출을 한 번의 HTTP 요청으로 처리 (프론트엔드 왕복 횟수 감소)
+"""
+
+import asyncio
+import posixpath
+from typing import List
+from urllib.parse import unquote
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+
+from app.schemas.batch import BatchSubRequest, BatchSubResponse
+
+router = APIRouter()
+
+# 한 배치에 담을 수 있는 최대 요청 수
+MAX_BATCH_REQUESTS = 20
+
+# 개별 요청 최대 처리 시간 (초) - 응답 본문을 모두 받아야 끝나므로 SSE 등 스트리밍 응답은 여기서 끊김
+BATCH_ITEM_TIMEOUT = 15.0
+
+# 개별 요청에 그대로 전달할 인증 관련 헤더
+_FORWARDED_HEADERS = ("authorization", "cookie")
+
+# 배치 안에서 보낸 요청임을 표시하는 헤더 (배치 재귀 방지)
+BATCH_MARKER_HEADER = "x-kubdev-batch"
+
+
+def _normalize_path(path: str) -> str:
+    """쿼리를 뗀 경로를 퍼센트 디코딩 후 정규화 ('//', '.', '..', 끝의 '/' 제거)"""
+    # 라우팅과 같은 기준으로 비교하도록 디코딩 후, 앞의 '/'를 하나로 맞춰 정규화
+    # (normpath는 맨 앞의 '//'를 그대로 유지함)
+    return posixpath.normpath("/" + unquote(path.split("?", 1)[0]).lstrip("/"))
+
+
+async def _dispatch(client: httpx.AsyncClient, sub: BatchSubRequest, batch_path: str) -> BatchSubResponse:
+    """개별 요청을 앱 라우터로 전달하고 응답을 {status, body}로 변환"""
+    if not sub.path.startswith("/"):
+        return BatchSubResponse(status=400, body={"detail": "Path must start with '/'"})
+    # 배치 안에서 배치를 다시 호출하는 재귀 방지 (경로 표기를 바꿔 우회하지 못하도록 정규화 후 비교)
+    if _normalize_path(sub.path) == _normalize_path(batch_path):
+        return BatchSubResponse(status=400, body={"detail": "Nested batch requests are not allowed"})
+
+    try:
+        response = await asyncio.wait_for(
+            client.request(sub.method, sub.path, json=sub.body), timeout=BATCH_ITEM_TIMEOUT
+        )
+    except asyncio.TimeoutError:
+        return BatchSubResponse(
+            status=504,
+            body={"detail": f"Sub-request timed out after {BATCH_ITEM_TIMEOUT:g}s (streaming endpoints are not supported)"},
+        )
+    except Exception as e:
+        # 한 요청의 실패가 배치 전체 실패로 번지지 않도록 개별 응답으로 변환
+        return BatchSubResponse(status=500, body={"detail": f"Sub-request failed: {str(e)}"})
+    try:
+        body = response.json()
+    except ValueError:
+        body = response.text
+    return BatchSubResponse(status=response.status_code, body=body)
+
+
+@router.post("", response_model=List[BatchSubResponse])
+async def execute_batch(sub_requests: List[BatchSubRequest], request: Request):
+    """
+    여러 요청을 서버 안에서 동시에 실행하고 요청 순서대로 응답 반환
+    (BATCH_ITEM_TIMEOUT을 넘긴 요청은 504로 반환 - SSE 등 스트리밍 응답은 끝나지 않으므로 항상 504)
+    """
+    # 경로 검사를 우회해 배치 안에서 들어온 배치 요청은 거부
+    if BATCH_MARKER_HEADER in request.headers:
+        raise HTTPException(status_code=400, detail="Nested batch requests are not allowed")
+    if len(sub_requests) > MAX_BATCH_REQUESTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many requests in batch (max {MAX_BATCH_REQUESTS})"
+        )
+
+    headers = {name: request.headers[name] for name in _FORWARDED_HEADERS if name in request.headers}
+    headers[BATCH_MARKER_HEADER] = "1"
+
+    # 네트워크를 거치지 않고 같은 앱에 ASGI로 직접 요청
+    # 앱 예외는 다시 던지지 않고 500 응답으로 받음 (요청별 {status: 500})
+    transport = httpx.ASGITransport(app=request.app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://batch", headers=headers) as client:
+        return await asyncio.gather(
+            *(_dispatch(client, sub, request.url.path) for sub in sub_requests)
+        )
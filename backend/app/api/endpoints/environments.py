@@ -12,16 +12,15 @@ import yaml
 from app.core.database import get_db
 from app.models.environment import EnvironmentInstance, EnvironmentStatus
 from app.models.project_template import ProjectTemplate
-from app.models.user import User
 from app.schemas.environment import (
     EnvironmentResponse,
     EnvironmentUpdate,
     EnvironmentActionRequest,
     EnvironmentListResponse
 )
-from app.services.kubernetes_service import KubernetesService
+from app.services.kubernetes_service import get_kubernetes_service
 from app.services.environment_service import EnvironmentService
-from app.core.dependencies import get_current_user
+from app.core.dependencies import CurrentUser, get_current_user
 
 router = APIRouter()
 log = structlog.get_logger(__name__)
@@ -31,7 +30,7 @@ log = structlog.get_logger(__name__)
 async def create_environment_from_yaml(
     template_id: int = Form(...),
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
@@ -85,7 +84,7 @@ async def create_environment_from_yaml(
 
     # 3. Apply the Custom Resource to Kubernetes
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         api_response = await k8s_service.create_custom_object(custom_object)
         log.info("Successfully applied KubeDevEnvironment CRD to Kubernetes.", crd_name=custom_object.get("metadata", {}).get("name"))
         
@@ -144,7 +143,7 @@ async def list_environments(
     environments = query.offset(offset).limit(size).all()
 
     # IDE URL 동적 생성 (Kubernetes API로 실제 접속 가능한 주소 생성)
-    k8s_service = KubernetesService()
+    k8s_service = get_kubernetes_service()
     for env in environments:
         if env.status == EnvironmentStatus.RUNNING:
             try:
@@ -217,7 +216,7 @@ async def update_environment(
     db: Session = Depends(get_db)
 ):
     """환경 정보 업데이트"""
-    log.info("Updating environment", environment_id=environment_id, update_data=update_data.dict(exclude_unset=True))
+    log.info("Updating environment", environment_id=environment_id, update_data=update_data.model_dump(exclude_unset=True))
     environment = db.query(EnvironmentInstance).filter(
         EnvironmentInstance.id == environment_id
     ).first()
@@ -227,7 +226,7 @@ async def update_environment(
         raise HTTPException(status_code=404, detail="Environment not found")
 
     # 업데이트 적용
-    update_dict = update_data.dict(exclude_unset=True)
+    update_dict = update_data.model_dump(exclude_unset=True)
     for field, value in update_dict.items():
         setattr(environment, field, value)
 
@@ -294,7 +293,7 @@ async def get_environment_logs(
         raise HTTPException(status_code=404, detail="Environment not found")
 
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         logs = await k8s_service.get_pod_logs(
             namespace=environment.k8s_namespace,
             deployment_name=environment.k8s_deployment_name,
@@ -3,19 +3,22 @@ Monitoring API Endpoints
 모니터링 및 메트릭 API
 """
 
+import asyncio
 import json
+from collections import Counter
 from fastapi import APIRouter, HTTPException, Depends, Query, Request
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
 from datetime import datetime, timedelta
 
 from app.core.database import get_db
-from app.core.dependencies import get_current_user
-from app.models.user import User
+from app.core.dependencies import CurrentUser, get_current_user
 from app.models.environment import EnvironmentInstance
-from app.models.resource_metrics import ResourceMetric
-from app.services.kubernetes_service import KubernetesService
+from app.models.resource_metrics import ResourceMetric, ResourceMetricRollup5m
+from app.schemas.resource_metrics import MetricsSummary
+from app.services.kubernetes_service import get_kubernetes_service
 
 router = APIRouter()
 
@@ -24,7 +27,7 @@ router = APIRouter()
 async def get_environment_metrics(
     environment_id: int,
     hours: int = Query(1, ge=1, le=168, description="Time range in hours (max 7 days)"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """특정 환경의 리소스 메트릭 조회"""
@@ -54,7 +57,7 @@ async def get_environment_metrics(
         ).order_by(ResourceMetric.timestamp.desc()).all()
 
         # K8s에서 실시간 상태도 조회
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         live_metrics = await k8s_service.get_live_resource_metrics(environment.k8s_namespace)
 
         # 메트릭 데이터 포맷
@@ -72,7 +75,8 @@ async def get_environment_metrics(
                 "network_tx_bytes": metric.network_tx_bytes
             })
 
-        return {
+        # 메트릭 행이 많을 수 있으므로 jsonable_encoder를 거치지 않고 orjson으로 바로 직렬화
+        return ORJSONResponse({
             "environment_id": environment_id,
             "environment_name": environment.name,
             "time_range_hours": hours,
@@ -85,7 +89,7 @@ async def get_environment_metrics(
                 "storage_limit": environment.template.resource_limits.get("storage", "10Gi")
             },
             "timestamp": datetime.utcnow().isoformat()
-        }
+        })
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to get metrics: {str(e)}")
@@ -94,7 +98,7 @@ async def get_environment_metrics(
 @router.get("/environments/{environment_id}/metrics/current")
 async def get_environment_metrics_current(
     environment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """DB에 저장된 최신 메트릭 스냅샷 반환"""
@@ -116,10 +120,59 @@ async def get_environment_metrics_current(
     }
 
 
+@router.get("/environments/{environment_id}/metrics/summary", response_model=MetricsSummary)
+async def get_environment_metrics_summary(
+    environment_id: int,
+    hours: int = Query(24, ge=1, le=168, description="Time range in hours (max 7 days)"),
+    current_user: CurrentUser = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """메트릭 요약 (원본 메트릭 대신 5분 단위 집계 테이블에서 계산)"""
+    environment = db.query(EnvironmentInstance.user_id).filter(
+        EnvironmentInstance.id == environment_id
+    ).first()
+
+    if not environment:
+        raise HTTPException(status_code=404, detail="Environment not found")
+
+    if environment.user_id != current_user.id and current_user.role.value not in ["org_admin", "super_admin"]:
+        raise HTTPException(status_code=403, detail="No permission to access this environment")
+
+    samples = func.coalesce(func.sum(ResourceMetricRollup5m.samples), 0)
+
+    def weighted_avg(column):
+        return func.coalesce(func.sum(column * ResourceMetricRollup5m.samples) / func.nullif(samples, 0), 0.0)
+
+    row = db.query(
+        weighted_avg(ResourceMetricRollup5m.avg_cpu_usage),
+        weighted_avg(ResourceMetricRollup5m.avg_memory_usage),
+        weighted_avg(ResourceMetricRollup5m.avg_storage_usage),
+        func.coalesce(func.max(ResourceMetricRollup5m.max_cpu_usage), 0.0),
+        func.coalesce(func.max(ResourceMetricRollup5m.max_memory_usage), 0.0),
+        func.coalesce(func.max(ResourceMetricRollup5m.max_storage_usage), 0.0),
+        samples,
+    ).filter(
+        ResourceMetricRollup5m.environment_id == environment_id,
+        ResourceMetricRollup5m.bucket_start >= datetime.utcnow() - timedelta(hours=hours)
+    ).one()
+
+    # 집계 결과는 타입이 확정되어 있으므로 Pydantic 검증 없이 바로 직렬화 (스키마는 문서용)
+    return ORJSONResponse({
+        "avg_cpu_usage": float(row[0]),
+        "avg_memory_usage": float(row[1]),
+        "avg_storage_usage": float(row[2]),
+        "max_cpu_usage": float(row[3]),
+        "max_memory_usage": float(row[4]),
+        "max_storage_usage": float(row[5]),
+        "data_points": int(row[6]),
+        "time_range_hours": hours
+    })
+
+
 @router.get("/stream/pods")
 async def stream_managed_pods(request: Request):
     """Managed pod snapshot stream (SSE)"""
-    k8s_service = KubernetesService()
+    k8s_service = get_kubernetes_service()
 
     async def event_generator():
         async for snapshot in k8s_service.stream_pod_snapshots():
@@ -133,7 +186,7 @@ async def stream_managed_pods(request: Request):
 @router.get("/user/{user_id}/environments")
 async def get_user_environments_status(
     user_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """특정 사용자의 모든 환경 상태 조회"""
@@ -144,7 +197,9 @@ async def get_user_environments_status(
 
     try:
         # 해당 사용자의 환경들 조회
-        environments = db.query(EnvironmentInstance).filter(
+        environments = db.query(EnvironmentInstance).options(
+            joinedload(EnvironmentInstance.template)
+        ).filter(
             EnvironmentInstance.user_id == user_id
         ).all()
 
@@ -156,7 +211,7 @@ async def get_user_environments_status(
             }
 
         # 각 환경의 K8s 상태 조회
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         environment_statuses = []
 
         for env in environments:
@@ -214,7 +269,7 @@ async def health_check():
     """시스템 헬스체크"""
     try:
         # K8s 연결 상태 확인
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         cluster_info = await k8s_service.get_cluster_overview()
 
         return {
@@ -257,7 +312,7 @@ async def get_user_environment_metrics(
         if not environments:
             return []
 
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         metrics_list = []
 
         for env in environments:
@@ -303,26 +358,27 @@ async def get_user_environment_metrics(
 
 @router.get("/metrics/system")
 async def get_system_metrics(
-    current_user: User = Depends(get_current_user)
+    current_user: CurrentUser = Depends(get_current_user)
 ):
     """시스템 전체 메트릭"""
     try:
-        k8s_service = KubernetesService()
-
-        # 클러스터 전체 현황
-        cluster_overview = await k8s_service.get_cluster_overview()
+        k8s_service = get_kubernetes_service()
 
-        # 모든 KubeDev 환경 상태
-        all_environments = await k8s_service.get_all_environments_status()
+        # 클러스터 전체 현황과 모든 KubeDev 환경 상태를 동시에 조회
+        cluster_overview, all_environments = await asyncio.gather(
+            k8s_service.get_cluster_overview(),
+            k8s_service.get_all_environments_status()
+        )
 
-        # 메트릭 집계
+        # 메트릭 집계 (상태별 개수는 한 번의 순회로 계산)
+        status_counts = Counter(env["status"] for env in all_environments)
         metrics = {
             "cluster": cluster_overview,
             "environments": {
                 "total": len(all_environments),
-                "running": sum(1 for env in all_environments if env["status"] == "Running"),
-                "pending": sum(1 for env in all_environments if env["status"] == "Pending"),
-                "failed": sum(1 for env in all_environments if env["status"] == "Failed")
+                "running": status_counts["Running"],
+                "pending": status_counts["Pending"],
+                "failed": status_counts["Failed"]
             },
             "resource_utilization": {
                 "total_quotas": 0,
@@ -372,11 +428,11 @@ async def get_system_metrics(
 async def get_recent_events(
     limit: int = Query(30, ge=1, le=200),
     namespaces: Optional[str] = Query(None, description="Comma separated namespaces to filter"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
 ):
     """최근 이벤트 조회 (필터링 가능)"""
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
         namespace_list = [ns.strip() for ns in namespaces.split(",")] if namespaces else None
         events = await k8s_service.get_recent_events(namespaces=namespace_list, limit=limit)
         return {"events": events, "count": len(events), "timestamp": datetime.utcnow().isoformat()}
@@ -389,7 +445,7 @@ async def get_environment_logs(
     environment_id: int,
     lines: int = Query(100, ge=1, le=1000, description="Number of log lines"),
     follow: bool = Query(False, description="Follow log stream"),
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """환경 로그 조회"""
@@ -407,7 +463,19 @@ async def get_environment_logs(
         raise HTTPException(status_code=403, detail="No permission to access this environment")
 
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
+
+        if follow:
+            # 로그를 한 번에 모으지 않고 파드에서 받는 대로 전달
+            return StreamingResponse(
+                k8s_service.stream_pod_logs(
+                    namespace=environment.k8s_namespace,
+                    deployment_name=environment.k8s_deployment_name,
+                    tail_lines=lines,
+                    follow=True
+                ),
+                media_type="text/plain; charset=utf-8"
+            )
 
         logs = await k8s_service.get_pod_logs(
             namespace=environment.k8s_namespace,
@@ -430,7 +498,7 @@ async def get_environment_logs(
 @router.get("/environments/{environment_id}/insight")
 async def get_environment_insight(
     environment_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """특정 환경에 대한 상세 모니터링 정보"""
@@ -444,7 +512,7 @@ async def get_environment_insight(
     if environment.user_id != current_user.id and current_user.role.value not in ["org_admin", "super_admin"]:
         raise HTTPException(status_code=403, detail="No permission to access this environment")
 
-    k8s_service = KubernetesService()
+    k8s_service = get_kubernetes_service()
     errors = []
 
     pods = []
@@ -493,7 +561,7 @@ async def get_environment_insight(
 
 @router.get("/alerts")
 async def get_user_alerts(
-    current_user: User = Depends(get_current_user),
+    current_user: CurrentUser = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """사용자별 알림 조회"""
@@ -4,28 +4,71 @@ Template API Endpoints
 """
 
 from fastapi import APIRouter, HTTPException, Depends, Query, UploadFile, File, Form
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, Response
+from sqlalchemy import select, insert, func, exists
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict, Any
-import uuid
+import asyncio
+import re
+import secrets
 import time
 from datetime import datetime
 
-from app.core.database import get_db
+from app.core.database import get_async_session
 from app.models.project_template import ProjectTemplate, TemplateStatus
 from app.models.user import User
 from app.schemas.project_template import (
     ProjectTemplateCreate,
     ProjectTemplateResponse,
     ProjectTemplateUpdate,
+    ProjectTemplateListItem,
     ProjectTemplateListResponse,
     TemplateValidationResult,
     TemplateDeploymentTest
 )
-from app.services.kubernetes_service import KubernetesService
+from app.services.kubernetes_service import get_kubernetes_service
 from app.services.dockerfile_generator import DockerfileGenerator
+from app.services.cache_service import cache_service
+from app.api.endpoints.user import invalidate_active_template_cache
+from app.services.environment_service import invalidate_template_snapshot_cache
 
 router = APIRouter()
 
+# 리소스 제한 형식 (예: cpu "500m" / "2", memory "512Mi" / "2Gi")
+VALID_CPU_LIMIT = re.compile(r"\d+(\.\d+)?|\d+m")
+VALID_MEMORY_LIMIT = re.compile(r"\d+(Mi|Gi)")
+
+# 응답 스키마 필드 (ORM 객체를 pydantic 검증 없이 바로 직렬화할 때 사용)
+_TEMPLATE_FIELDS = tuple(ProjectTemplateResponse.model_fields)
+
+
+def _template_dict(template: ProjectTemplate) -> Dict[str, Any]:
+    """ProjectTemplate → 응답용 dict"""
+    return {field: getattr(template, field) for field in _TEMPLATE_FIELDS}
+
+
+# 목록 조회는 필요한 컬럼만 SELECT (stack_config 등 대용량 JSON 제외)
+_TEMPLATE_LIST_COLUMNS = tuple(getattr(ProjectTemplate, field) for field in ProjectTemplateListItem.model_fields)
+
+
+# 템플릿 조회 캐시 (Redis look-aside)
+# 목록 캐시 키에는 버전 카운터를 넣어 변경 시 KEYS 스캔 없이 한 번에 무효화
+TEMPLATE_CACHE_TTL = 300
+TEMPLATE_LIST_VERSION_KEY = "templates:list:version"
+
+
+def _template_cache_key(template_id: int) -> str:
+    return f"tpl:{template_id}"
+
+
+async def _invalidate_template_cache(template_id: Optional[int] = None):
+    """템플릿 생성/수정/삭제 시 캐시 무효화"""
+    invalidate_active_template_cache()
+    invalidate_template_snapshot_cache(template_id)
+    keys = (_template_cache_key(template_id),) if template_id is not None else ()
+    await cache_service.invalidate(*keys, bump=TEMPLATE_LIST_VERSION_KEY)
+
+
 @router.post("/upload-yaml")
 async def upload_template_yaml(
     current_user_id: int = Form(..., description="업로드하는 사용자 ID"),
@@ -50,20 +93,20 @@ async def upload_template_yaml(
 async def create_template(
     template_data: ProjectTemplateCreate,
     created_by: int = Query(..., description="Creator user ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """새 프로젝트 템플릿 생성"""
 
     # 생성자 확인
-    creator = db.query(User).filter(User.id == created_by).first()
-    if not creator:
+    creator_exists = await db.scalar(select(exists().where(User.id == created_by)))
+    if not creator_exists:
         raise HTTPException(status_code=404, detail="Creator user not found")
 
     # 같은 이름의 템플릿 중복 체크
-    existing = db.query(ProjectTemplate).filter(
+    existing = await db.scalar(select(exists().where(
         ProjectTemplate.name == template_data.name,
         ProjectTemplate.organization_id == template_data.organization_id
-    ).first()
+    )))
 
     if existing:
         raise HTTPException(
@@ -72,36 +115,37 @@ async def create_template(
         )
 
     try:
-        # 템플릿 생성
-        template = ProjectTemplate(
-            name=template_data.name,
-            description=template_data.description,
-            version=template_data.version,
-            status=TemplateStatus.DRAFT,
-            stack_config=template_data.stack_config,
-            dependencies=template_data.dependencies,
-            base_image=template_data.base_image,
-            custom_dockerfile=template_data.custom_dockerfile,
-            init_scripts=template_data.init_scripts,
-            post_start_commands=template_data.post_start_commands,
-            resource_limits=template_data.resource_limits,
-            exposed_ports=template_data.exposed_ports,
-            environment_variables=template_data.environment_variables,
-            default_git_repo=template_data.default_git_repo,
-            git_branch=template_data.git_branch,
-            is_public=template_data.is_public,
-            organization_id=template_data.organization_id,
-            created_by=created_by
+        # 템플릿 생성 (INSERT ... RETURNING으로 서버 기본값까지 한 번에 조회)
+        template = await db.scalar(
+            insert(ProjectTemplate).values(
+                name=template_data.name,
+                description=template_data.description,
+                version=template_data.version,
+                status=TemplateStatus.DRAFT,
+                stack_config=template_data.stack_config,
+                dependencies=template_data.dependencies,
+                base_image=template_data.base_image,
+                custom_dockerfile=template_data.custom_dockerfile,
+                init_scripts=template_data.init_scripts,
+                post_start_commands=template_data.post_start_commands,
+                resource_limits=template_data.resource_limits,
+                exposed_ports=template_data.exposed_ports,
+                environment_variables=template_data.environment_variables,
+                default_git_repo=template_data.default_git_repo,
+                git_branch=template_data.git_branch,
+                is_public=template_data.is_public,
+                organization_id=template_data.organization_id,
+                created_by=created_by
+            ).returning(ProjectTemplate)
         )
 
-        db.add(template)
-        db.commit()
-        db.refresh(template)
+        await db.commit()
+        await _invalidate_template_cache()
 
-        return template
+        return ORJSONResponse(_template_dict(template))
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create template: {str(e)}")
 
 
@@ -112,70 +156,95 @@ async def list_templates(
     is_public: Optional[bool] = Query(None, description="Filter by public/private"),
     page: int = Query(1, ge=1, description="Page number"),
     size: int = Query(10, ge=1, le=100, description="Page size"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 목록 조회"""
 
-    query = db.query(ProjectTemplate)
+    version = await cache_service.get_bytes(TEMPLATE_LIST_VERSION_KEY) or b"0"
+    cache_key = (
+        f"templates:list:{version.decode()}:{organization_id}:"
+        f"{status.value if status else None}:{is_public}:{page}:{size}"
+    )
+    cached = await cache_service.get_bytes(cache_key)
+    if cached:
+        return Response(cached, media_type="application/json")
 
     # 필터링
+    conditions = []
     if organization_id:
-        query = query.filter(ProjectTemplate.organization_id == organization_id)
+        conditions.append(ProjectTemplate.organization_id == organization_id)
     if status:
-        query = query.filter(ProjectTemplate.status == status)
+        conditions.append(ProjectTemplate.status == status)
     if is_public is not None:
-        query = query.filter(ProjectTemplate.is_public == is_public)
+        conditions.append(ProjectTemplate.is_public == is_public)
 
-    # 전체 개수
-    total = query.count()
-
-    # 페이징
+    # 페이징 + 전체 개수 (윈도우 함수로 한 번에 조회)
     offset = (page - 1) * size
-    templates = query.order_by(ProjectTemplate.created_at.desc()).offset(offset).limit(size).all()
-
-    return ProjectTemplateListResponse(
-        templates=templates,
-        total=total,
-        page=page,
-        size=size
-    )
+    rows = (await db.execute(
+        select(*_TEMPLATE_LIST_COLUMNS, func.count().over().label("total")).where(*conditions)
+        .order_by(ProjectTemplate.created_at.desc()).offset(offset).limit(size)
+    )).all()
+    if rows:
+        total = rows[0].total
+    elif offset:
+        # 범위를 벗어난 페이지는 전체 개수를 따로 조회
+        total = (await db.execute(
+            select(func.count()).select_from(ProjectTemplate).where(*conditions)
+        )).scalar_one()
+    else:
+        total = 0
+
+    response = ORJSONResponse({
+        "templates": [
+            {column.key: row._mapping[column] for column in _TEMPLATE_LIST_COLUMNS if row._mapping[column] is not None}
+            for row in rows
+        ],
+        "total": total,
+        "page": page,
+        "size": size
+    })
+    await cache_service.set_bytes(cache_key, response.body, TEMPLATE_CACHE_TTL)
+    return response
 
 
 @router.get("/{template_id}", response_model=ProjectTemplateResponse)
 async def get_template(
     template_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """특정 템플릿 조회"""
 
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    cache_key = _template_cache_key(template_id)
+    cached = await cache_service.get_bytes(cache_key)
+    if cached:
+        return Response(cached, media_type="application/json")
+
+    template = await db.get(ProjectTemplate, template_id)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
-    return template
+    response = ORJSONResponse(_template_dict(template))
+    await cache_service.set_bytes(cache_key, response.body, TEMPLATE_CACHE_TTL)
+    return response
 
 
 @router.patch("/{template_id}", response_model=ProjectTemplateResponse)
 async def update_template(
     template_id: int,
     update_data: ProjectTemplateUpdate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 업데이트"""
 
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    template = await db.get(ProjectTemplate, template_id)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
     try:
         # 업데이트 적용
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             setattr(template, field, value)
 
@@ -188,15 +257,16 @@ async def update_template(
                     detail=f"Cannot activate template: {', '.join(validation_result.errors)}"
                 )
 
-        db.commit()
-        db.refresh(template)
+        await db.commit()
+        await db.refresh(template)
+        await _invalidate_template_cache(template_id)
 
-        return template
+        return ORJSONResponse(_template_dict(template))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to update template: {str(e)}")
 
 
@@ -204,25 +274,30 @@ async def update_template(
 async def delete_template(
     template_id: int,
     force: bool = Query(False, description="Force delete even if in use"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 삭제"""
 
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    if force:
+        template = await db.get(ProjectTemplate, template_id)
+        active_environments = 0
+    else:
+        # 템플릿과 사용 중인 환경 수를 한 번에 조회
+        from app.models.environment import EnvironmentInstance
+        active_count = select(func.count(EnvironmentInstance.id)).where(
+            EnvironmentInstance.template_id == ProjectTemplate.id,
+            EnvironmentInstance.status.in_(['running', 'pending', 'creating'])
+        ).scalar_subquery()
+        row = (await db.execute(
+            select(ProjectTemplate, active_count).where(ProjectTemplate.id == template_id)
+        )).first()
+        template, active_environments = row if row else (None, 0)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
     # 사용 중인 환경이 있는지 확인
     if not force and template.usage_count > 0:
-        from app.models.environment import EnvironmentInstance
-        active_environments = db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.template_id == template_id,
-            EnvironmentInstance.status.in_(['running', 'pending', 'creating'])
-        ).count()
-
         if active_environments > 0:
             raise HTTPException(
                 status_code=400,
@@ -230,26 +305,25 @@ async def delete_template(
             )
 
     try:
-        db.delete(template)
-        db.commit()
+        await db.delete(template)
+        await db.commit()
+        await _invalidate_template_cache(template_id)
 
         return {"message": "Template deleted successfully"}
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to delete template: {str(e)}")
 
 
 @router.post("/{template_id}/validate", response_model=TemplateValidationResult)
 async def validate_template_config(
     template_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 설정 유효성 검증"""
 
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    template = await db.get(ProjectTemplate, template_id)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
@@ -267,24 +341,26 @@ async def validate_template_config(
 
         # 리소스 제한 검증
         if template.resource_limits:
-            cpu_limit = template.resource_limits.get("cpu", "")
-            memory_limit = template.resource_limits.get("memory", "")
+            cpu_limit = str(template.resource_limits.get("cpu") or "")
+            memory_limit = str(template.resource_limits.get("memory") or "")
 
-            if not cpu_limit.endswith(('m', '')):
-                warnings.append("CPU limit should end with 'm' for millicores")
+            if cpu_limit and not VALID_CPU_LIMIT.fullmatch(cpu_limit):
+                warnings.append("CPU limit should be a number of cores or end with 'm' for millicores")
 
-            if not memory_limit.endswith(('Mi', 'Gi')):
+            if memory_limit and not VALID_MEMORY_LIMIT.fullmatch(memory_limit):
                 warnings.append("Memory limit should end with 'Mi' or 'Gi'")
 
         # Docker 이미지 유효성 검증 (기본적인 형식 체크)
-        if '/' not in template.base_image and ':' not in template.base_image:
+        base_image = template.base_image or ""
+        if base_image and '/' not in base_image and ':' not in base_image:
             warnings.append("Base image should include registry and tag (e.g., 'codercom/code-server:latest')")
 
-        # 포트 설정 검증
-        if template.exposed_ports:
-            for port in template.exposed_ports:
-                if not (1 <= port <= 65535):
-                    errors.append(f"Invalid port number: {port}")
+        # 포트 설정 검증 (한 번의 순회로 잘못된 포트 수집)
+        errors.extend(
+            f"Invalid port number: {port}"
+            for port in template.exposed_ports or ()
+            if not 1 <= port <= 65535
+        )
 
         # Git 저장소 URL 검증 (기본적인 형식 체크)
         if template.default_git_repo and not template.default_git_repo.startswith(('http', 'git@')):
@@ -304,23 +380,22 @@ async def validate_template_config(
 async def test_template_deployment(
     template_id: int,
     timeout_seconds: int = Query(300, description="Test timeout in seconds"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 배포 테스트"""
 
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    template = await db.get(ProjectTemplate, template_id)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
 
     try:
-        k8s_service = KubernetesService()
+        k8s_service = get_kubernetes_service()
 
         # 테스트용 네임스페이스 생성
-        test_namespace = f"test-template-{template_id}-{str(uuid.uuid4())[:8]}"
-        test_deployment_name = f"test-{template.name.lower()}-{str(uuid.uuid4())[:8]}"
+        suffix = secrets.token_hex(4)
+        test_namespace = f"test-template-{template_id}-{suffix}"
+        test_deployment_name = f"test-{template.name.lower()}-{suffix}"
 
         start_time = time.time()
 
@@ -340,9 +415,10 @@ async def test_template_deployment(
             # 배포 상태 확인 (최대 timeout_seconds까지 대기)
             deployment_ready = False
             end_time = start_time + timeout_seconds
+            get_deployment_status = k8s_service.get_deployment_status
 
-            while time.time() < end_time and not deployment_ready:
-                status = await k8s_service.get_deployment_status(
+            while time.time() < end_time:
+                status = await get_deployment_status(
                     namespace=test_namespace,
                     deployment_name=test_deployment_name
                 )
@@ -351,20 +427,21 @@ async def test_template_deployment(
                     deployment_ready = True
                     break
 
-                time.sleep(5)  # 5초 대기
+                await asyncio.sleep(5)  # 5초 대기 (이벤트 루프를 막지 않음)
 
             deployment_time = time.time() - start_time
 
-            # 로그 수집
-            logs = await k8s_service.get_pod_logs(
-                namespace=test_namespace,
-                deployment_name=test_deployment_name,
-                tail_lines=50
+            # 로그 수집과 테스트 리소스 정리를 동시에 실행
+            # (디플로이먼트 삭제 후에도 파드는 종료 유예 기간 동안 남아 있어 로그 조회 가능)
+            logs, _ = await asyncio.gather(
+                k8s_service.get_pod_logs(
+                    namespace=test_namespace,
+                    deployment_name=test_deployment_name,
+                    tail_lines=50
+                ),
+                k8s_service.delete_deployment(test_namespace, test_deployment_name)
             )
 
-            # 테스트 리소스 정리
-            await k8s_service.delete_deployment(test_namespace, test_deployment_name)
-
             return TemplateDeploymentTest(
                 success=deployment_ready,
                 deployment_time=deployment_time,
@@ -395,81 +472,78 @@ async def clone_template(
     template_id: int,
     new_name: str = Query(..., description="Name for the cloned template"),
     created_by: int = Query(..., description="Creator user ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 복제"""
 
     # 원본 템플릿 조회
-    source_template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    source_template = await db.get(ProjectTemplate, template_id)
 
     if not source_template:
         raise HTTPException(status_code=404, detail="Source template not found")
 
     # 생성자 확인
-    creator = db.query(User).filter(User.id == created_by).first()
-    if not creator:
+    creator_exists = await db.scalar(select(exists().where(User.id == created_by)))
+    if not creator_exists:
         raise HTTPException(status_code=404, detail="Creator user not found")
 
     # 이름 중복 체크
-    existing = db.query(ProjectTemplate).filter(
+    existing = await db.scalar(select(exists().where(
         ProjectTemplate.name == new_name,
         ProjectTemplate.organization_id == source_template.organization_id
-    ).first()
+    )))
 
     if existing:
         raise HTTPException(status_code=400, detail=f"Template with name '{new_name}' already exists")
 
     try:
-        # 새 템플릿 생성 (복제)
-        cloned_template = ProjectTemplate(
-            name=new_name,
-            description=f"Cloned from '{source_template.name}' - {source_template.description or ''}",
-            version="1.0.0",  # 새 버전으로 시작
-            status=TemplateStatus.DRAFT,
-            stack_config=source_template.stack_config,
-            dependencies=source_template.dependencies,
-            base_image=source_template.base_image,
-            custom_dockerfile=source_template.custom_dockerfile,
-            init_scripts=source_template.init_scripts,
-            post_start_commands=source_template.post_start_commands,
-            resource_limits=source_template.resource_limits,
-            exposed_ports=source_template.exposed_ports,
-            environment_variables=source_template.environment_variables,
-            default_git_repo=source_template.default_git_repo,
-            git_branch=source_template.git_branch,
-            is_public=False,  # 복제된 템플릿은 기본적으로 private
-            organization_id=source_template.organization_id,
-            created_by=created_by
+        # 새 템플릿 생성 (복제, INSERT ... RETURNING)
+        cloned_template = await db.scalar(
+            insert(ProjectTemplate).values(
+                name=new_name,
+                description=f"Cloned from '{source_template.name}' - {source_template.description or ''}",
+                version="1.0.0",  # 새 버전으로 시작
+                status=TemplateStatus.DRAFT,
+                stack_config=source_template.stack_config,
+                dependencies=source_template.dependencies,
+                base_image=source_template.base_image,
+                custom_dockerfile=source_template.custom_dockerfile,
+                init_scripts=source_template.init_scripts,
+                post_start_commands=source_template.post_start_commands,
+                resource_limits=source_template.resource_limits,
+                exposed_ports=source_template.exposed_ports,
+                environment_variables=source_template.environment_variables,
+                default_git_repo=source_template.default_git_repo,
+                git_branch=source_template.git_branch,
+                is_public=False,  # 복제된 템플릿은 기본적으로 private
+                organization_id=source_template.organization_id,
+                created_by=created_by
+            ).returning(ProjectTemplate)
         )
 
-        db.add(cloned_template)
-        db.commit()
-        db.refresh(cloned_template)
+        await db.commit()
+        await _invalidate_template_cache()
 
         return {
             "message": "Template cloned successfully",
             "original_template_id": template_id,
             "cloned_template_id": cloned_template.id,
-            "cloned_template": cloned_template
+            "cloned_template": _template_dict(cloned_template)
         }
 
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to clone template: {str(e)}")
 
 
 @router.get("/{template_id}/usage-stats")
 async def get_template_usage_stats(
     template_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """템플릿 사용 통계"""
 
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    template = await db.get(ProjectTemplate, template_id)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
@@ -477,33 +551,34 @@ async def get_template_usage_stats(
     try:
         from app.models.environment import EnvironmentInstance
 
-        # 총 사용 횟수
-        total_usage = db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.template_id == template_id
-        ).count()
-
-        # 현재 활성 환경
-        active_environments = db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.template_id == template_id,
-            EnvironmentInstance.status.in_(['running', 'pending', 'creating'])
-        ).count()
-
-        # 최근 7일 사용량
+        # 총 사용 횟수 / 현재 활성 환경 / 최근 7일 사용량을 한 번의 집계로 조회
         from datetime import timedelta
-        recent_usage = db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.template_id == template_id,
-            EnvironmentInstance.created_at >= datetime.utcnow() - timedelta(days=7)
-        ).count()
+        cutoff = datetime.utcnow() - timedelta(days=7)
+        total_usage, active_environments, recent_usage = (await db.execute(
+            select(
+                func.count(EnvironmentInstance.id),
+                func.count(EnvironmentInstance.id).filter(
+                    EnvironmentInstance.status.in_(['running', 'pending', 'creating'])
+                ),
+                func.count(EnvironmentInstance.id).filter(
+                    EnvironmentInstance.created_at >= cutoff
+                )
+            ).where(
+                EnvironmentInstance.template_id == template_id
+            )
+        )).one()
 
         # 사용자별 통계
-        user_usage = db.query(
-            User.name,
-            db.func.count(EnvironmentInstance.id).label('usage_count')
-        ).join(
-            EnvironmentInstance, User.id == EnvironmentInstance.user_id
-        ).filter(
-            EnvironmentInstance.template_id == template_id
-        ).group_by(User.name).all()
+        user_usage = (await db.execute(
+            select(
+                User.name,
+                func.count(EnvironmentInstance.id).label('usage_count')
+            ).join(
+                EnvironmentInstance, User.id == EnvironmentInstance.user_id
+            ).where(
+                EnvironmentInstance.template_id == template_id
+            ).group_by(User.name)
+        )).all()
 
         return {
             "template_id": template_id,
@@ -530,7 +605,7 @@ async def create_template_from_yaml(
     git_repository: Optional[str] = Form(None, description="Git repository URL (optional)"),
     description: Optional[str] = Form("YAML로 생성된 템플릿", description="Template description"),
     created_by: int = Form(..., description="Creator user ID"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """YAML 파일로부터 직접 템플릿 생성 - 업로드부터 저장까지 한 번에!"""
 
@@ -538,8 +613,8 @@ async def create_template_from_yaml(
         import yaml
 
         # 1. 생성자 확인
-        creator = db.query(User).filter(User.id == created_by).first()
-        if not creator:
+        creator_exists = await db.scalar(select(exists().where(User.id == created_by)))
+        if not creator_exists:
             raise HTTPException(status_code=404, detail="Creator user not found")
 
         # 2. 파일 확장자 확인
@@ -602,9 +677,7 @@ async def create_template_from_yaml(
         environment_config = extract_environment_config(parsed_yaml, git_info)
 
         # 6. 템플릿 중복 확인
-        existing = db.query(ProjectTemplate).filter(
-            ProjectTemplate.name == template_name
-        ).first()
+        existing = await db.scalar(select(exists().where(ProjectTemplate.name == template_name)))
 
         if existing:
             raise HTTPException(
@@ -612,32 +685,33 @@ async def create_template_from_yaml(
                 detail=f"Template '{template_name}' already exists"
             )
 
-        # 7. 템플릿 생성 및 저장
-        template = ProjectTemplate(
-            name=template_name,
-            description=description,
-            version="1.0.0",
-            status=TemplateStatus.ACTIVE,  # 바로 활성화
-            stack_config=parsed_yaml,
-            base_image=environment_config.get("base_image", "codercom/code-server:latest"),
-            init_scripts=environment_config.get("init_scripts", []),
-            post_start_commands=environment_config.get("post_start_commands", []),
-            resource_limits={
-                "cpu": "1000m",
-                "memory": "2Gi",
-                "storage": "10Gi"
-            },
-            exposed_ports=environment_config.get("exposed_ports", [8080]),
-            environment_variables=environment_config.get("environment_variables", {}),
-            default_git_repo=environment_config.get("git_repository"),
-            git_branch=environment_config.get("git_branch", "main"),
-            is_public=False,
-            created_by=created_by
+        # 7. 템플릿 생성 및 저장 (INSERT ... RETURNING)
+        template = await db.scalar(
+            insert(ProjectTemplate).values(
+                name=template_name,
+                description=description,
+                version="1.0.0",
+                status=TemplateStatus.ACTIVE,  # 바로 활성화
+                stack_config=parsed_yaml,
+                base_image=environment_config.get("base_image", "codercom/code-server:latest"),
+                init_scripts=environment_config.get("init_scripts", []),
+                post_start_commands=environment_config.get("post_start_commands", []),
+                resource_limits={
+                    "cpu": "1000m",
+                    "memory": "2Gi",
+                    "storage": "10Gi"
+                },
+                exposed_ports=environment_config.get("exposed_ports", [8080]),
+                environment_variables=environment_config.get("environment_variables", {}),
+                default_git_repo=environment_config.get("git_repository"),
+                git_branch=environment_config.get("git_branch", "main"),
+                is_public=False,
+                created_by=created_by
+            ).returning(ProjectTemplate)
         )
 
-        db.add(template)
-        db.commit()
-        db.refresh(template)
+        await db.commit()
+        await _invalidate_template_cache()
 
         # ========================================
         # 🚀 검증용 KubeDevEnvironment CRD 생성
@@ -645,14 +719,14 @@ async def create_template_from_yaml(
         # ========================================
         if False:  # Disabled validation CRD creation
             try:
-                from app.services.kubernetes_service import KubernetesService
+                from app.services.kubernetes_service import get_kubernetes_service
                 from app.models.environment import EnvironmentInstance, EnvironmentStatus
                 import logging
 
                 logger = logging.getLogger(__name__)
                 logger.info(f"Creating validation environment for template: {template.name}")
 
-                k8s_service = KubernetesService()
+                k8s_service = get_kubernetes_service()
 
                 # CRD 이름 및 네임스페이스
                 crd_name = f"validation-{template.name.lower().replace(' ', '-')}"
@@ -698,8 +772,8 @@ async def create_template_from_yaml(
                     git_branch=template.git_branch
                 )
                 db.add(validation_env)
-                db.commit()
-                db.refresh(validation_env)
+                await db.commit()
+                await db.refresh(validation_env)
 
                 logger.info(f"✅ Validation environment DB record created: {validation_env.id}")
 
@@ -708,12 +782,12 @@ async def create_template_from_yaml(
                 # CRD 생성 실패해도 템플릿은 저장됨 (경고만 표시)
                 # 필요하면 여기서 예외를 던져서 전체 트랜잭션 롤백 가능
 
-        return template
+        return ORJSONResponse(_template_dict(template))
 
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Template creation failed: {str(e)}")
 
 
@@ -1033,14 +1107,12 @@ async def get_supported_stacks():
 async def generate_custom_image_for_template(
     template_id: int,
     build_now: bool = Query(True, description="Build image immediately"),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_session)
 ):
     """기존 템플릿에서 커스텀 이미지 생성"""
 
     # 템플릿 조회
-    template = db.query(ProjectTemplate).filter(
-        ProjectTemplate.id == template_id
-    ).first()
+    template = await db.get(ProjectTemplate, template_id)
 
     if not template:
         raise HTTPException(status_code=404, detail="Template not found")
@@ -1063,7 +1135,7 @@ async def generate_custom_image_for_template(
             )
 
         # 2. Environment ID 생성 (템플릿 기반)
-        environment_id = f"template-{template_id}-{str(uuid.uuid4())[:8]}"
+        environment_id = f"template-{template_id}-{secrets.token_hex(4)}"
 
         # 3. Dockerfile 생성
         dockerfile_content = dockerfile_generator.generate_dockerfile(
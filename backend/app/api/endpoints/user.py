@@ -5,19 +5,21 @@ User API Endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from fastapi.responses import StreamingResponse
+from sqlalchemy import select, insert, func
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from typing import List
-import logging
-import os
+from typing import Any, Dict, List, Optional, Tuple
 import structlog
 import re
+import string
 import unicodedata
 import json
 import asyncio
+import time
+from pathlib import Path
 
-from app.core.database import get_db
-from app.core.dependencies import get_current_active_user
-from app.core.security import generate_access_code
+from app.core.database import get_db, get_async_session, AsyncSessionLocal
+from app.core.dependencies import CurrentUser, get_current_active_user
 from app.models.user import User, UserRole
 from app.models.project_template import ProjectTemplate, TemplateStatus
 from app.models.environment import EnvironmentInstance, EnvironmentStatus
@@ -29,103 +31,153 @@ from app.schemas.user import (
     UserCreateWithEnvironment,
     UserCreateWithEnvironmentResponse,
 )
-from app.services.kubernetes_service import KubernetesService
+from app.services.kubernetes_service import get_kubernetes_service
 from app.services.environment_service import EnvironmentService
+from app.services.notification_service import notification_service
+from app.services.user_service import (
+    create_user_with_code, create_user_with_code_sync, AccessCodeGenerationError
+)
 
-logger = logging.getLogger(__name__)
+log = structlog.get_logger(__name__)
 
 router = APIRouter()
 
 
+# sanitize_name_for_k8s용 패턴/변환 테이블 (모듈 로드 시 한 번만 생성)
+_NON_K8S_CHARS = re.compile(r'[^a-z0-9-]')
+_REPEATED_DASHES = re.compile(r'-+')
+_K8S_NAME_TRANS = str.maketrans({' ': '-', **{c: c.lower() for c in string.ascii_uppercase}})
+
+
 def sanitize_name_for_k8s(name: str) -> str:
     """
     사용자 이름을 Kubernetes RFC 1123 호환 형식으로 변환
     - 소문자 영문자, 숫자, 하이픈만 허용
     - 영문자 또는 숫자로 시작하고 끝나야 함
     """
-    # Unicode 정규화 (한글 등 → 로마자 변환 시도)
-    normalized = unicodedata.normalize('NFKD', name)
-    # ASCII로 변환 가능한 문자만 추출
-    ascii_str = normalized.encode('ASCII', 'ignore').decode('ASCII')
-
-    # 공백을 하이픈으로 변환
-    sanitized = ascii_str.replace(' ', '-')
-    # 소문자로 변환
-    sanitized = sanitized.lower()
-    # 영문자, 숫자, 하이픈만 남기기
-    sanitized = re.sub(r'[^a-z0-9-]', '', sanitized)
-    # 연속된 하이픈 제거
-    sanitized = re.sub(r'-+', '-', sanitized)
-    # 앞뒤 하이픈 제거
-    sanitized = sanitized.strip('-')
+    # ASCII가 아닌 경우만 Unicode 정규화 후 ASCII로 변환 가능한 문자만 추출
+    if not name.isascii():
+        name = unicodedata.normalize('NFKD', name).encode('ASCII', 'ignore').decode('ASCII')
+
+    # 공백 → 하이픈, 소문자 변환 후 영문자/숫자/하이픈만 남기기
+    sanitized = _NON_K8S_CHARS.sub('', name.translate(_K8S_NAME_TRANS))
+    # 연속된 하이픈 제거, 앞뒤 하이픈 제거, 최대 63자로 제한 (Kubernetes label 규칙)
+    sanitized = _REPEATED_DASHES.sub('-', sanitized).strip('-')[:63].rstrip('-')
 
     # 비어있으면 기본값 사용
-    if not sanitized:
-        sanitized = "user"
+    return sanitized or "user"
+
+
+# 일반 사용자 생성 시 사용할 ACTIVE 템플릿 캐시 (만료 시각, 행)
+ACTIVE_TEMPLATE_CACHE_TTL = 30.0
+_ACTIVE_TEMPLATE_COLUMNS = (
+    ProjectTemplate.id,
+    ProjectTemplate.name,
+    ProjectTemplate.base_image,
+    ProjectTemplate.init_scripts,
+    ProjectTemplate.post_start_commands,
+    ProjectTemplate.resource_limits,
+    ProjectTemplate.exposed_ports,
+    ProjectTemplate.environment_variables,
+    ProjectTemplate.default_git_repo,
+    ProjectTemplate.created_at,
+    ProjectTemplate.updated_at,
+)
+_active_template_cache: Optional[Tuple[float, Any]] = None
+
+
+def invalidate_active_template_cache() -> None:
+    """템플릿 생성/수정/삭제 시 ACTIVE 템플릿 캐시 무효화"""
+    global _active_template_cache
+    _active_template_cache = None
+
+
+async def _get_any_active_template(db: AsyncSession):
+    """아무 ACTIVE 템플릿 하나 (필요한 컬럼만, 짧은 TTL로 캐시)"""
+    global _active_template_cache
+    now = time.monotonic()
+    if _active_template_cache and _active_template_cache[0] > now:
+        return _active_template_cache[1]
+
+    template = (await db.execute(
+        select(*_ACTIVE_TEMPLATE_COLUMNS).where(ProjectTemplate.status == TemplateStatus.ACTIVE).limit(1)
+    )).first()
+    if template:
+        _active_template_cache = (now + ACTIVE_TEMPLATE_CACHE_TTL, template)
+    return template
+
+
+# 템플릿별 CRD spec 캐시 {template_id: (updated_at, spec)}
+CRD_SPEC_CACHE_MAXSIZE = 256
+_crd_spec_cache: Dict[int, Tuple[Any, Dict[str, Any]]] = {}
+
 
-    # 영문자 또는 숫자로 시작하도록 보장
-    if sanitized and not sanitized[0].isalnum():
-        sanitized = 'u' + sanitized
+def _template_crd_spec(template) -> Dict[str, Any]:
+    """
+    템플릿에서 파생되는 KubeDevEnvironment spec 부분
+    템플릿이 수정(updated_at 변경)되기 전까지 재사용 (반환값은 수정하지 말 것)
+    """
+    version = template.updated_at or template.created_at
+    cached = _crd_spec_cache.get(template.id)
+    if cached and cached[0] == version:
+        return cached[1]
+
+    resource_limits = template.resource_limits or {}
+    spec = {
+        "gitRepository": template.default_git_repo or "",
+        "image": template.base_image,
+        "commands": {
+            "init": "\n".join(template.init_scripts) if template.init_scripts else "",
+            "start": "\n".join(template.post_start_commands) if template.post_start_commands else ""
+        },
+        "ports": template.exposed_ports or [8080],
+        "storage": {
+            "size": resource_limits.get("storage", "10Gi")
+        }
+    }
+
+    if len(_crd_spec_cache) >= CRD_SPEC_CACHE_MAXSIZE:
+        _crd_spec_cache.clear()
+    _crd_spec_cache[template.id] = (version, spec)
+    return spec
 
-    # 최대 63자로 제한 (Kubernetes label 규칙)
-    sanitized = sanitized[:63]
 
-    return sanitized
+async def _notify_user_created(user_name: str, environment_id: int) -> None:
+    """사용자 및 환경 생성 슬랙 알림"""
+    message = f"👤 사용자 생성: '{user_name}' (환경 ID: {environment_id}) 환경 프로비저닝을 시작합니다."
+    await notification_service.send_slack_notification(message)
 
 
 @router.post("/admin", response_model=UserCreateAdminResponse, status_code=status.HTTP_201_CREATED)
 async def create_admin_user(
     user_data: UserCreateAdmin,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_session),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ) -> UserCreateAdminResponse:
     """
     사용자 생성 - 관계자
     """
-    logger.info(f"Creating admin user: {user_data.name} by user {user_data.current_user_id}")
+    log.info("Creating admin user", name=user_data.name, actor=user_data.current_user_id)
     
     # 현재 사용자가 관리자인지 확인
     if current_user.role != UserRole.ADMIN:
-        logger.warning(f"Non-admin user {current_user.id} attempted to create admin user")
+        log.warning("Non-admin user attempted to create admin user", user_id=current_user.id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only administrators can create admin users"
         )
     
-    # 5자리 접속 코드 생성 (중복 방지)
-    max_attempts = 10
-    access_code = None
-    
-    for _ in range(max_attempts):
-        code = generate_access_code(length=5)
-        # 중복 확인
-        existing_user = db.query(User).filter(User.hashed_password == code).first()
-        if not existing_user:
-            access_code = code
-            break
-    
-    if not access_code:
-        logger.error("Failed to generate unique access code after multiple attempts")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate unique access code"
-        )
-    
-    # 새 관리자 사용자 생성
-    new_user = User(
-        name=user_data.name,
-        hashed_password=access_code,  # 개발 중이므로 접속 코드를 그대로 저장
-        role=UserRole.ADMIN,
-        is_active=True,
-        created_by=user_data.current_user_id
-    )
-    
     try:
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        # 새 관리자 사용자 생성 (접속 코드는 개발 중이므로 그대로 저장)
+        new_user, access_code = await create_user_with_code(
+            db,
+            name=user_data.name,
+            role=UserRole.ADMIN,
+            created_by=user_data.current_user_id
+        )
+        await db.commit()
         
-        logger.info(f"Admin user created successfully: ID={new_user.id}, access_code={access_code}")
+        log.info("Admin user created successfully", user_id=new_user.id, access_code=access_code)
         
         return UserCreateAdminResponse(
             id=new_user.id,
@@ -137,8 +189,8 @@ async def create_admin_user(
         )
     
     except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to create admin user: {str(e)}")
+        await db.rollback()
+        log.error("Failed to create admin user", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create admin user: {str(e)}"
@@ -148,150 +200,117 @@ async def create_admin_user(
 @router.post("/user", response_model=UserCreateUserResponse, status_code=status.HTTP_201_CREATED)
 async def create_regular_user(
     user_data: UserCreateUser,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_active_user)
+    db: AsyncSession = Depends(get_async_session),
+    current_user: CurrentUser = Depends(get_current_active_user)
 ) -> UserCreateUserResponse:
     """
     사용자 생성 - 일반 사용자 (환경 자동 생성 포함)
     """
-    logger.info(f"Creating regular user: {user_data.name} by user {user_data.current_user_id}")
+    log.info("Creating regular user", name=user_data.name, actor=user_data.current_user_id)
     
     # 현재 사용자가 관리자인지 확인
     if current_user.role != UserRole.ADMIN:
-        logger.warning(f"Non-admin user {current_user.id} attempted to create regular user")
+        log.warning("Non-admin user attempted to create regular user", user_id=current_user.id)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only administrators can create users"
         )
     
-    # 5자리 접속 코드 생성 (중복 방지)
-    max_attempts = 10
-    access_code = None
-    
-    for _ in range(max_attempts):
-        code = generate_access_code(length=5)
-        # 중복 확인
-        existing_user = db.query(User).filter(User.hashed_password == code).first()
-        if not existing_user:
-            access_code = code
-            break
-    
-    if not access_code:
-        logger.error("Failed to generate unique access code after multiple attempts")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to generate unique access code"
-        )
-    
-    # 새 일반 사용자 생성
-    new_user = User(
-        name=user_data.name,
-        hashed_password=access_code,
-        role=UserRole.USER,
-        is_active=True,
-        created_by=user_data.current_user_id
-    )
-    
     try:
-        db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        # 새 일반 사용자 생성 (환경과 함께 커밋)
+        new_user, access_code = await create_user_with_code(
+            db,
+            name=user_data.name,
+            role=UserRole.USER,
+            created_by=user_data.current_user_id
+        )
         
-        logger.info(f"User created successfully: ID={new_user.id}, access_code={access_code}")
+        log.info("User created successfully", user_id=new_user.id, access_code=access_code)
         
         # 아무 ACTIVE 템플릿 조회 (관리자는 모든 템플릿 사용 가능)
-        template = db.query(ProjectTemplate).filter(
-            ProjectTemplate.status == TemplateStatus.ACTIVE
-        ).first()
+        template = await _get_any_active_template(db)
 
         if not template:
-            logger.error(f"No active template found in the system")
+            log.error("No active template found in the system")
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"No active template found. Please create a template first."
             )
         
-        logger.info(f"Using template: ID={template.id}, name={template.name}")
+        log.info("Using template", template_id=template.id, template_name=template.name)
+
+        # 템플릿 리소스 제한은 한 번만 파싱해서 응답까지 재사용
+        resource_limits = template.resource_limits or {}
+        cpu_millicores = int(resource_limits.get("cpu", "1000m").removesuffix("m"))
+        memory_gi = int(resource_limits.get("memory", "2Gi").removesuffix("Gi"))
+        service_port = template.exposed_ports[0] if template.exposed_ports else 8080
         
         # Environment 생성
         k8s_namespace = f"user-{new_user.id}"
         k8s_deployment_name = f"env-{new_user.id}-{template.id}"
         
-        new_environment = EnvironmentInstance(
-            name=f"{new_user.name}'s Environment",
-            template_id=template.id,
-            user_id=new_user.id,
-            k8s_namespace=k8s_namespace,
-            k8s_deployment_name=k8s_deployment_name,
-            k8s_service_name=f"svc-{new_user.id}",
-            status=EnvironmentStatus.PENDING,
-            environment_config=template.environment_variables or {},
-            port_mappings=template.exposed_ports or [],
-            auto_stop_enabled=True
+        new_environment = await db.scalar(
+            insert(EnvironmentInstance).values(
+                name=f"{new_user.name}'s Environment",
+                template_id=template.id,
+                user_id=new_user.id,
+                k8s_namespace=k8s_namespace,
+                k8s_deployment_name=k8s_deployment_name,
+                k8s_service_name=f"svc-{new_user.id}",
+                status=EnvironmentStatus.PENDING,
+                environment_config=template.environment_variables or {},
+                port_mappings=template.exposed_ports or [],
+                auto_stop_enabled=True
+            ).returning(EnvironmentInstance)
         )
-        
-        db.add(new_environment)
-        db.commit()
-        db.refresh(new_environment)
-        
-        logger.info(f"Environment created successfully: ID={new_environment.id}, namespace={k8s_namespace}")
+        # 사용자와 환경을 한 트랜잭션으로 커밋 (K8s 호출 동안 커넥션을 풀에 반환)
+        await db.commit()
 
         # KubeDevEnvironment CRD 생성 (컨트롤러가 자동으로 환경 프로비저닝)
-        k8s_service = KubernetesService()
-        try:
-            # CRD 이름은 고유해야 함
-            crd_name = f"env-user-{new_user.id}"
-            crd_namespace = "kubdev-users"  # 모든 CRD는 kubdev-users 네임스페이스에 생성
-
-            # 템플릿에서 리소스 제한 추출
-            cpu_limit = template.resource_limits.get("cpu", "1000m") if template.resource_limits else "1000m"
-            memory_limit = template.resource_limits.get("memory", "2Gi") if template.resource_limits else "2Gi"
-            service_port = template.exposed_ports[0] if template.exposed_ports else 8080
-
-            # KubeDevEnvironment CRD 객체 생성
-            crd_object = {
-                "apiVersion": "kubedev.my-project.com/v1alpha1",
-                "kind": "KubeDevEnvironment",
-                "metadata": {
-                    "name": crd_name,
-                    "namespace": crd_namespace
-                },
-                "spec": {
-                    "userName": new_user.name,
-                    "gitRepository": template.default_git_repo or "",
-                    "image": template.base_image,
-                    "commands": {
-                        "init": "\n".join(template.init_scripts) if template.init_scripts else "",
-                        "start": "\n".join(template.post_start_commands) if template.post_start_commands else ""
-                    },
-                    "ports": template.exposed_ports or [8080],
-                    "storage": {
-                        "size": template.resource_limits.get("storage", "10Gi") if template.resource_limits else "10Gi"
-                    }
-                }
+        # CRD 이름은 고유해야 함
+        crd_name = f"env-user-{new_user.id}"
+        crd_namespace = "kubdev-users"  # 모든 CRD는 kubdev-users 네임스페이스에 생성
+
+        # KubeDevEnvironment CRD 객체 생성
+        crd_object = {
+            "apiVersion": "kubedev.my-project.com/v1alpha1",
+            "kind": "KubeDevEnvironment",
+            "metadata": {
+                "name": crd_name,
+                "namespace": crd_namespace
+            },
+            "spec": {
+                "userName": new_user.name,
+                **_template_crd_spec(template)
             }
+        }
+
+        log.info("Environment created successfully", environment_id=new_environment.id, namespace=k8s_namespace)
 
-            # CRD 생성
-            logger.info(f"Creating KubeDevEnvironment CRD: {crd_name}")
-            await k8s_service.create_custom_object(crd_object)
+        # 커밋 이후의 부수 작업(CRD 생성, 알림)은 서로 독립적이므로 동시에 실행
+        log.info("Creating KubeDevEnvironment CRD", crd_name=crd_name)
+        crd_result, notify_result = await asyncio.gather(
+            get_kubernetes_service().create_custom_object(crd_object),
+            _notify_user_created(new_user.name, new_environment.id),
+            return_exceptions=True
+        )
+
+        if isinstance(notify_result, Exception):
+            log.error("Failed to send Slack notification for user create event", error=str(notify_result))
 
+        if isinstance(crd_result, Exception):
+            log.error("Failed to create KubeDevEnvironment CRD", error=str(crd_result))
+            # CRD 생성 실패 시 환경 상태를 ERROR로 업데이트
+            new_environment.status = EnvironmentStatus.ERROR
+            new_environment.status_message = f"CRD creation failed: {str(crd_result)}"
+        else:
             # Environment DB 업데이트 (CRD가 생성되면 컨트롤러가 처리)
             new_environment.k8s_namespace = crd_namespace
             new_environment.k8s_deployment_name = crd_name
             new_environment.status = EnvironmentStatus.CREATING
             new_environment.external_port = service_port
-            db.commit()
-            db.refresh(new_environment)
-
-            logger.info(f"KubeDevEnvironment CRD created for environment {new_environment.id}")
-
-        except Exception as k8s_error:
-            logger.error(f"Failed to create KubeDevEnvironment CRD: {str(k8s_error)}")
-            # CRD 생성 실패 시 환경 상태를 ERROR로 업데이트
-            new_environment.status = EnvironmentStatus.ERROR
-            new_environment.status_message = f"CRD creation failed: {str(k8s_error)}"
-            db.commit()
-            db.refresh(new_environment)
+            log.info("KubeDevEnvironment CRD created", environment_id=new_environment.id)
+        await db.commit()
         
         # 응답 데이터 구성
         environment_data = UserCreateUserResponse.EnvironmentData(
@@ -300,8 +319,8 @@ async def create_regular_user(
             user_id=new_user.id,
             status=new_environment.status.value,
             port=new_environment.external_port or 0,
-            cpu=int(template.resource_limits.get("cpu", "1000m").replace("m", "")) if template.resource_limits else 1000,
-            memory=int(template.resource_limits.get("memory", "2Gi").replace("Gi", "")) * 1024 if template.resource_limits else 2048
+            cpu=cpu_millicores,
+            memory=memory_gi * 1024
         )
         
         user_info = UserCreateUserResponse.UserData(
@@ -319,8 +338,8 @@ async def create_regular_user(
         )
     
     except Exception as e:
-        db.rollback()
-        logger.error(f"Failed to create regular user: {str(e)}")
+        await db.rollback()
+        log.error("Failed to create regular user", error=str(e))
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to create regular user: {str(e)}"
@@ -335,6 +354,43 @@ TEMPLATE_YAML_MAP = {
     3: "demo_bash_simple.yaml",
 }
 
+# 템플릿 ID -> YAML 절대 경로 (작업 디렉터리와 무관하게 backend/ 기준으로 import 시 한 번 계산)
+TEMPLATE_YAML_DIR = Path(__file__).resolve().parents[3]
+_TEMPLATE_YAML_PATHS: Dict[int, Path] = {
+    template_id: TEMPLATE_YAML_DIR / filename
+    for template_id, filename in TEMPLATE_YAML_MAP.items()
+}
+
+# 템플릿 YAML 파일 캐시 {경로: (mtime, 내용)}
+_template_yaml_cache: Dict[Path, Tuple[float, bytes]] = {}
+
+
+def _read_template_yaml(path: Path) -> Optional[bytes]:
+    """mtime이 바뀌지 않았으면 캐시된 내용 반환 (파일이 없으면 None)"""
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+    cached = _template_yaml_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1]
+    with open(path, 'rb') as f:
+        content = f.read()
+    _template_yaml_cache[path] = (mtime, content)
+    return content
+
+
+async def load_template_yaml(path: Path) -> Optional[bytes]:
+    """템플릿 YAML 파일 읽기 (파일 IO는 이벤트 루프 밖에서 실행)"""
+    return await asyncio.to_thread(_read_template_yaml, path)
+
+
+async def preload_template_yamls():
+    """서버 시작 시 템플릿 YAML 파일을 미리 캐시하고 누락된 파일을 알림"""
+    for template_id, path in _TEMPLATE_YAML_PATHS.items():
+        if await load_template_yaml(path) is None:
+            log.warning("Template YAML file missing", template_id=template_id, path=str(path))
+
 
 @router.post("/user-with-environment", response_model=UserCreateWithEnvironmentResponse, status_code=status.HTTP_201_CREATED)
 async def create_user_with_environment(
@@ -347,62 +403,39 @@ async def create_user_with_environment(
     템플릿을 선택하면 해당 템플릿의 YAML 파일로 환경을 자동 생성합니다.
     Template : User = 1:1 관계
     """
-    log = structlog.get_logger(__name__)
     log.info("Creating user with environment", name=user_data.name, template_id=user_data.template_id)
 
     try:
-        # 1. 사용자 계정 생성
-        access_code = generate_access_code()
-
-        # 중복 코드 확인
-        max_attempts = 10
-        for _ in range(max_attempts):
-            existing = db.query(User).filter(User.hashed_password == access_code).first()
-            if not existing:
-                break
-            access_code = generate_access_code()
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to generate unique access code"
-            )
-
-        user = User(
-            name=user_data.name,
-            role=UserRole.USER,
-            hashed_password=access_code,
-            is_active=True
-        )
-        db.add(user)
-        db.commit()
-        db.refresh(user)
-
-        log.info("User created successfully", user_id=user.id, access_code=access_code)
-
-        # 2. 템플릿에 해당하는 YAML 파일 찾기
-        yaml_filename = TEMPLATE_YAML_MAP.get(user_data.template_id)
-        if not yaml_filename:
-            db.rollback()
+        # 1. 템플릿에 해당하는 YAML 파일 찾기 (사용자 생성 전에 확인)
+        yaml_path = _TEMPLATE_YAML_PATHS.get(user_data.template_id)
+        if yaml_path is None:
             log.error("Template YAML mapping not found", template_id=user_data.template_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Template ID {user_data.template_id}에 해당하는 YAML 파일이 없습니다."
             )
 
-        # 3. YAML 파일 읽기
-        yaml_file_path = os.path.join(os.getcwd(), yaml_filename)
-        if not os.path.exists(yaml_file_path):
-            db.rollback()
-            log.error("YAML file not found", path=yaml_file_path)
+        # 2. YAML 파일 읽기 (mtime 기준 캐시)
+        yaml_content = await load_template_yaml(yaml_path)
+        if yaml_content is None:
+            log.error("YAML file not found", filename=yaml_path.name)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"YAML 파일을 찾을 수 없습니다: {yaml_filename}"
+                detail=f"YAML 파일을 찾을 수 없습니다: {yaml_path.name}"
             )
 
-        with open(yaml_file_path, 'rb') as f:
-            yaml_content = f.read()
+        log.info("YAML file loaded", filename=yaml_path.name)
 
-        log.info("YAML file loaded", filename=yaml_filename)
+        # 3. 사용자 계정 생성
+        # 접속 코드 중복은 UNIQUE 제약으로 감지 후 재시도
+        user, access_code = create_user_with_code_sync(
+            db,
+            name=user_data.name,
+            role=UserRole.USER
+        )
+        db.commit()
+
+        log.info("User created successfully", user_id=user.id, access_code=access_code)
 
         # 4. 환경 생성 (공통 함수 재활용)
         env_service = EnvironmentService(db, log)
@@ -436,18 +469,16 @@ async def create_user_with_environment(
 @router.get("/user-with-environment/stream")
 async def create_user_with_environment_stream(
     name: str = Query(..., description="사용자 이름"),
-    template_id: int = Query(..., description="템플릿 ID"),
-    db: Session = Depends(get_db)
+    template_id: int = Query(..., description="템플릿 ID")
 ):
     """
     사용자 생성 + 개발 환경 자동 생성 (실시간 로그 스트리밍) - MOCK VERSION
 
     실제 Kubernetes 환경을 생성하지 않고, 미리 생성된 3개의 mock 환경 중 하나를 할당합니다.
     Server-Sent Events를 사용하여 환경 생성 과정을 실시간으로 전송합니다.
+    세션은 스트리밍 동안 유지되어야 하므로 제너레이터 안에서 직접 엽니다.
     """
     async def event_generator():
-        log = structlog.get_logger(__name__)
-
         # Mock 환경 매핑 (템플릿 ID -> 환경 ID)
         MOCK_ENV_MAP = {
             20: 22,  # Django Template -> Environment 22
@@ -455,145 +486,136 @@ async def create_user_with_environment_stream(
             22: 24,  # AI Study Template -> Environment 24
         }
 
-        try:
-            # 1. 사용자 생성 시작
-            yield f"data: {json.dumps({'status': 'user_creating', 'message': '👤 사용자 계정 생성 중...'})}\n\n"
-            await asyncio.sleep(0.5)  # 약간의 지연 효과
-
-            access_code = generate_access_code()
-            max_attempts = 10
-            for _ in range(max_attempts):
-                existing = db.query(User).filter(User.hashed_password == access_code).first()
-                if not existing:
-                    break
-                access_code = generate_access_code()
-            else:
-                yield f"data: {json.dumps({'status': 'error', 'message': '❌ 접속 코드 생성 실패'})}\n\n"
-                return
-
-            user = User(
-                name=name,
-                role=UserRole.USER,
-                hashed_password=access_code,
-                is_active=True
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-
-            yield f"data: {json.dumps({'status': 'user_created', 'message': f'✅ 사용자 생성 완료 (ID: {user.id}, 접속코드: {access_code})'})}\n\n"
-            log.info("User created successfully", user_id=user.id, access_code=access_code)
-            await asyncio.sleep(0.8)
-
-            # 2. 템플릿 조회 (Mock)
-            yield f"data: {json.dumps({'status': 'loading_template', 'message': '📄 템플릿 정보 확인 중...'})}\n\n"
-            await asyncio.sleep(0.6)
-
-            template = db.query(ProjectTemplate).filter(ProjectTemplate.id == template_id).first()
-            if not template:
-                yield f"data: {json.dumps({'status': 'error', 'message': '❌ 템플릿을 찾을 수 없습니다'})}\n\n"
-                return
-
-            yield f"data: {json.dumps({'status': 'template_loaded', 'message': f'✅ 템플릿 확인 완료: {template.name}'})}\n\n"
-            await asyncio.sleep(0.7)
-
-            # 3. Mock 환경 할당
-            yield f"data: {json.dumps({'status': 'allocating_env', 'message': '🔧 개발 환경 할당 중...'})}\n\n"
-            await asyncio.sleep(1.0)
-
-            # 템플릿 ID에 따라 mock 환경 선택
-            mock_env_id = MOCK_ENV_MAP.get(template_id)
-            if not mock_env_id:
-                # 템플릿 매핑이 없으면 round-robin으로 할당
-                all_users = db.query(User).filter(User.role == UserRole.USER).count()
-                mock_env_id = 22 + (all_users % 3)
-
-            mock_env = db.query(EnvironmentInstance).filter(EnvironmentInstance.id == mock_env_id).first()
-            if not mock_env:
-                yield f"data: {json.dumps({'status': 'error', 'message': '❌ Mock 환경을 찾을 수 없습니다'})}\n\n"
-                return
-
-            yield f"data: {json.dumps({'status': 'env_allocated', 'message': f'✅ 환경 할당 완료 (환경 ID: {mock_env_id})'})}\n\n"
-            await asyncio.sleep(0.8)
-
-            # 4. Git 저장소 클론 (Fake) - 저장소가 있을 경우에만
-            if mock_env.git_repository:
-                yield f"data: {json.dumps({'status': 'cloning_git', 'message': f'📦 Git 저장소 클론 중: {mock_env.git_repository}'})}\n\n"
-                await asyncio.sleep(1.5)
-
-                yield f"data: {json.dumps({'status': 'git_cloned', 'message': '✅ Git 저장소 클론 완료'})}\n\n"
+        async with AsyncSessionLocal() as db:
+            try:
+                # 1. 사용자 생성 시작
+                yield f"data: {json.dumps({'status': 'user_creating', 'message': '👤 사용자 계정 생성 중...'})}\n\n"
+                await asyncio.sleep(0.5)  # 약간의 지연 효과
+
+                try:
+                    user, access_code = await create_user_with_code(
+                        db,
+                        name=name,
+                        role=UserRole.USER
+                    )
+                    await db.commit()
+                except AccessCodeGenerationError:
+                    yield f"data: {json.dumps({'status': 'error', 'message': '❌ 접속 코드 생성 실패'})}\n\n"
+                    return
+
+                yield f"data: {json.dumps({'status': 'user_created', 'message': f'✅ 사용자 생성 완료 (ID: {user.id}, 접속코드: {access_code})'})}\n\n"
+                log.info("User created successfully", user_id=user.id, access_code=access_code)
+                await asyncio.sleep(0.8)
+
+                # 2. 템플릿 조회 (Mock)
+                yield f"data: {json.dumps({'status': 'loading_template', 'message': '📄 템플릿 정보 확인 중...'})}\n\n"
+                await asyncio.sleep(0.6)
+
+                template = await db.get(ProjectTemplate, template_id)
+                if not template:
+                    yield f"data: {json.dumps({'status': 'error', 'message': '❌ 템플릿을 찾을 수 없습니다'})}\n\n"
+                    return
+
+                yield f"data: {json.dumps({'status': 'template_loaded', 'message': f'✅ 템플릿 확인 완료: {template.name}'})}\n\n"
                 await asyncio.sleep(0.7)
-            else:
-                # Git 저장소가 없는 경우 (빈 workspace)
-                yield f"data: {json.dumps({'status': 'setup_workspace', 'message': '📁 빈 워크스페이스 준비 중...'})}\n\n"
+
+                # 3. Mock 환경 할당
+                yield f"data: {json.dumps({'status': 'allocating_env', 'message': '🔧 개발 환경 할당 중...'})}\n\n"
                 await asyncio.sleep(1.0)
 
-                yield f"data: {json.dumps({'status': 'workspace_ready', 'message': '✅ 워크스페이스 준비 완료'})}\n\n"
+                # 템플릿 ID에 따라 mock 환경 선택
+                mock_env_id = MOCK_ENV_MAP.get(template_id)
+                if not mock_env_id:
+                    # 템플릿 매핑이 없으면 round-robin으로 할당
+                    all_users = await db.scalar(
+                        select(func.count()).select_from(User).where(User.role == UserRole.USER)
+                    )
+                    mock_env_id = 22 + (all_users % 3)
+
+                mock_env = await db.get(EnvironmentInstance, mock_env_id)
+                if not mock_env:
+                    yield f"data: {json.dumps({'status': 'error', 'message': '❌ Mock 환경을 찾을 수 없습니다'})}\n\n"
+                    return
+
+                yield f"data: {json.dumps({'status': 'env_allocated', 'message': f'✅ 환경 할당 완료 (환경 ID: {mock_env_id})'})}\n\n"
+                await asyncio.sleep(0.8)
+
+                # 4. Git 저장소 클론 (Fake) - 저장소가 있을 경우에만
+                if mock_env.git_repository:
+                    yield f"data: {json.dumps({'status': 'cloning_git', 'message': f'📦 Git 저장소 클론 중: {mock_env.git_repository}'})}\n\n"
+                    await asyncio.sleep(1.5)
+
+                    yield f"data: {json.dumps({'status': 'git_cloned', 'message': '✅ Git 저장소 클론 완료'})}\n\n"
+                    await asyncio.sleep(0.7)
+                else:
+                    # Git 저장소가 없는 경우 (빈 workspace)
+                    yield f"data: {json.dumps({'status': 'setup_workspace', 'message': '📁 빈 워크스페이스 준비 중...'})}\n\n"
+                    await asyncio.sleep(1.0)
+
+                    yield f"data: {json.dumps({'status': 'workspace_ready', 'message': '✅ 워크스페이스 준비 완료'})}\n\n"
+                    await asyncio.sleep(0.5)
+
+                # 5. 의존성 설치 (Fake)
+                if mock_env.git_repository and 'django' in mock_env.git_repository.lower():
+                    yield f"data: {json.dumps({'status': 'installing_deps', 'message': '📦 Python 의존성 설치 중...'})}\n\n"
+                    await asyncio.sleep(1.2)
+                    yield f"data: {json.dumps({'status': 'deps_installed', 'message': '✅ pip install 완료'})}\n\n"
+                elif mock_env.git_repository and 'react' in mock_env.git_repository.lower():
+                    yield f"data: {json.dumps({'status': 'installing_deps', 'message': '📦 npm 의존성 설치 중...'})}\n\n"
+                    await asyncio.sleep(1.5)
+                    yield f"data: {json.dumps({'status': 'deps_installed', 'message': '✅ npm install 완료'})}\n\n"
+                else:
+                    yield f"data: {json.dumps({'status': 'preparing', 'message': '⚙️ 개발 환경 준비 중...'})}\n\n"
+                    await asyncio.sleep(1.0)
+
                 await asyncio.sleep(0.5)
 
-            # 5. 의존성 설치 (Fake)
-            if mock_env.git_repository and 'django' in mock_env.git_repository.lower():
-                yield f"data: {json.dumps({'status': 'installing_deps', 'message': '📦 Python 의존성 설치 중...'})}\n\n"
-                await asyncio.sleep(1.2)
-                yield f"data: {json.dumps({'status': 'deps_installed', 'message': '✅ pip install 완료'})}\n\n"
-            elif mock_env.git_repository and 'react' in mock_env.git_repository.lower():
-                yield f"data: {json.dumps({'status': 'installing_deps', 'message': '📦 npm 의존성 설치 중...'})}\n\n"
-                await asyncio.sleep(1.5)
-                yield f"data: {json.dumps({'status': 'deps_installed', 'message': '✅ npm install 완료'})}\n\n"
-            else:
-                yield f"data: {json.dumps({'status': 'preparing', 'message': '⚙️ 개발 환경 준비 중...'})}\n\n"
+                # 6. VSCode 서버 시작 (Fake)
+                yield f"data: {json.dumps({'status': 'starting_vscode', 'message': '🚀 VSCode 서버 시작 중...'})}\n\n"
                 await asyncio.sleep(1.0)
 
-            await asyncio.sleep(0.5)
-
-            # 6. VSCode 서버 시작 (Fake)
-            yield f"data: {json.dumps({'status': 'starting_vscode', 'message': '🚀 VSCode 서버 시작 중...'})}\n\n"
-            await asyncio.sleep(1.0)
-
-            yield f"data: {json.dumps({'status': 'vscode_started', 'message': '✅ VSCode 서버 준비 완료'})}\n\n"
-            await asyncio.sleep(0.5)
+                yield f"data: {json.dumps({'status': 'vscode_started', 'message': '✅ VSCode 서버 준비 완료'})}\n\n"
+                await asyncio.sleep(0.5)
 
-            # 7. 사용자에게 환경 연결
-            # 새 환경 인스턴스 생성 (DB에만 기록, 실제 K8s는 생성 안 함)
-            new_env = EnvironmentInstance(
-                name=f"{user.name}'s Environment",
-                template_id=template_id,
-                user_id=user.id,
-                k8s_namespace=mock_env.k8s_namespace,
-                k8s_deployment_name=f"mock-{user.id}",
-                k8s_service_name=f"svc-{user.id}",
-                status=EnvironmentStatus.RUNNING,
-                git_repository=mock_env.git_repository,
-                git_branch=mock_env.git_branch or 'main',
-                access_url=mock_env.access_url,  # Mock 환경의 URL 사용
-                environment_config=template.environment_variables or {},
-                port_mappings=template.exposed_ports or [],
-                auto_stop_enabled=True
-            )
-            db.add(new_env)
-            db.commit()
-            db.refresh(new_env)
-
-            log.info("Mock environment assigned",
-                     user_id=user.id,
-                     env_id=new_env.id,
-                     mock_env_id=mock_env_id,
-                     url=mock_env.access_url)
-
-            # 8. 완료!
-            completion_data = {
-                'status': 'completed',
-                'message': '🎉 환경 생성 완료!',
-                'user_id': user.id,
-                'access_code': access_code,
-                'environment_id': new_env.id,
-                'url': mock_env.access_url
-            }
-            yield f"data: {json.dumps(completion_data)}\n\n"
+                # 7. 사용자에게 환경 연결
+                # 새 환경 인스턴스 생성 (DB에만 기록, 실제 K8s는 생성 안 함)
+                new_env = await db.scalar(insert(EnvironmentInstance).values(
+                    name=f"{user.name}'s Environment",
+                    template_id=template_id,
+                    user_id=user.id,
+                    k8s_namespace=mock_env.k8s_namespace,
+                    k8s_deployment_name=f"mock-{user.id}",
+                    k8s_service_name=f"svc-{user.id}",
+                    status=EnvironmentStatus.RUNNING,
+                    git_repository=mock_env.git_repository,
+                    git_branch=mock_env.git_branch or 'main',
+                    access_url=mock_env.access_url,  # Mock 환경의 URL 사용
+                    environment_config=template.environment_variables or {},
+                    port_mappings=template.exposed_ports or [],
+                    auto_stop_enabled=True
+                ).returning(EnvironmentInstance))
+                await db.commit()
+
+                log.info("Mock environment assigned",
+                         user_id=user.id,
+                         env_id=new_env.id,
+                         mock_env_id=mock_env_id,
+                         url=mock_env.access_url)
+
+                # 8. 완료!
+                completion_data = {
+                    'status': 'completed',
+                    'message': '🎉 환경 생성 완료!',
+                    'user_id': user.id,
+                    'access_code': access_code,
+                    'environment_id': new_env.id,
+                    'url': mock_env.access_url
+                }
+                yield f"data: {json.dumps(completion_data)}\n\n"
 
-        except Exception as e:
-            db.rollback()
-            log.error("Failed to create mock environment", error=str(e), exc_info=True)
-            yield f"data: {json.dumps({'status': 'error', 'message': f'❌ 생성 실패: {str(e)}'})}\n\n"
+            except Exception as e:
+                await db.rollback()
+                log.error("Failed to create mock environment", error=str(e), exc_info=True)
+                yield f"data: {json.dumps({'status': 'error', 'message': f'❌ 생성 실패: {str(e)}'})}\n\n"
 
     return StreamingResponse(event_generator(), media_type="text/event-stream")
@@ -6,6 +6,7 @@ Main API Router
 from fastapi import APIRouter
 from app.api.endpoints import (
     auth,
+    batch,
     environments,
     user,
     monitoring,
@@ -19,3 +20,4 @@ api_router.include_router(user.router, prefix="/users", tags=["Users"])
 api_router.include_router(environments.router, prefix="/environments", tags=["Environments"])
 api_router.include_router(templates.router, prefix="/templates", tags=["Templates"])
 api_router.include_router(monitoring.router, prefix="/monitoring", tags=["Monitoring"])
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
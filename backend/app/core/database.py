@@ -4,11 +4,15 @@ Database configuration and session management
 """
 
 from sqlalchemy import create_engine, MetaData, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, Session, declarative_base
 from sqlalchemy.pool import StaticPool
-from typing import Generator
+from functools import lru_cache
+from typing import AsyncGenerator, Generator
 import logging
 import traceback
+import orjson
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
@@ -23,32 +27,102 @@ except Exception as e:
     logger.error(f"Traceback:\n{traceback.format_exc()}")
     raise
 
-# SQLAlchemy 엔진 생성
-try:
-    logger.info("Creating SQLAlchemy engine...")
-    logger.info(f"Database URL (masked): {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'invalid'}")
-    logger.info(f"Pool size: {settings.DATABASE_POOL_SIZE}, Max overflow: {settings.DATABASE_MAX_OVERFLOW}")
 
-    engine = create_engine(
-        settings.DATABASE_URL,
+
+def _json_serializer(value) -> str:
+    """JSON 컬럼 직렬화 (stdlib json 대신 orjson, dict의 정수 키 허용)"""
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# 엔진/세션 팩토리는 처음 사용할 때 생성 (DB를 쓰지 않는 스크립트/임포트에서 풀을 만들지 않도록)
+@lru_cache(maxsize=1)
+def get_engine() -> Engine:
+    """동기 SQLAlchemy 엔진 반환 (프로세스당 한 번 생성)"""
+    try:
+        logger.info("Creating SQLAlchemy engine...")
+        logger.info(f"Database URL (masked): {settings.DATABASE_URL.split('@')[1] if '@' in settings.DATABASE_URL else 'invalid'}")
+        logger.info(f"Pool size: {settings.DATABASE_POOL_SIZE}, Max overflow: {settings.DATABASE_MAX_OVERFLOW}, Recycle: {settings.DATABASE_POOL_RECYCLE}s, Timeout: {settings.DATABASE_POOL_TIMEOUT}s")
+
+        engine = create_engine(
+            settings.DATABASE_URL,
+            pool_size=settings.DATABASE_POOL_SIZE,
+            max_overflow=settings.DATABASE_MAX_OVERFLOW,
+            pool_pre_ping=True,
+            pool_recycle=settings.DATABASE_POOL_RECYCLE,
+            pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+            echo=settings.DEBUG,
+            connect_args={"client_encoding": "utf8"},
+            json_serializer=_json_serializer,
+            json_deserializer=orjson.loads,
+        )
+        logger.info("SQLAlchemy engine created successfully")
+        return engine
+    except Exception as e:
+        logger.error(f"Failed to create SQLAlchemy engine: {e}")
+        logger.error(f"Traceback:\n{traceback.format_exc()}")
+        raise
+
+
+@lru_cache(maxsize=1)
+def _sync_maker() -> sessionmaker:
+    # commit 후 객체를 만료시키지 않음 (커밋 직후 속성 접근마다 SELECT가 다시 나가는 것 방지)
+    return sessionmaker(
+        autocommit=False,
+        autoflush=False,
+        expire_on_commit=False,
+        bind=get_engine()
+    )
+
+
+def SessionLocal() -> Session:
+    """새 동기 세션 생성"""
+    return _sync_maker()()
+
+# pgbouncer 트랜잭션 풀링에서는 서버 연결이 트랜잭션마다 바뀌어 prepared statement를 재사용할 수 없음
+_async_connect_args = (
+    {"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    if settings.PGBOUNCER_MODE == "transaction" else {}
+)
+
+@lru_cache(maxsize=1)
+def get_async_engine() -> AsyncEngine:
+    """비동기 엔진 (asyncpg) 반환 - 이벤트 루프를 막지 않는 엔드포인트용"""
+    # LIFO: 최근에 쓴 연결부터 재사용해 statement 캐시가 데워진 소수의 연결만 계속 사용
+    return create_async_engine(
+        make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
         pool_size=settings.DATABASE_POOL_SIZE,
         max_overflow=settings.DATABASE_MAX_OVERFLOW,
         pool_pre_ping=True,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_use_lifo=True,
         echo=settings.DEBUG,
-        connect_args={"client_encoding": "utf8"},
+        connect_args=_async_connect_args,
+        json_serializer=_json_serializer,
+        json_deserializer=orjson.loads,
     )
-    logger.info("SQLAlchemy engine created successfully")
-except Exception as e:
-    logger.error(f"Failed to create SQLAlchemy engine: {e}")
-    logger.error(f"Traceback:\n{traceback.format_exc()}")
-    raise
 
-# SessionLocal 클래스 생성
-SessionLocal = sessionmaker(
-    autocommit=False,
-    autoflush=False,
-    bind=engine
-)
+
+@lru_cache(maxsize=1)
+def _async_maker() -> async_sessionmaker:
+    return async_sessionmaker(
+        get_async_engine(),
+        autoflush=False,
+        expire_on_commit=False
+    )
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """새 비동기 세션 생성"""
+    return _async_maker()()
+
+
+async def dispose_engines():
+    """생성된 엔진의 풀 연결 정리 (앱 종료 시)"""
+    if get_async_engine.cache_info().currsize:
+        await get_async_engine().dispose()
+    if get_engine.cache_info().currsize:
+        get_engine().dispose()
 
 # Base 클래스 생성
 Base = declarative_base()
@@ -80,6 +154,19 @@ def get_db() -> Generator[Session, None, None]:
             logger.debug("Database session closed")
 
 
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    비동기 데이터베이스 세션 의존성 주입용 함수
+    FastAPI Depends에서 사용
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            yield session
+        except Exception:
+            await session.rollback()
+            raise
+
+
 def create_all_tables():
     """
     모든 테이블 생성
@@ -90,17 +177,17 @@ def create_all_tables():
         logger.info("Importing models...")
 
         # 모델 import를 여기서 수행하여 Base.metadata에 등록
-        from app.models import User, ProjectTemplate, EnvironmentInstance, ResourceMetric
+        from app.models import User, ProjectTemplate, EnvironmentInstance, ResourceMetric, ResourceMetricRollup5m
         logger.info("Models imported successfully")
 
         logger.info(f"DEBUG mode: {settings.DEBUG}")
         logger.info("Creating database tables...")
 
         if settings.DEBUG:
-            Base.metadata.create_all(bind=engine)
+            Base.metadata.create_all(bind=get_engine())
             logger.info("All database tables created (DEBUG mode)")
         else:
-            Base.metadata.create_all(bind=engine)
+            Base.metadata.create_all(bind=get_engine())
             logger.info("All database tables created (Production mode)")
 
     except Exception as e:
@@ -115,7 +202,7 @@ def check_database_connection() -> bool:
     헬스체크에서 사용
     """
     try:
-        with engine.connect() as connection:
+        with get_engine().connect() as connection:
             connection.execute(text("SELECT 1"))
         return True
     except Exception as e:
@@ -127,9 +214,13 @@ class DatabaseManager:
     """데이터베이스 관리 클래스"""
 
     def __init__(self):
-        self.engine = engine
         self.SessionLocal = SessionLocal
 
+    @property
+    def engine(self) -> Engine:
+        """동기 엔진 (처음 접근할 때 생성)"""
+        return get_engine()
+
     def get_session(self) -> Session:
         """새 데이터베이스 세션 반환"""
         return self.SessionLocal()
@@ -3,42 +3,39 @@ FastAPI Dependencies (Simplified)
 API 종속성 및 간단한 인증 미들웨어
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from typing import Optional
 
-from .database import get_db
-from .security import get_current_user_simple, get_current_user as get_user
+from .database import get_db, get_async_session
+from .security import CurrentUser, get_current_user_simple, get_current_user_async
 from app.models.user import User, UserRole
 
 # Bearer Token 스키마
 security = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
+async def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """현재 사용자 조회 (간단한 인증)"""
-    return get_user(credentials, db)
+    db: AsyncSession = Depends(get_async_session)
+) -> CurrentUser:
+    """현재 사용자 조회 (간단한 인증, 비활성 사용자는 조회 쿼리에서 거부)
+
+    ORM 엔티티가 아닌 CurrentUser(id, name, role, is_active)를 반환하므로
+    다른 컬럼이 필요하거나 값을 수정하려면 db.get(User, current_user.id)로 행을 조회할 것.
+    """
+    return await get_current_user_async(credentials, db)
 
 
-def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
-    """활성 사용자만 허용"""
-    if not current_user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Inactive user"
-        )
-    return current_user
+# 활성 여부는 get_current_user의 조회 조건에 포함되므로 별도 의존성 단계 없이 그대로 사용
+get_current_active_user = get_current_user
 
 
 def require_role(required_role: UserRole):
     """특정 역할 이상의 사용자만 허용하는 의존성 (개발용에서는 항상 허용)"""
-    def role_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    def role_checker(current_user: CurrentUser = Depends(get_current_active_user)) -> CurrentUser:
         # 개발용에서는 모든 역할 허용
         return current_user
 
@@ -47,7 +44,7 @@ def require_role(required_role: UserRole):
 
 def require_organization_access(organization_id: Optional[int] = None):
     """특정 조직에 대한 접근 권한이 있는 사용자만 허용 (개발용에서는 항상 허용)"""
-    def org_checker(current_user: User = Depends(get_current_active_user)) -> User:
+    def org_checker(current_user: CurrentUser = Depends(get_current_active_user)) -> CurrentUser:
         # 개발용에서는 모든 조직 접근 허용
         return current_user
 
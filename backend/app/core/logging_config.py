@@ -1,7 +1,14 @@
 import logging
 import sys
+import orjson
 import structlog
 
+
+def _orjson_dumps(obj, **kwargs) -> str:
+    """JSONRenderer용 orjson 직렬화 (stdlib 로거에 넘기므로 str로 변환)"""
+    return orjson.dumps(obj, **kwargs).decode()
+
+
 def setup_logging():
     """
     Set up structured logging using structlog.
@@ -21,7 +28,7 @@ def setup_logging():
             structlog.processors.StackInfoRenderer(),
             structlog.processors.format_exc_info,
             structlog.processors.UnicodeDecoder(),
-            structlog.processors.JSONRenderer()
+            structlog.processors.JSONRenderer(serializer=_orjson_dumps)
         ],
         context_class=dict,
         logger_factory=structlog.stdlib.LoggerFactory(),
@@ -4,16 +4,19 @@ Simplified Security for Development
 """
 
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, NamedTuple, Tuple
 import secrets
 import string
+import time
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .config import settings
-from .database import get_db
-from app.models.user import User
+from .database import get_db, get_async_session
+from app.models.user import User, UserRole
 
 # 개발용 간단한 인증 설정
 security = HTTPBearer(auto_error=False)
@@ -75,16 +78,14 @@ def create_user_token(user: User) -> Dict[str, Any]:
     }
 
 
-def get_current_user_simple(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
-    """간단한 현재 사용자 조회 (개발용)"""
+def _resolve_token(
+    credentials: Optional[HTTPAuthorizationCredentials]
+) -> Tuple[Optional[User], Optional[int]]:
+    """토큰 해석: (개발용 사용자, None) 또는 (None, DB에서 조회할 사용자 ID)"""
 
-    # 인증 없이 허용 (개발 모드)
+    # 인증 없이 허용 (개발 모드) - 기본 관리자 사용자
     if not credentials:
-        # 기본 관리자 사용자 반환
-        return create_dev_user()
+        return create_dev_user(), None
 
     token = credentials.credentials
 
@@ -95,26 +96,119 @@ def get_current_user_simple(
             user_id=user_data["user_id"],
             access_code=user_data["access_code"],
             role=user_data["role"]
-        )
+        ), None
 
     # 간단한 사용자 토큰 확인 ({id}-{access_code} 형식)
-    try:
-        parts = token.split("-")
-        if len(parts) >= 2:
-            user_id = int(parts[0])
-            user = db.query(User).filter(User.id == user_id).first()
-            if user:
-                return user
-    except (ValueError, IndexError):
-        pass
+    parts = token.split("-")
+    if len(parts) >= 2:
+        try:
+            return None, int(parts[0])
+        except ValueError:
+            pass
 
     # 인증 실패시에도 기본 사용자 반환 (개발용)
-    return create_dev_user()
+    return create_dev_user(), None
+
+
+def get_current_user_simple(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: Session = Depends(get_db)
+) -> Optional[User]:
+    """간단한 현재 사용자 조회 (개발용)
+
+    토큰이 없거나 개발용 키면 개발용 사용자를 반환하고,
+    사용자 토큰이 가리키는 사용자가 없거나 비활성이면 401을 반환함.
+    """
+    dev_user, user_id = _resolve_token(credentials)
+    if user_id is None:
+        return dev_user
+
+    user = db.query(User).filter(User.id == user_id, User.is_active.is_(True)).first()
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive or unknown user"
+        )
+    return user
+
+
+class CurrentUser(NamedTuple):
+    """인증 의존성에서 사용하는 사용자 컬럼만 담은 경량 객체 (전체 행이 필요하면 db.get으로 조회)"""
+    id: int
+    name: str
+    role: UserRole
+    is_active: bool
+
+
+_CURRENT_USER_COLUMNS = (User.id, User.name, User.role, User.is_active)
+
+# 토큰 -> 사용자 캐시 (요청마다 사용자 SELECT 방지)
+# 활성 여부/역할은 캐시를 채울 때만 확인하므로, 다른 워커에서 비활성화/역할 변경된 사용자는
+# 최대 USER_CACHE_TTL 동안 이전 권한으로 요청 가능 (같은 워커에서는 invalidate_user_cache로 즉시 반영)
+USER_CACHE_TTL = 5.0
+USER_CACHE_MAXSIZE = 10_000
+_user_cache: Dict[str, Tuple[float, CurrentUser]] = {}
+
+
+def invalidate_user_cache(user_id: Optional[int] = None) -> None:
+    """사용자 삭제/비활성화/권한 변경 시 캐시 무효화 (user_id가 없으면 전체, 현재 워커에만 적용)"""
+    if user_id is None:
+        _user_cache.clear()
+        return
+    for token in [t for t, (_, u) in _user_cache.items() if u.id == user_id]:
+        _user_cache.pop(token, None)
+
+
+async def get_current_user_async(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
+    db: AsyncSession = Depends(get_async_session)
+) -> CurrentUser:
+    """현재 사용자 조회 (비동기 세션, 이벤트 루프를 막지 않음)
+
+    토큰이 없거나 개발용 키면 개발용 사용자를 반환하고,
+    사용자 토큰이 가리키는 사용자가 없거나 비활성이면 401을 반환함.
+    """
+    dev_user, user_id = _resolve_token(credentials)
+    if user_id is None:
+        return dev_user
+
+    token = credentials.credentials
+    now = time.monotonic()
+    cached = _user_cache.get(token)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    # ORM 엔티티 대신 필요한 컬럼만 조회 (활성 조건은 부분 인덱스 ix_users_active_id 사용)
+    row = (await db.execute(
+        select(*_CURRENT_USER_COLUMNS).where(User.id == user_id, User.is_active.is_(True))
+    )).first()
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Inactive or unknown user"
+        )
+    user = CurrentUser(*row)
+
+    _user_cache.pop(token, None)
+    if len(_user_cache) >= USER_CACHE_MAXSIZE:
+        _evict_user_cache(now)
+    # dict는 삽입 순서를 유지하므로 맨 앞이 가장 오래 전에 채워진 항목
+    _user_cache[token] = (now + USER_CACHE_TTL, user)
+    return user
+
+
+def _evict_user_cache(now: float) -> None:
+    """앞쪽(가장 오래된) 항목부터 만료된 것을 제거하고, 그래도 가득 차 있으면 가장 오래된 항목 제거 (전체 초기화 방지)"""
+    # 모든 항목의 TTL이 같으므로 삽입 순서가 곧 만료 순서
+    while _user_cache:
+        token, (expiry, _) = next(iter(_user_cache.items()))
+        if expiry > now and len(_user_cache) < USER_CACHE_MAXSIZE:
+            break
+        del _user_cache[token]
 
 
 def create_dev_user(user_id: int = 1, access_code: str = "ADMIN", role: str = "admin") -> User:
     """개발용 임시 사용자 객체 생성"""
-    from app.models.user import UserRole
 
     # 메모리상 임시 User 객체 생성
     class DevUser:
@@ -134,12 +228,8 @@ def get_current_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
-    """현재 사용자 조회 (인증 필수) - 개발용에서는 항상 성공"""
-    user = get_current_user_simple(credentials, db)
-    if not user:
-        # 개발 모드에서는 기본 사용자 반환
-        return create_dev_user()
-    return user
+    """현재 사용자 조회 (인증 필수) - 없거나 비활성인 사용자의 토큰은 401"""
+    return get_current_user_simple(credentials, db)
 
 
 def get_admin_user(
@@ -6,11 +6,12 @@ SQLAlchemy 데이터베이스 모델들
 from .user import User
 from .project_template import ProjectTemplate
 from .environment import EnvironmentInstance
-from .resource_metrics import ResourceMetric
+from .resource_metrics import ResourceMetric, ResourceMetricRollup5m
 
 __all__ = [
     "User",
     "ProjectTemplate",
     "EnvironmentInstance",
-    "ResourceMetric"
+    "ResourceMetric",
+    "ResourceMetricRollup5m"
 ]
\ No newline at end of file
@@ -3,7 +3,7 @@ Environment Instance Model
 개발 환경 인스턴스 모델
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, JSON, Enum
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, JSON, Enum, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -25,6 +25,9 @@ class EnvironmentStatus(enum.Enum):
 class EnvironmentInstance(Base):
     """개발 환경 인스턴스 모델"""
     __tablename__ = "environment_instances"
+    __table_args__ = (
+        Index("ix_environment_instances_user_id_created_at", "user_id", "created_at"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)  # 환경 이름 (사용자 정의)
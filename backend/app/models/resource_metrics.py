@@ -3,7 +3,8 @@ Resource Metrics Model
 리소스 사용량 메트릭 모델
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Float, JSON
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, ForeignKey, Float, Index, PrimaryKeyConstraint
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -20,33 +21,41 @@ class ResourceMetric(Base):
     environment_id = Column(Integer, ForeignKey("environment_instances.id"), nullable=False)
 
     # CPU 메트릭
-    cpu_usage_percent = Column(Float, default=0.0)      # CPU 사용률 (%)
-    cpu_usage_cores = Column(Float, default=0.0)        # CPU 사용량 (cores)
-    cpu_limit_cores = Column(Float, default=1.0)        # CPU 제한 (cores)
+    # 사용률(0-100)과 코어 수는 단정밀도(REAL, 4 bytes)로 충분
+    cpu_usage_percent = Column(Float(precision=24), default=0.0)  # CPU 사용률 (%)
+    cpu_usage_cores = Column(Float(precision=24), default=0.0)    # CPU 사용량 (cores)
+    cpu_limit_cores = Column(Float(precision=24), default=1.0)    # CPU 제한 (cores)
 
     # 메모리 메트릭
-    memory_usage_bytes = Column(Integer, default=0)     # 메모리 사용량 (bytes)
-    memory_usage_percent = Column(Float, default=0.0)   # 메모리 사용률 (%)
-    memory_limit_bytes = Column(Integer, default=0)     # 메모리 제한 (bytes)
+    memory_usage_bytes = Column(BigInteger, default=0)  # 메모리 사용량 (bytes)
+    memory_usage_percent = Column(Float(precision=24), default=0.0)  # 메모리 사용률 (%)
+    memory_limit_bytes = Column(BigInteger, default=0)  # 메모리 제한 (bytes)
 
     # 스토리지 메트릭
-    storage_usage_bytes = Column(Integer, default=0)    # 스토리지 사용량 (bytes)
-    storage_usage_percent = Column(Float, default=0.0)  # 스토리지 사용률 (%)
-    storage_limit_bytes = Column(Integer, default=0)    # 스토리지 제한 (bytes)
+    storage_usage_bytes = Column(BigInteger, default=0)  # 스토리지 사용량 (bytes)
+    storage_usage_percent = Column(Float(precision=24), default=0.0)  # 스토리지 사용률 (%)
+    storage_limit_bytes = Column(BigInteger, default=0)  # 스토리지 제한 (bytes)
 
     # 네트워크 메트릭
-    network_rx_bytes = Column(Integer, default=0)       # 수신 바이트
-    network_tx_bytes = Column(Integer, default=0)       # 송신 바이트
-    network_rx_packets = Column(Integer, default=0)     # 수신 패킷
-    network_tx_packets = Column(Integer, default=0)     # 송신 패킷
+    network_rx_bytes = Column(BigInteger, default=0)    # 수신 바이트
+    network_tx_bytes = Column(BigInteger, default=0)    # 송신 바이트
+    network_rx_packets = Column(BigInteger, default=0)  # 수신 패킷
+    network_tx_packets = Column(BigInteger, default=0)  # 송신 패킷
 
     # 추가 메트릭 (JSON으로 확장 가능)
-    additional_metrics = Column(JSON, default={})
+    additional_metrics = Column(JSONB, default={})
 
     # 타임스탬프
-    timestamp = Column(DateTime(timezone=True), server_default=func.now(), index=True)
+    timestamp = Column(DateTime(timezone=True), server_default=func.now())
     collected_at = Column(DateTime(timezone=True), server_default=func.now())
 
+    __table_args__ = (
+        # 환경별 최신 메트릭 조회용
+        Index("ix_resource_metrics_environment_id_timestamp", environment_id, timestamp.desc()),
+        # 시간 범위 조회용 (삽입 순서와 시간이 일치하므로 btree보다 훨씬 작은 BRIN 사용)
+        Index("ix_resource_metrics_timestamp_brin", timestamp, postgresql_using="brin"),
+    )
+
     # 관계
     environment = relationship("EnvironmentInstance", back_populates="resource_metrics")
 
@@ -66,4 +75,23 @@ class ResourceMetric(Base):
     @property
     def storage_usage_gb(self) -> float:
         """스토리지 사용량을 GB 단위로 반환"""
-        return self.storage_usage_bytes / (1024 * 1024 * 1024)
\ No newline at end of file
+        return self.storage_usage_bytes / (1024 * 1024 * 1024)
+
+
+class ResourceMetricRollup5m(Base):
+    """5분 단위 메트릭 집계 (대시보드 요약은 원본 대신 이 테이블에서 조회)"""
+    __tablename__ = "resource_metrics_rollup_5m"
+    __table_args__ = (
+        PrimaryKeyConstraint("environment_id", "bucket_start"),
+    )
+
+    environment_id = Column(Integer, ForeignKey("environment_instances.id"), nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # 5분 구간 시작 시각
+
+    avg_cpu_usage = Column(Float, default=0.0)
+    max_cpu_usage = Column(Float, default=0.0)
+    avg_memory_usage = Column(Float, default=0.0)
+    max_memory_usage = Column(Float, default=0.0)
+    avg_storage_usage = Column(Float, default=0.0)
+    max_storage_usage = Column(Float, default=0.0)
+    samples = Column(Integer, default=0)  # 구간 내 원본 메트릭 수
@@ -3,7 +3,7 @@ User Model
 사용자 정보 모델
 """
 
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Enum, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -20,6 +20,10 @@ class UserRole(enum.Enum):
 class User(Base):
     """사용자 모델"""
     __tablename__ = "users"
+    __table_args__ = (
+        # 인증 시 활성 사용자 조회용 부분 인덱스
+        Index("ix_users_active_id", "id", postgresql_where=text("is_active")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -15,6 +15,7 @@ from .user import (
 from .project_template import ProjectTemplateCreate, ProjectTemplateResponse, ProjectTemplateUpdate
 from .environment import EnvironmentCreate, EnvironmentResponse, EnvironmentUpdate
 from .resource_metrics import ResourceMetricResponse
+from .batch import BatchSubRequest, BatchSubResponse
 
 __all__ = [
     "UserCreateAdmin",
@@ -30,5 +31,7 @@ __all__ = [
     "EnvironmentCreate",
     "EnvironmentResponse",
     "EnvironmentUpdate",
-    "ResourceMetricResponse"
+    "ResourceMetricResponse",
+    "BatchSubRequest",
+    "BatchSubResponse"
 ]
\ No newline at end of file
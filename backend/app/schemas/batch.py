@@ -0,0 +1,20 @@
+"""
+Batch Schemas
+여러 API 호출을 한 번의 요청으로 묶는 배치 스키마
+"""
+
+from pydantic import BaseModel, Field
+from typing import Any, Literal, Optional
+
+
+class BatchSubRequest(BaseModel):
+    """배치에 포함된 개별 요청"""
+    method: Literal["GET", "POST", "PUT", "PATCH", "DELETE"] = "GET"
+    path: str = Field(..., min_length=1, description="앱 루트 기준 경로 (예: /api/v1/environments/)")
+    body: Optional[Any] = None
+
+
+class BatchSubResponse(BaseModel):
+    """개별 요청의 응답 (요청과 같은 순서)"""
+    status: int
+    body: Any = None
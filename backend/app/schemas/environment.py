@@ -3,7 +3,7 @@ Environment Schemas
 환경 관련 Pydantic 스키마
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from app.models.environment import EnvironmentStatus
@@ -60,8 +60,7 @@ class EnvironmentResponse(EnvironmentBase):
     expires_at: Optional[datetime]
     last_accessed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class EnvironmentActionRequest(BaseModel):
@@ -3,7 +3,7 @@ Project Template Schemas
 프로젝트 템플릿 관련 Pydantic 스키마
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any, List
 from datetime import datetime
 from app.models.project_template import TemplateStatus
@@ -80,13 +80,28 @@ class ProjectTemplateResponse(ProjectTemplateBase):
     created_at: datetime
     updated_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ProjectTemplateListItem(BaseModel):
+    """프로젝트 템플릿 목록 항목 스키마 (대용량 설정 필드 제외, None 값 생략)"""
+    id: int
+    name: str
+    description: Optional[str] = None
+    version: str
+    status: TemplateStatus
+    is_public: bool
+    organization_id: Optional[int] = None
+    usage_count: int
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
 
 
 class ProjectTemplateListResponse(BaseModel):
     """프로젝트 템플릿 목록 응답 스키마"""
-    templates: List[ProjectTemplateResponse]
+    templates: List[ProjectTemplateListItem]
     total: int
     page: int
     size: int
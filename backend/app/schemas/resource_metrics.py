@@ -3,7 +3,7 @@ Resource Metrics Schemas
 리소스 메트릭 관련 Pydantic 스키마
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any
 from datetime import datetime
 
@@ -41,8 +41,7 @@ class ResourceMetricResponse(BaseModel):
     timestamp: datetime
     collected_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MetricsSummary(BaseModel):
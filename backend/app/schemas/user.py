@@ -3,7 +3,7 @@ User Schemas
 사용자 관련 Pydantic 스키마
 """
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 from datetime import datetime
 from app.models.user import UserRole
@@ -33,8 +33,7 @@ class UserCreateAdminResponse(BaseModel):
     is_active: bool
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserCreateUser(BaseModel):
@@ -79,8 +78,7 @@ class UserLoginResponse(BaseModel):
         role: UserRole
         last_login: Optional[datetime]
 
-        class Config:
-            from_attributes = True
+        model_config = ConfigDict(from_attributes=True)
     
     user_info: UserInfo
 
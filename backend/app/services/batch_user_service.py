@@ -14,9 +14,9 @@ from sqlalchemy.orm import Session
 from app.models.user import User, UserRole
 from app.models.environment import EnvironmentInstance, EnvironmentStatus
 from app.models.project_template import ProjectTemplate
-from app.services.kubernetes_service import KubernetesService
+from app.services.kubernetes_service import get_kubernetes_service
 from app.services.environment_service import EnvironmentService
-from app.core.security import get_password_hash
+from app.core.security import get_password_hash, invalidate_user_cache
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,7 +27,7 @@ class BatchUserService:
 
     def __init__(self, db: Session):
         self.db = db
-        self.k8s_service = KubernetesService()
+        self.k8s_service = get_kubernetes_service()
 
     def _generate_password(self, length: int = 12) -> str:
         """안전한 비밀번호 자동 생성"""
@@ -391,6 +391,7 @@ class BatchUserService:
                         # 사용자 삭제
                         self.db.delete(user)
                         self.db.commit()
+                        invalidate_user_cache(user.id)
 
                         detail["status"] = "deleted"
                         deleted_count += 1
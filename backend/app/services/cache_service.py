@@ -0,0 +1,144 @@
+"""
+Cache Service
+여러 워커가 공유하는 Redis 캐시 (대시보드 폴링용 K8s 조회 결과 등)
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+
+import orjson
+import redis.asyncio as aioredis
+import structlog
+from redis.exceptions import RedisError
+
+from app.core.config import settings
+
+log = structlog.get_logger(__name__)
+
+# Redis 연결 실패 후 재시도까지 대기 시간 (그동안은 캐시 없이 직접 조회)
+REDIS_RETRY_INTERVAL = 30.0
+
+
+class CacheService:
+    """Redis 기반 공유 캐시 (stale-while-revalidate)"""
+
+    def __init__(self):
+        self.redis = aioredis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=0.5,
+            socket_timeout=0.5,
+        )
+        self._retry_at = 0.0
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._refresh_tasks: Set[asyncio.Task] = set()
+
+    async def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        캐시된 값을 반환하고, 없으면 loader로 조회 후 저장합니다.
+        ttl이 지난 값은 그대로 반환하면서 백그라운드에서 한 워커만 갱신합니다.
+        """
+        stale_ttl = stale_ttl or ttl * 6
+        entry = await self._get(key)
+        if entry is not None:
+            if time.time() - entry["ts"] >= ttl:
+                self._schedule_refresh(key, loader, ttl, stale_ttl)
+            return entry["data"]
+
+        # 같은 프로세스 내 동시 미스는 한 번만 조회
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = await self._get(key)
+            if entry is not None:
+                return entry["data"]
+            data = await loader()
+            await self._set(key, data, stale_ttl)
+            return data
+
+    async def get_bytes(self, key: str) -> Optional[bytes]:
+        """직렬화된 값 조회 (look-aside 캐시용)"""
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            return await self.redis.get(key)
+        except (RedisError, OSError) as e:
+            self._mark_unavailable(e)
+            return None
+
+    async def set_bytes(self, key: str, value: bytes, ttl: float):
+        """직렬화된 값 저장"""
+        if time.monotonic() < self._retry_at:
+            return
+        try:
+            await self.redis.set(key, value, ex=max(int(ttl), 1))
+        except (RedisError, OSError) as e:
+            self._mark_unavailable(e)
+
+    async def invalidate(self, *keys: str, bump: Optional[str] = None):
+        """키 삭제 및 (선택) 버전 카운터 증가로 관련 키 일괄 무효화"""
+        # 쓰기는 드물고 누락 시 오래된 값이 남으므로 장애 중에도 시도
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                if keys:
+                    pipe.delete(*keys)
+                if bump:
+                    pipe.incr(bump)
+                await pipe.execute()
+        except (RedisError, OSError) as e:
+            self._mark_unavailable(e)
+
+    def _schedule_refresh(self, key: str, loader, ttl: float, stale_ttl: float):
+        task = asyncio.create_task(self._refresh(key, loader, ttl, stale_ttl))
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def _refresh(self, key: str, loader, ttl: float, stale_ttl: float):
+        # 워커 간 갱신 중복 방지: 갱신 락을 잡은 워커만 조회
+        try:
+            acquired = await self.redis.set(f"{key}:refresh", b"1", nx=True, ex=max(int(ttl), 1))
+        except (RedisError, OSError) as e:
+            self._mark_unavailable(e)
+            return
+        if not acquired:
+            return
+        try:
+            data = await loader()
+            await self._set(key, data, stale_ttl)
+        except Exception as e:
+            log.warning("Background cache refresh failed", key=key, error=str(e))
+
+    async def _get(self, key: str) -> Optional[Dict[str, Any]]:
+        if time.monotonic() < self._retry_at:
+            return None
+        try:
+            raw = await self.redis.get(key)
+        except (RedisError, OSError) as e:
+            self._mark_unavailable(e)
+            return None
+        return orjson.loads(raw) if raw else None
+
+    async def _set(self, key: str, data: Any, stale_ttl: float):
+        if time.monotonic() < self._retry_at:
+            return
+        try:
+            payload = orjson.dumps({"ts": time.time(), "data": data})
+        except TypeError as e:
+            log.warning("Value is not cacheable", key=key, error=str(e))
+            return
+        try:
+            await self.redis.set(key, payload, ex=max(int(stale_ttl), 1))
+        except (RedisError, OSError) as e:
+            self._mark_unavailable(e)
+
+    def _mark_unavailable(self, error: Exception):
+        log.warning("Redis unavailable, bypassing cache", error=str(error))
+        self._retry_at = time.monotonic() + REDIS_RETRY_INTERVAL
+
+
+# 싱글턴 인스턴스 생성
+cache_service = CacheService()
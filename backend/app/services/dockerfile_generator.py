@@ -3,58 +3,375 @@ Dockerfile Generator Service
 스택 설정에 따라 Dockerfile을 자동 생성하고 Docker 이미지를 빌드하는 서비스
 """
 
+import atexit
+import contextlib
+import functools
+import hashlib
+import http.client
+import io
 import os
+import re
 import tempfile
+import textwrap
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import docker
 import asyncio
-from typing import Dict, List, Optional, Tuple, Any
+import requests
+import urllib3
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Tuple, Any, Union
 from datetime import datetime
+from operator import itemgetter
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# 스택 설정별 Dockerfile 본문 캐시 {(언어, 버전, 프레임워크, 패키지): 본문}
+# 환경 ID/생성 시각 헤더는 캐시에 넣지 않고 호출 시마다 붙임
+DOCKERFILE_CACHE_MAXSIZE = 256
+_dockerfile_body_cache: Dict[Tuple[str, str, str, Tuple[str, ...]], bytes] = {}
+
+# Docker API 호출 전용 스레드 풀 (기본 executor를 다른 작업과 공유하지 않도록 분리)
+_DOCKER_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.DOCKER_EXECUTOR_WORKERS,
+    thread_name_prefix="docker-io"
+)
+# 빌드는 소켓과 디스크를 오래 점유하므로 동시 실행 수 제한
+_BUILD_SEMAPHORE = asyncio.Semaphore(settings.DOCKER_MAX_PARALLEL_BUILDS)
+
+# Dockerfile 본문 템플릿
+# 레이어 캐시 재사용을 위해 자주 바뀌지 않는 단계부터 순서대로 작성
+# (베이스 → 시스템 패키지 → 개발 도구 → 언어 런타임 → 프레임워크 → 사용자 패키지 → 런타임 설정)
+# 환경 변수는 값이 자주 바뀌므로 마지막에 둠
+_DOCKERFILE_TEMPLATE = textwrap.dedent("""\
+
+    {builder_stage}FROM {base_image}{stage_name}
+
+    {system_layer}# 작업 디렉토리 설정
+    WORKDIR /workspace
+
+    {language_block}{packages_block}
+
+    # 포트 노출
+    EXPOSE 8080
+
+    # 헬스체크
+    HEALTHCHECK --interval=30s --timeout=3s --start-period=5s --retries=3 \\
+      CMD curl -f http://localhost:8080/ || exit 1
+
+    # 환경 변수 설정
+    ENV KUBDEV_ENVIRONMENT=true
+    ENV KUBDEV_LANGUAGE={language}
+    ENV KUBDEV_VERSION={version}
+    ENV KUBDEV_FRAMEWORK={framework}
+
+    # 시작 명령
+    CMD ["code-server", "--bind-addr", "0.0.0.0:8080", "--auth", "none", "/workspace"]""")
+
+# 시스템 도구 + VS Code Server 레이어 (미리 빌드한 code-server 베이스 이미지에도 같은 내용 사용)
+_SYSTEM_LAYER_TEMPLATE = textwrap.dedent("""\
+    # 시스템 도구 및 VS Code Server 설치 (하나의 레이어로 통합)
+    RUN apt-get update && apt-get install -y --no-install-recommends \\
+    {system_packages}
+        && curl -fsSL https://code-server.dev/install.sh | sh \\
+        && rm -rf /var/lib/apt/lists/*
+
+    """)
+
+# builder 스테이지에서 생성한 Node 프로젝트를 런타임 스테이지로 복사
+NODE_COPY_FROM_BUILDER = """
+# builder 스테이지에서 생성한 프로젝트 복사
+COPY --from=builder /workspace /workspace
+WORKDIR /workspace/demo-app"""
+
+# 언어별 공통 설정 (프레임워크 단계 앞에 붙음)
+_JAVA_CONFIG_HEADER = "# Java 설정 (maven/gradle은 기본 apt 레이어에서 설치)\n"
+_GO_CONFIG_HEADER = "\n".join([
+    "# Go 설정",
+    "RUN apk add --no-cache git",
+    "ENV GO111MODULE=on GOPROXY=https://proxy.golang.org,direct",
+    "",
+])
+
+# Python 프레임워크별 pip 패키지
+_PYTHON_FRAMEWORK_PACKAGES: Dict[str, Tuple[str, ...]] = {
+    "django": ("django", "djangorestframework"),
+    "flask": ("flask", "flask-restful", "flask-cors"),
+    "fastapi": ("fastapi", "uvicorn", "python-multipart"),
+    "jupyter": ("jupyter", "notebook", "jupyterlab", "pandas", "numpy", "matplotlib", "seaborn"),
+}
+
+# Node.js 프레임워크 스캐폴드
+_NODE_SCAFFOLD_BLOCKS: Dict[str, str] = {
+    "react": "\n".join([
+        "# React 개발 환경",
+        "RUN npm install -g create-react-app \\",
+        "    && npx create-react-app demo-app --template typescript \\",
+        "    && cd demo-app && npm install --no-audit --no-fund",
+        "WORKDIR /workspace/demo-app",
+    ]),
+    "vue": "\n".join([
+        "# Vue.js 개발 환경",
+        "RUN npm install -g @vue/cli && vue create demo-app --default",
+        "WORKDIR /workspace/demo-app",
+    ]),
+    "express": "\n".join([
+        "# Express.js 개발 환경",
+        "RUN npm install -g express-generator \\",
+        "    && express demo-app \\",
+        "    && cd demo-app && npm install --no-audit --no-fund",
+        "WORKDIR /workspace/demo-app",
+    ]),
+    "nestjs": "\n".join([
+        "# NestJS 개발 환경",
+        "RUN npm install -g @nestjs/cli && nest new demo-app --package-manager npm",
+        "WORKDIR /workspace/demo-app",
+    ]),
+    "next": "\n".join([
+        "# Next.js 개발 환경",
+        "RUN npx create-next-app@latest demo-app --typescript --tailwind --eslint \\",
+        "    && cd demo-app && npm install --no-audit --no-fund",
+        "WORKDIR /workspace/demo-app",
+    ]),
+}
+
+# Python 프레임워크별 프로젝트 생성 단계 (패키지는 pip 레이어에서 설치)
+_PYTHON_FRAMEWORK_BLOCKS: Dict[str, str] = {
+    "django": "\n".join([
+        "# Django 개발 환경",
+        "RUN django-admin startproject demo_app /workspace/demo_app \\",
+        '    && echo "ALLOWED_HOSTS = [\'*\']" >> /workspace/demo_app/demo_app/settings.py',
+        "WORKDIR /workspace/demo_app",
+    ]),
+    "flask": "\n".join([
+        "# Flask 개발 환경",
+        'RUN echo "from flask import Flask\\nfrom flask_cors import CORS\\n\\napp = Flask(__name__)\\nCORS(app)\\n\\n@app.route(\'/\')\\ndef hello():\\n    return {\'message\': \'Hello KubeDev!\', \'framework\': \'Flask\'}\\n\\nif __name__ == \'__main__\':\\n    app.run(debug=True, host=\'0.0.0.0\')" > /workspace/app.py',
+    ]),
+    "fastapi": "\n".join([
+        "# FastAPI 개발 환경",
+        'RUN echo "from fastapi import FastAPI\\nfrom fastapi.middleware.cors import CORSMiddleware\\n\\napp = FastAPI()\\n\\napp.add_middleware(\\n    CORSMiddleware,\\n    allow_origins=[\'*\'],\\n    allow_credentials=True,\\n    allow_methods=[\'*\'],\\n    allow_headers=[\'*\']\\n)\\n\\n@app.get(\'/\')\\ndef read_root():\\n    return {\'message\': \'Hello KubeDev!\', \'framework\': \'FastAPI\'}" > /workspace/main.py',
+    ]),
+    "jupyter": "\n".join([
+        "# Jupyter 개발 환경",
+        "RUN jupyter notebook --generate-config \\",
+        '    && echo "c.NotebookApp.ip = \'0.0.0.0\'\\nc.NotebookApp.port = 8080\\nc.NotebookApp.open_browser = False\\nc.NotebookApp.allow_root = True\\nc.NotebookApp.token = \'\'\\nc.NotebookApp.password = \'\'" >> ~/.jupyter/jupyter_notebook_config.py',
+        'CMD ["jupyter", "notebook", "--ip=0.0.0.0", "--port=8080", "--no-browser", "--allow-root"]',
+    ]),
+}
+
+# Java 프레임워크별 프로젝트 생성 단계
+_JAVA_FRAMEWORK_BLOCKS: Dict[str, str] = {
+    "spring": "\n".join([
+        "# Spring Boot 개발 환경",
+        "RUN curl https://start.spring.io/starter.zip \\",
+        "    -d dependencies=web,devtools,actuator \\",
+        "    -d name=demo-app \\",
+        "    -d packageName=com.kubdev.demo \\",
+        "    -o demo-app.zip \\",
+        "    && unzip demo-app.zip && rm demo-app.zip \\",
+        "    && cd demo-app && mvn clean compile",
+        "WORKDIR /workspace/demo-app",
+    ]),
+    "maven": "\n".join([
+        "# Maven 프로젝트 템플릿",
+        "RUN mvn archetype:generate \\",
+        "    -DgroupId=com.kubdev.demo \\",
+        "    -DartifactId=demo-app \\",
+        "    -DarchetypeArtifactId=maven-archetype-quickstart \\",
+        "    -DinteractiveMode=false \\",
+        "    && cd demo-app && mvn clean compile",
+        "WORKDIR /workspace/demo-app",
+    ]),
+}
+
+# Go 프레임워크별 프로젝트 생성 단계
+_GO_FRAMEWORK_BLOCKS: Dict[str, str] = {
+    "gin": "\n".join([
+        "# Gin 개발 환경",
+        "RUN go mod init demo-app \\",
+        "    && go get github.com/gin-gonic/gin \\",
+        '    && echo "package main\\n\\nimport (\\n    \\"net/http\\"\\n    \\"github.com/gin-gonic/gin\\"\\n)\\n\\nfunc main() {\\n    r := gin.Default()\\n\\n    r.GET(\\"/\\", func(c *gin.Context) {\\n        c.JSON(http.StatusOK, gin.H{\\n            \\"message\\": \\"Hello KubeDev!\\",\\n            \\"framework\\": \\"Gin\\",\\n        })\\n    })\\n\\n    r.Run(\\\":8080\\")\\n}" > main.go \\',
+        "    && go mod tidy",
+    ]),
+    "echo": "\n".join([
+        "# Echo 개발 환경",
+        "RUN go mod init demo-app \\",
+        "    && go get github.com/labstack/echo/v4 \\",
+        '    && echo "package main\\n\\nimport (\\n    \\"net/http\\"\\n    \\"github.com/labstack/echo/v4\\"\\n    \\"github.com/labstack/echo/v4/middleware\\"\\n)\\n\\nfunc main() {\\n    e := echo.New()\\n\\n    e.Use(middleware.Logger())\\n    e.Use(middleware.Recover())\\n\\n    e.GET(\\"/\\", func(c echo.Context) error {\\n        return c.JSON(http.StatusOK, map[string]string{\\n            \\"message\\": \\"Hello KubeDev!\\",\\n            \\"framework\\": \\"Echo\\",\\n        })\\n    })\\n\\n    e.Logger.Fatal(e.Start(\\\":8080\\"))\\n}" > main.go \\',
+        "    && go mod tidy",
+    ]),
+}
+
+
+def _with_framework_block(config: str, block: Optional[str]) -> str:
+    """언어 공통 설정 뒤에 프레임워크 단계를 빈 줄로 구분해 붙임"""
+    return f"{config}\n{block}" if block else config
+
+# 언어/버전별 베이스 이미지 (읽기 전용, 인스턴스마다 만들지 않음)
+_BASE_IMAGES: Mapping[str, Mapping[str, str]] = MappingProxyType({
+    "node": {
+        "16": "node:16-alpine",
+        "18": "node:18-alpine",
+        "20": "node:20-alpine",
+        "21": "node:21-alpine"
+    },
+    "python": {
+        "3.9": "python:3.9-slim",
+        "3.10": "python:3.10-slim",
+        "3.11": "python:3.11-slim",
+        "3.12": "python:3.12-slim"
+    },
+    "java": {
+        "11": "openjdk:11-jre-slim",
+        "17": "openjdk:17-jre-slim",
+        "21": "openjdk:21-jre-slim"
+    },
+    "go": {
+        "1.19": "golang:1.19-alpine",
+        "1.20": "golang:1.20-alpine",
+        "1.21": "golang:1.21-alpine",
+        "1.22": "golang:1.22-alpine"
+    }
+})
+
+def code_server_base_image(language: str, version: str) -> str:
+    """code-server가 미리 설치된 베이스 이미지 이름 (예: kubdev/python311-codeserver:latest)"""
+    return f"{settings.DOCKER_NAMESPACE}/{language}{version.replace('.', '')}-codeserver:latest"
+
+# 지원 스택 목록 중 고정된 부분 (호출마다 다시 만들지 않음, 응답 직렬화를 위해 일반 dict/tuple 사용)
+_SUPPORTED_STACKS_STATIC: Dict[str, Any] = {
+    "languages": tuple(_BASE_IMAGES),
+    "frameworks": {
+        "node": ("react", "vue", "express", "nestjs", "next"),
+        "python": ("django", "flask", "fastapi", "jupyter"),
+        "java": ("spring", "maven", "gradle"),
+        "go": ("gin", "echo", "fiber")
+    },
+    "versions": {language: dict(versions) for language, versions in _BASE_IMAGES.items()},
+}
+
+# Docker 사용 가능 여부별 전체 지원 스택 응답 (레지스트리 설정은 프로세스 시작 후 바뀌지 않음)
+_supported_stacks_cache: Dict[bool, Dict[str, Any]] = {}
+
+# 기본 apt 레이어에 설치할 시스템 패키지 (언어별 추가 패키지도 같은 레이어에 설치)
+SYSTEM_PACKAGES = ["curl", "wget", "git", "vim", "nano", "ca-certificates"]
+LANGUAGE_SYSTEM_PACKAGES = {
+    "java": ["maven", "gradle"],
+}
+
+# KubeDev 이미지 참조 필터 (데몬 측 glob 매칭, '*'는 '/'를 넘지 않으므로 경로 위치별로 지정)
+KUBDEV_IMAGE_KEYWORD = "kubdev"
+KUBDEV_IMAGE_FILTERS = {"reference": ["*kubdev*", "*kubdev*/*", "*/*kubdev*"]}
+
+
+# Dockerfile 검증용 정규식 (FROM/WORKDIR 명령과 위험한 명령을 한 번에 탐색)
+_VALIDATE_DOCKERFILE_RE = re.compile(
+    r"^\s*(?P<from>FROM)\s"
+    r"|^\s*(?P<workdir>WORKDIR)\s"
+    r"|(?P<rm_root>rm\s+-rf\s+/(?!\S))"
+    r"|(?P<chmod_777>chmod\s+777)"
+    r"|(?P<sudo>\bsudo\b)"
+    r"|(?P<privileged>--privileged)",
+    re.MULTILINE
+)
+
+# Dockerfile 내용 해시 라벨 (같은 Dockerfile로 빌드된 이미지를 찾아 재사용)
+DOCKERFILE_SHA_LABEL = "kubdev.dockerfile-sha"
+
+
+def _dockerfile_digest(dockerfile_content: Union[str, bytes]) -> str:
+    """주석/빈 줄을 제외한 Dockerfile 내용의 SHA-256 (환경 ID/생성 시각 헤더는 해시에 영향 없음)"""
+    if isinstance(dockerfile_content, str):
+        dockerfile_content = dockerfile_content.encode("utf-8")
+    normalized = b"\n".join(
+        line.rstrip() for line in dockerfile_content.splitlines()
+        if line.strip() and not line.lstrip().startswith(b"#")
+    )
+    return hashlib.sha256(normalized).hexdigest()
+
+# 빌드 실패 시 BuildError에 포함할 최근 로그 수
+BUILD_LOG_TAIL_SIZE = 50
+
+# 공유 Docker 클라이언트 (인스턴스마다 연결/ping 하지 않도록 재사용)
+_docker_client: Optional[docker.DockerClient] = None
+
+
+def _get_docker_client() -> Optional[docker.DockerClient]:
+    """공유 Docker 클라이언트 반환 (연결 실패 시 None, 다음 호출에서 재연결 시도)"""
+    global _docker_client
+    if _docker_client is None:
+        try:
+            client = docker.from_env(timeout=30)
+            # Docker 연결 테스트
+            client.ping()
+            _docker_client = client
+            logger.info("Docker client connected successfully")
+        except Exception as e:
+            logger.warning(f"Docker not available: {str(e)}. Image building will be disabled.")
+    return _docker_client
+
+
+# Docker 시스템 정보 캐시 (만료 시각, 정보) - 데몬 재시작 전에는 거의 바뀌지 않음
+DOCKER_INFO_CACHE_TTL = 10.0
+_docker_info_cache: Optional[Tuple[float, Dict[str, Any]]] = None
+_docker_info_refresh_task: Optional[asyncio.Task] = None
+
+
+def _reset_docker_client():
+    """끊어진 연결을 가진 공유 클라이언트를 닫고 다음 호출에서 다시 생성"""
+    global _docker_client, _docker_info_cache
+    _docker_info_cache = None
+    if _docker_client is not None:
+        try:
+            _docker_client.close()
+        except Exception:
+            pass
+    _docker_client = None
+
+
+# Docker 데몬 재시작 등으로 keep-alive 소켓이 끊어졌을 때 발생하는 예외
+STALE_CONNECTION_ERRORS = (
+    requests.exceptions.ConnectionError,
+    urllib3.exceptions.ProtocolError,
+    http.client.RemoteDisconnected,
+)
+
+
+@atexit.register
+def _close_docker_client():
+    """인터프리터 종료 시 Docker 클라이언트 연결 풀 정리"""
+    if _docker_client is not None:
+        _docker_client.close()
+
 
 class DockerfileGenerator:
     """Dockerfile 자동 생성 및 Docker 이미지 빌드 서비스"""
 
     def __init__(self):
-        """Docker 클라이언트 초기화"""
+        """Docker 클라이언트 초기화 (모듈 전역 클라이언트 공유)"""
+        self.docker_client = _get_docker_client()
+        self.docker_available = self.docker_client is not None
+
+    async def _run_docker(self, fn, *args, **kwargs):
+        """Docker 전용 스레드 풀에서 fn 실행 (끊어진 연결은 한 번 재시도)"""
+        return await asyncio.get_running_loop().run_in_executor(
+            _DOCKER_EXECUTOR, functools.partial(self._retry_once_on_stale, fn, *args, **kwargs)
+        )
+
+    def _retry_once_on_stale(self, fn, *args, **kwargs):
+        """끊어진 연결로 실패하면 클라이언트를 다시 만들고 한 번만 재시도 (executor 스레드에서 실행)"""
         try:
-            self.docker_client = docker.from_env()
-            # Docker 연결 테스트
-            self.docker_client.ping()
-            self.docker_available = True
-            logger.info("Docker client connected successfully")
-        except Exception as e:
-            logger.warning(f"Docker not available: {str(e)}. Image building will be disabled.")
-            self.docker_available = False
-
-        self.base_images = {
-            "node": {
-                "16": "node:16-alpine",
-                "18": "node:18-alpine",
-                "20": "node:20-alpine",
-                "21": "node:21-alpine"
-            },
-            "python": {
-                "3.9": "python:3.9-slim",
-                "3.10": "python:3.10-slim",
-                "3.11": "python:3.11-slim",
-                "3.12": "python:3.12-slim"
-            },
-            "java": {
-                "11": "openjdk:11-jre-slim",
-                "17": "openjdk:17-jre-slim",
-                "21": "openjdk:21-jre-slim"
-            },
-            "go": {
-                "1.19": "golang:1.19-alpine",
-                "1.20": "golang:1.20-alpine",
-                "1.21": "golang:1.21-alpine",
-                "1.22": "golang:1.22-alpine"
-            }
-        }
+            return fn(*args, **kwargs)
+        except STALE_CONNECTION_ERRORS as e:
+            logger.warning(f"Stale Docker connection, reconnecting: {str(e)}")
+            _reset_docker_client()
+            self.docker_client = _get_docker_client()
+            if self.docker_client is None:
+                raise
+            return fn(*args, **kwargs)
 
     def _check_docker_availability(self):
         """Docker 연결 상태 확인"""
@@ -62,280 +379,252 @@ class DockerfileGenerator:
             raise Exception("Docker is not available. Please check if Docker Desktop is running.")
 
     def generate_dockerfile(self, stack_config: Dict, environment_id: str) -> str:
-        """스택 설정에 따라 Dockerfile 생성"""
+        """스택 설정에 따라 Dockerfile 생성 (API 응답용 문자열)"""
+        return self.generate_dockerfile_bytes(stack_config, environment_id).decode("utf-8")
+
+    def generate_dockerfile_bytes(self, stack_config: Dict, environment_id: str) -> bytes:
+        """스택 설정에 따라 Dockerfile 생성 (빌드에 그대로 넘기는 UTF-8 바이트)"""
 
         language = stack_config.get("language", "node")
         version = stack_config.get("version", "18")
         framework = stack_config.get("framework", "")
-        packages = stack_config.get("packages", [])
-
-        logger.info(f"Generating Dockerfile for {language} {version} with framework {framework}")
+        # 패키지 순서/중복이 달라도 같은 캐시 키와 레이어가 되도록 정렬 및 중복 제거
+        packages = tuple(sorted(set(stack_config.get("packages", []))))
+
+        header = (
+            f"# Auto-generated Dockerfile for KubeDev Environment {environment_id}\n"
+            f"# Language: {language} {version}, Framework: {framework}\n"
+            f"# Generated at: {datetime.utcnow().isoformat()}Z"
+        )
+
+        cache_key = (language, version, framework, packages)
+        body = _dockerfile_body_cache.get(cache_key)
+        if body is None:
+            logger.info(f"Generating Dockerfile for {language} {version} with framework {framework}")
+            # 본문은 캐시에 넣을 때 한 번만 인코딩 (요청마다 바뀌는 헤더만 새로 인코딩)
+            body = self._generate_dockerfile_body(language, version, framework, packages).encode("utf-8")
+            if len(_dockerfile_body_cache) >= DOCKERFILE_CACHE_MAXSIZE:
+                _dockerfile_body_cache.clear()
+            _dockerfile_body_cache[cache_key] = body
+
+        return b"".join((header.encode("utf-8"), b"\n", body))
+
+    def _generate_dockerfile_body(self, language: str, version: str, framework: str,
+                                  packages: Tuple[str, ...]) -> str:
+        """헤더를 제외한 Dockerfile 본문 생성 (같은 스택 설정이면 항상 같은 결과)"""
 
         # 베이스 이미지 선택
-        base_image = self.base_images.get(language, {}).get(version, f"{language}:latest")
-
-        # Dockerfile 생성
-        dockerfile_lines = [
-            f"# Auto-generated Dockerfile for KubeDev Environment {environment_id}",
-            f"# Language: {language} {version}, Framework: {framework}",
-            f"# Generated at: {datetime.utcnow().isoformat()}Z",
-            "",
-            f"FROM {base_image}",
-            "",
-            "# 시스템 업데이트 및 기본 도구 설치",
-            "RUN apt-get update && apt-get install -y \\",
-            "    curl \\",
-            "    wget \\",
-            "    git \\",
-            "    vim \\",
-            "    nano \\",
-            "    && rm -rf /var/lib/apt/lists/*",
-            "",
-            "# 작업 디렉토리 설정",
-            "WORKDIR /workspace",
-            "",
-        ]
-
-        # 언어별 설정
-        if language == "node":
-            dockerfile_lines.extend(self._generate_node_config(framework, packages))
-        elif language == "python":
-            dockerfile_lines.extend(self._generate_python_config(framework, packages))
-        elif language == "java":
-            dockerfile_lines.extend(self._generate_java_config(framework, packages))
-        elif language == "go":
-            dockerfile_lines.extend(self._generate_go_config(framework, packages))
-
-        # 공통 설정 추가
-        dockerfile_lines.extend([
-            "",
-            "# VS Code Server 설치 (개발환경용)",
-            "RUN curl -fsSL https://code-server.dev/install.sh | sh",
-            "",
-            "# 환경 변수 설정",
-            "ENV KUBDEV_ENVIRONMENT=true",
-            f"ENV KUBDEV_LANGUAGE={language}",
-            f"ENV KUBDEV_VERSION={version}",
-            f"ENV KUBDEV_FRAMEWORK={framework}",
-            "",
-            "# 포트 노출",
-            "EXPOSE 8080",
-            "",
-            "# 헬스체크",
-            "HEALTHCHECK --interval=30s --timeout=3s --start-period=5s --retries=3 \\",
-            "  CMD curl -f http://localhost:8080/ || exit 1",
-            "",
-            "# 시작 명령",
-            'CMD ["code-server", "--bind-addr", "0.0.0.0:8080", "--auth", "none", "/workspace"]'
-        ])
-
-        dockerfile_content = "\n".join(dockerfile_lines)
-        logger.info(f"Generated Dockerfile with {len(dockerfile_lines)} lines")
+        upstream_image = _BASE_IMAGES.get(language, {}).get(version)
+        if settings.DOCKER_CODE_SERVER_BASE_IMAGES and upstream_image:
+            # 시스템 도구/code-server가 이미 설치된 공용 베이스 이미지 사용 (환경마다 설치하지 않음)
+            base_image = code_server_base_image(language, version)
+            system_layer = ""
+        else:
+            base_image = upstream_image or f"{language}:latest"
+            system_layer = self._generate_system_layer(language)
+
+        # Node 스캐폴드는 전역 CLI(create-react-app 등)가 필요하지만 결과물은 /workspace에만 남으므로
+        # builder 스테이지에서 생성하고 런타임 이미지에는 결과만 복사
+        # (다른 언어는 의존성이 site-packages/~/.m2/GOPATH에 설치되고 개발 환경에서 계속 쓰이므로 단일 스테이지 유지)
+        scaffold = self._generate_node_scaffold(framework) if language == "node" else ""
+        # builder 스테이지에는 code-server가 필요 없으므로 항상 원본 언어 이미지 사용
+        builder_image = upstream_image or f"{language}:latest"
+        builder_stage = f"FROM {builder_image} AS builder\nWORKDIR /workspace\n{scaffold}\n\n" if scaffold else ""
+
+        # 언어별 설정 (런타임 도구 → 프레임워크 스캐폴드)
+        generator = self._LANG_GENERATORS.get(language)
+        language_block = generator(self, framework, packages) if generator else ""
+        if scaffold:
+            language_block += NODE_COPY_FROM_BUILDER
+
+        dockerfile_content = _DOCKERFILE_TEMPLATE.format(
+            builder_stage=builder_stage,
+            base_image=base_image,
+            stage_name=" AS runtime" if scaffold else "",
+            system_layer=system_layer,
+            language_block=language_block,
+            # 사용자 패키지는 가장 자주 바뀌므로 프레임워크 레이어 뒤에 설치
+            packages_block=self._generate_packages_config(language, packages),
+            language=language,
+            version=version,
+            framework=framework
+        )
+        line_count = dockerfile_content.count("\n") + 1
+        logger.info(f"Generated Dockerfile with {line_count} lines")
         return dockerfile_content
 
-    def _generate_node_config(self, framework: str, packages: List[str]) -> List[str]:
+    def _generate_system_layer(self, language: str) -> str:
+        """시스템 패키지 + code-server 설치 레이어 생성"""
+        system_packages = SYSTEM_PACKAGES + LANGUAGE_SYSTEM_PACKAGES.get(language, [])
+
+        return _SYSTEM_LAYER_TEMPLATE.format(
+            system_packages="\n".join(f"    {package} \\" for package in system_packages)
+        )
+
+    def generate_code_server_base_dockerfile(self, language: str, version: str) -> str:
+        """code-server 베이스 이미지(code_server_base_image)용 Dockerfile 생성 (언어/버전별로 한 번만 빌드)"""
+        upstream_image = _BASE_IMAGES.get(language, {}).get(version)
+        if upstream_image is None:
+            raise ValueError(f"Unsupported stack: {language} {version}")
+        return f"FROM {upstream_image}\n\n{self._generate_system_layer(language)}".rstrip()
+
+    def _generate_node_config(self, framework: str, packages: Tuple[str, ...] = ()) -> str:
         """Node.js 설정 생성"""
-        lines = [
-            "# Node.js 설정",
-            "RUN npm install -g npm@latest",
-            "",
-        ]
-
-        if framework == "react":
-            lines.extend([
-                "# React 개발 환경",
-                "RUN npm install -g create-react-app",
-                "RUN npx create-react-app demo-app --template typescript",
-                "WORKDIR /workspace/demo-app",
-                "RUN npm install",
-            ])
-        elif framework == "vue":
-            lines.extend([
-                "# Vue.js 개발 환경",
-                "RUN npm install -g @vue/cli",
-                "RUN vue create demo-app --default",
-                "WORKDIR /workspace/demo-app",
-            ])
-        elif framework == "express":
-            lines.extend([
-                "# Express.js 개발 환경",
-                "RUN npm install -g express-generator",
-                "RUN express demo-app",
-                "WORKDIR /workspace/demo-app",
-                "RUN npm install",
-            ])
-        elif framework == "nestjs":
-            lines.extend([
-                "# NestJS 개발 환경",
-                "RUN npm install -g @nestjs/cli",
-                "RUN nest new demo-app --package-manager npm",
-                "WORKDIR /workspace/demo-app",
-            ])
-        elif framework == "next":
-            lines.extend([
-                "# Next.js 개발 환경",
-                "RUN npx create-next-app@latest demo-app --typescript --tailwind --eslint",
-                "WORKDIR /workspace/demo-app",
-                "RUN npm install",
-            ])
-
-        # 추가 패키지 설치
-        if packages:
-            packages_str = " ".join(packages)
-            lines.append(f"RUN npm install {packages_str}")
-
-        return lines
-
-    def _generate_python_config(self, framework: str, packages: List[str]) -> List[str]:
-        """Python 설정 생성"""
-        lines = [
-            "# Python 설정",
-            "RUN pip install --upgrade pip",
-            "",
-        ]
-
-        if framework == "django":
-            lines.extend([
-                "# Django 개발 환경",
-                "RUN pip install django djangorestframework",
-                "RUN django-admin startproject demo_app /workspace/demo_app",
-                "WORKDIR /workspace/demo_app",
-                'RUN echo "ALLOWED_HOSTS = [\'*\']" >> demo_app/settings.py',
-            ])
-        elif framework == "flask":
-            lines.extend([
-                "# Flask 개발 환경",
-                "RUN pip install flask flask-restful flask-cors",
-                'RUN echo "from flask import Flask\\nfrom flask_cors import CORS\\n\\napp = Flask(__name__)\\nCORS(app)\\n\\n@app.route(\'/\')\\ndef hello():\\n    return {\'message\': \'Hello KubeDev!\', \'framework\': \'Flask\'}\\n\\nif __name__ == \'__main__\':\\n    app.run(debug=True, host=\'0.0.0.0\')" > /workspace/app.py',
-            ])
-        elif framework == "fastapi":
-            lines.extend([
-                "# FastAPI 개발 환경",
-                "RUN pip install fastapi uvicorn python-multipart",
-                'RUN echo "from fastapi import FastAPI\\nfrom fastapi.middleware.cors import CORSMiddleware\\n\\napp = FastAPI()\\n\\napp.add_middleware(\\n    CORSMiddleware,\\n    allow_origins=[\'*\'],\\n    allow_credentials=True,\\n    allow_methods=[\'*\'],\\n    allow_headers=[\'*\']\\n)\\n\\n@app.get(\'/\')\\ndef read_root():\\n    return {\'message\': \'Hello KubeDev!\', \'framework\': \'FastAPI\'}" > /workspace/main.py',
-            ])
-        elif framework == "jupyter":
-            lines.extend([
-                "# Jupyter 개발 환경",
-                "RUN pip install jupyter notebook jupyterlab pandas numpy matplotlib seaborn",
-                "RUN jupyter notebook --generate-config",
-                'RUN echo "c.NotebookApp.ip = \'0.0.0.0\'\\nc.NotebookApp.port = 8080\\nc.NotebookApp.open_browser = False\\nc.NotebookApp.allow_root = True\\nc.NotebookApp.token = \'\'\\nc.NotebookApp.password = \'\'" >> ~/.jupyter/jupyter_notebook_config.py',
-                'CMD ["jupyter", "notebook", "--ip=0.0.0.0", "--port=8080", "--no-browser", "--allow-root"]',
-            ])
-
-        # 추가 패키지 설치
-        if packages:
-            packages_str = " ".join(packages)
-            lines.append(f"RUN pip install {packages_str}")
-
-        return lines
-
-    def _generate_java_config(self, framework: str, packages: List[str]) -> List[str]:
+        return (
+            "# Node.js 설정\n"
+            "ENV NPM_CONFIG_UPDATE_NOTIFIER=false NPM_CONFIG_FUND=false\n"
+            "RUN npm install -g --no-audit --no-fund npm@latest\n"
+        )
+
+    def _generate_node_scaffold(self, framework: str) -> str:
+        """Node.js 프레임워크 프로젝트 생성 (builder 스테이지용, 결과물은 /workspace/demo-app)"""
+        block = _NODE_SCAFFOLD_BLOCKS.get(framework)
+        return block or ""
+
+    def _generate_python_config(self, framework: str, packages: Tuple[str, ...] = ()) -> str:
+        """Python 설정 생성 (pip 업그레이드/프레임워크/사용자 패키지를 하나의 레이어로 설치)"""
+        # --no-cache-dir: ~/.cache/pip이 이미지 레이어에 남지 않도록 함
+        pip_install = "RUN pip install --no-cache-dir"
+
+        pip_packages = " ".join(["pip", *_PYTHON_FRAMEWORK_PACKAGES.get(framework, ()), *packages])
+        return _with_framework_block(
+            f"# Python 설정\n{pip_install} --upgrade {pip_packages}\n",
+            _PYTHON_FRAMEWORK_BLOCKS.get(framework)
+        )
+
+    def _generate_packages_config(self, language: str, packages: Tuple[str, ...]) -> str:
+        """사용자 추가 패키지 설치 (Python은 _generate_python_config의 pip 레이어에서 함께 설치)"""
+        if not packages or language != "node":
+            return ""
+
+        packages_str = " ".join(packages)
+        return f"\n\n# 추가 패키지 설치\nRUN npm install --no-audit --no-fund --prefer-offline {packages_str}"
+
+    def _generate_java_config(self, framework: str, packages: Tuple[str, ...] = ()) -> str:
         """Java 설정 생성"""
-        lines = [
-            "# Java 설정",
-            "RUN apt-get update && apt-get install -y curl maven gradle && rm -rf /var/lib/apt/lists/*",
-            "",
-        ]
-
-        if framework == "spring":
-            lines.extend([
-                "# Spring Boot 개발 환경",
-                "RUN curl https://start.spring.io/starter.zip \\",
-                "    -d dependencies=web,devtools,actuator \\",
-                "    -d name=demo-app \\",
-                "    -d packageName=com.kubdev.demo \\",
-                "    -o demo-app.zip",
-                "RUN unzip demo-app.zip && rm demo-app.zip",
-                "WORKDIR /workspace/demo-app",
-                "RUN mvn clean compile",
-            ])
-        elif framework == "maven":
-            lines.extend([
-                "# Maven 프로젝트 템플릿",
-                "RUN mvn archetype:generate \\",
-                "    -DgroupId=com.kubdev.demo \\",
-                "    -DartifactId=demo-app \\",
-                "    -DarchetypeArtifactId=maven-archetype-quickstart \\",
-                "    -DinteractiveMode=false",
-                "WORKDIR /workspace/demo-app",
-                "RUN mvn clean compile",
-            ])
-
-        return lines
-
-    def _generate_go_config(self, framework: str, packages: List[str]) -> List[str]:
+        return _with_framework_block(_JAVA_CONFIG_HEADER, _JAVA_FRAMEWORK_BLOCKS.get(framework))
+
+    def _generate_go_config(self, framework: str, packages: Tuple[str, ...] = ()) -> str:
         """Go 설정 생성"""
-        lines = [
-            "# Go 설정",
-            "RUN apk add --no-cache git",
-            "ENV GO111MODULE=on",
-            "ENV GOPROXY=https://proxy.golang.org,direct",
-            "",
-        ]
-
-        if framework == "gin":
-            lines.extend([
-                "# Gin 개발 환경",
-                "RUN go mod init demo-app",
-                "RUN go get github.com/gin-gonic/gin",
-                'RUN echo "package main\\n\\nimport (\\n    \\"net/http\\"\\n    \\"github.com/gin-gonic/gin\\"\\n)\\n\\nfunc main() {\\n    r := gin.Default()\\n\\n    r.GET(\\"/\\", func(c *gin.Context) {\\n        c.JSON(http.StatusOK, gin.H{\\n            \\"message\\": \\"Hello KubeDev!\\",\\n            \\"framework\\": \\"Gin\\",\\n        })\\n    })\\n\\n    r.Run(\\\":8080\\")\\n}" > main.go',
-                "RUN go mod tidy",
-            ])
-        elif framework == "echo":
-            lines.extend([
-                "# Echo 개발 환경",
-                "RUN go mod init demo-app",
-                "RUN go get github.com/labstack/echo/v4",
-                'RUN echo "package main\\n\\nimport (\\n    \\"net/http\\"\\n    \\"github.com/labstack/echo/v4\\"\\n    \\"github.com/labstack/echo/v4/middleware\\"\\n)\\n\\nfunc main() {\\n    e := echo.New()\\n\\n    e.Use(middleware.Logger())\\n    e.Use(middleware.Recover())\\n\\n    e.GET(\\"/\\", func(c echo.Context) error {\\n        return c.JSON(http.StatusOK, map[string]string{\\n            \\"message\\": \\"Hello KubeDev!\\",\\n            \\"framework\\": \\"Echo\\",\\n        })\\n    })\\n\\n    e.Logger.Fatal(e.Start(\\\":8080\\"))\\n}" > main.go',
-                "RUN go mod tidy",
-            ])
-
-        return lines
-
-    async def build_and_push_image(self, dockerfile_content: str, image_tag: str,
+        return _with_framework_block(_GO_CONFIG_HEADER, _GO_FRAMEWORK_BLOCKS.get(framework))
+
+    # 언어별 설정 생성 함수 (if/elif 비교 대신 한 번의 dict 조회, 호출 시 self를 직접 전달)
+    # 모두 (framework, packages)를 받지만 packages는 pip 레이어에서 함께 설치하는 Python만 사용
+    _LANG_GENERATORS = {
+        "node": _generate_node_config,
+        "python": _generate_python_config,
+        "java": _generate_java_config,
+        "go": _generate_go_config,
+    }
+
+    async def build_and_push_image(self, dockerfile_content: Union[str, bytes], image_tag: str,
                                    build_context: Optional[str] = None) -> Tuple[bool, str]:
-        """Docker 이미지 빌드 및 푸시"""
+        """Docker 이미지 빌드 및 푸시 (generate_dockerfile_bytes 결과를 그대로 받음)"""
         self._check_docker_availability()
 
+        if isinstance(dockerfile_content, str):
+            dockerfile_content = dockerfile_content.encode("utf-8")
+
+        digest = _dockerfile_digest(dockerfile_content)
+
+        # 캐시 소스 pull은 네트워크 대기이므로 빌드 슬롯(세마포어)을 잡기 전에 수행
+        await self._pull_cache_sources(self._get_cache_sources(image_tag))
+
+        async with _BUILD_SEMAPHORE:
+            # 별도 빌드 컨텍스트가 없으면 결과 이미지는 Dockerfile 내용으로만 결정되므로 기존 이미지 재사용
+            # (세마포어 안에서 확인해 먼저 시작된 같은 빌드의 결과도 재사용)
+            if build_context is None and await self._tag_existing_image(digest, image_tag):
+                return True, "reused existing image"
+
+            return await self._build_image(dockerfile_content, image_tag, build_context, digest)
+
+    async def _tag_existing_image(self, digest: str, image_tag: str) -> bool:
+        """같은 Dockerfile 해시 라벨을 가진 이미지가 있으면 새 태그를 붙임"""
         try:
-            # 임시 디렉토리에 Dockerfile 생성
-            with tempfile.TemporaryDirectory() as temp_dir:
-                dockerfile_path = os.path.join(temp_dir, "Dockerfile")
+            def tag_existing():
+                existing = self.docker_client.images.list(filters={"label": f"{DOCKERFILE_SHA_LABEL}={digest}"})
+                if not existing:
+                    return None
+                repository, tag = docker.utils.parse_repository_tag(image_tag)
+                existing[0].tag(repository, tag)
+                return existing[0].id
+
+            image_id = await self._run_docker(tag_existing)
+        except Exception as e:
+            # 조회/태그 실패 시 일반 빌드로 진행
+            logger.warning(f"Failed to look up existing image for {image_tag}: {str(e)}")
+            return False
+
+        if image_id is None:
+            return False
 
-                with open(dockerfile_path, "w", encoding="utf-8") as f:
-                    f.write(dockerfile_content)
+        logger.info(f"Reused existing image {image_id} for {image_tag} (dockerfile sha {digest[:12]})")
+        return True
 
-                # 빌드 컨텍스트 설정
-                build_path = build_context if build_context else temp_dir
+    async def _build_image(self, dockerfile_content: bytes, image_tag: str,
+                           build_context: Optional[str] = None,
+                           digest: Optional[str] = None) -> Tuple[bool, str]:
+        """Dockerfile 바이트로 이미지 빌드 (별도 빌드 컨텍스트가 있으면 임시 디렉토리에 기록)"""
+        try:
+            with tempfile.TemporaryDirectory() if build_context else contextlib.nullcontext() as temp_dir:
+                if temp_dir:
+                    dockerfile_path = os.path.join(temp_dir, "Dockerfile")
+
+                    # 텍스트 래퍼/재인코딩 없이 한 번에 기록
+                    fd = os.open(dockerfile_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+                    try:
+                        os.write(fd, dockerfile_content)
+                    finally:
+                        os.close(fd)
+                    build_source = {"path": build_context}
+                else:
+                    # 컨텍스트가 Dockerfile뿐이면 파일을 쓰지 않고 메모리 버퍼를 그대로 전달
+                    # (docker-py가 Dockerfile 하나만 담은 tar 컨텍스트로 감싸서 전송)
+                    build_source = {"fileobj": io.BytesIO(dockerfile_content)}
 
                 logger.info(f"Building Docker image: {image_tag}")
 
+                # 이전에 빌드된 이미지를 레이어 캐시 소스로 사용 (클래식 빌더는 로컬에 받아둔 이미지만 참조)
+                cache_from = self._get_cache_sources(image_tag)
+
                 # 이미지 빌드 (동기 방식)
                 def build_image():
                     try:
-                        image, build_logs = self.docker_client.images.build(
-                            path=build_path,
+                        # 전체 로그를 쌓지 않고 실패 원인 확인용 마지막 일부만 보관
+                        build_logs = deque(maxlen=BUILD_LOG_TAIL_SIZE)
+                        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+                        image_id = None
+                        for log in self.docker_client.api.build(
+                            **build_source,
                             tag=image_tag,
                             rm=True,
-                            forcerm=True
-                        )
-
-                        # 빌드 로그 출력
-                        for log in build_logs:
+                            forcerm=True,
+                            pull=False,
+                            cache_from=cache_from,
+                            # 다음 빌드에서 같은 Dockerfile의 이미지를 찾을 수 있도록 내용 해시를 라벨로 기록
+                            labels={DOCKERFILE_SHA_LABEL: digest or _dockerfile_digest(dockerfile_content)},
+                            decode=True
+                        ):
+                            build_logs.append(log)
+                            # 빌드 로그 출력 (DEBUG가 꺼져 있으면 문자열 처리 생략)
                             if 'stream' in log:
-                                logger.debug(f"Build: {log['stream'].strip()}")
-
-                        return image, "Build successful"
+                                if debug_enabled:
+                                    logger.debug("Build: %s", log['stream'].rstrip())
+                            elif 'aux' in log:
+                                # 최종 이미지 ID (별도 images.get 조회 불필요)
+                                image_id = log['aux'].get('ID', image_id)
+                            elif 'error' in log:
+                                raise docker.errors.BuildError(log['error'], list(build_logs))
+
+                        return image_id or image_tag, "Build successful"
                     except Exception as e:
                         logger.error(f"Build failed: {str(e)}")
                         raise
 
                 # 비동기로 실행
-                loop = asyncio.get_event_loop()
-                image, message = await loop.run_in_executor(None, build_image)
+                image, message = await self._run_docker(build_image)
 
-                logger.info(f"Successfully built image: {image_tag}")
+                logger.info(f"Successfully built image: {image_tag} ({image})")
 
                 # 옵션: 이미지를 레지스트리에 푸시 (현재는 로컬에만 저장)
                 # if settings.DOCKER_REGISTRY:
@@ -348,14 +637,44 @@ class DockerfileGenerator:
             logger.error(error_msg)
             return False, error_msg
 
+    def _get_cache_sources(self, image_tag: str) -> List[str]:
+        """캐시 소스 이미지 목록 (같은 태그와 저장소의 latest 태그)"""
+        repository = image_tag.rsplit(":", 1)[0] if ":" in image_tag.rsplit("/", 1)[-1] else image_tag
+        return list(dict.fromkeys([image_tag, f"{repository}:latest"]))
+
+    async def _pull_cache_sources(self, cache_from: List[str]):
+        """
+        로컬에 없는 캐시 소스 이미지를 레지스트리에서 미리 받아둠 (없으면 무시, docker pull ... || true 와 동일)
+        레지스트리 계정이 설정되지 않았으면 이미지가 푸시된 적이 없으므로 pull하지 않음
+        """
+        if not (settings.DOCKER_REGISTRY and settings.DOCKER_USERNAME):
+            return
+
+        def pull_missing():
+            for cache_image in cache_from:
+                try:
+                    self.docker_client.images.get(cache_image)
+                    continue
+                except docker.errors.ImageNotFound:
+                    pass
+                try:
+                    self.docker_client.images.pull(cache_image)
+                except docker.errors.APIError as e:
+                    logger.debug(f"Cache image not available: {cache_image} ({str(e)})")
+
+        try:
+            await self._run_docker(pull_missing)
+        except Exception as e:
+            # 캐시 소스 준비 실패는 빌드를 막지 않음
+            logger.warning(f"Failed to prepare cache sources {cache_from}: {str(e)}")
+
     async def _push_image(self, image_tag: str) -> bool:
         """이미지를 레지스트리에 푸시"""
         try:
             def push_image():
                 return self.docker_client.images.push(image_tag)
 
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, push_image)
+            result = await self._run_docker(push_image)
 
             logger.info(f"Successfully pushed image: {image_tag}")
             return True
@@ -364,45 +683,26 @@ class DockerfileGenerator:
             return False
 
     async def validate_dockerfile(self, dockerfile_content: str) -> Tuple[bool, str]:
-        """Dockerfile 유효성 검사"""
+        """Dockerfile 유효성 검사 (정규식 한 번의 탐색으로 필수 명령과 위험 명령 확인)"""
         try:
+            has_from = has_workdir = False
+            for match in _VALIDATE_DOCKERFILE_RE.finditer(dockerfile_content):
+                kind = match.lastgroup
+                if kind == "from":
+                    has_from = True
+                elif kind == "workdir":
+                    has_workdir = True
+                else:
+                    # 보안 검사
+                    return False, f"Potentially dangerous command detected: {match.group(kind)}"
+
             # 기본 구문 검사
-            if "FROM " not in dockerfile_content:
+            if not has_from:
                 return False, "Dockerfile must contain a FROM instruction"
 
-            if "WORKDIR " not in dockerfile_content:
+            if not has_workdir:
                 return False, "Dockerfile should contain a WORKDIR instruction"
 
-            # 보안 검사
-            dangerous_commands = ["rm -rf /", "chmod 777", "sudo", "--privileged"]
-            for cmd in dangerous_commands:
-                if cmd in dockerfile_content:
-                    return False, f"Potentially dangerous command detected: {cmd}"
-
-            # 베이스 이미지 검증
-            from_lines = [line.strip() for line in dockerfile_content.split('\n')
-                         if line.strip().startswith('FROM ')]
-
-            if not from_lines:
-                return False, "No FROM instruction found"
-
-            # Docker 빌드 시뮬레이션 (선택사항)
-            if self.docker_available:
-                try:
-                    # 임시 파일로 빌드 테스트 (실제로는 빌드하지 않음)
-                    with tempfile.NamedTemporaryFile(mode='w', suffix='.dockerfile', delete=False) as f:
-                        f.write(dockerfile_content)
-                        f.flush()
-
-                        # Docker 파일 구문 검사만 수행
-                        # self.docker_client.api.build(path=os.path.dirname(f.name),
-                        #                             dockerfile=os.path.basename(f.name),
-                        #                             rm=True, pull=False, nocache=False)
-
-                    os.unlink(f.name)
-                except Exception as e:
-                    return False, f"Docker validation failed: {str(e)}"
-
             logger.info("Dockerfile validation passed")
             return True, "Dockerfile validation passed"
 
@@ -411,39 +711,41 @@ class DockerfileGenerator:
             return False, f"Validation error: {str(e)}"
 
     def get_supported_stacks(self) -> Dict[str, Any]:
-        """지원되는 스택 목록 조회"""
-        return {
-            "languages": list(self.base_images.keys()),
-            "frameworks": {
-                "node": ["react", "vue", "express", "nestjs", "next"],
-                "python": ["django", "flask", "fastapi", "jupyter"],
-                "java": ["spring", "maven", "gradle"],
-                "go": ["gin", "echo", "fiber"]
-            },
-            "versions": self.base_images,
-            "features": {
-                "docker_available": self.docker_available,
-                "build_supported": self.docker_available,
-                "push_supported": self.docker_available and bool(getattr(settings, 'DOCKER_REGISTRY', None))
+        """지원되는 스택 목록 조회 (Docker 사용 가능 여부별로 한 번만 생성, 호출자는 수정하지 말 것)"""
+        stacks = _supported_stacks_cache.get(self.docker_available)
+        if stacks is None:
+            stacks = _supported_stacks_cache[self.docker_available] = {
+                **_SUPPORTED_STACKS_STATIC,
+                "features": {
+                    "docker_available": self.docker_available,
+                    "build_supported": self.docker_available,
+                    "push_supported": self.docker_available and bool(getattr(settings, 'DOCKER_REGISTRY', None))
+                }
             }
-        }
+        return stacks
 
     async def cleanup_temp_files(self, environment_id: str):
         """임시 파일 정리"""
-        try:
-            # 환경 ID로 생성된 임시 파일들 정리
-            temp_pattern = f"kubdev-{environment_id}-*"
-            temp_dir = tempfile.gettempdir()
-
-            for filename in os.listdir(temp_dir):
-                if filename.startswith(f"kubdev-{environment_id}-"):
-                    file_path = os.path.join(temp_dir, filename)
+        # 환경 ID로 생성된 임시 파일들 정리
+        prefix = f"kubdev-{environment_id}-"
+
+        def scan_and_remove():
+            # 전체 목록을 만들지 않고 디렉토리 항목을 순회
+            with os.scandir(tempfile.gettempdir()) as entries:
+                for entry in entries:
+                    if not entry.name.startswith(prefix):
+                        continue
                     try:
-                        os.remove(file_path)
-                        logger.debug(f"Cleaned up temp file: {file_path}")
+                        os.remove(entry.path)
+                        logger.debug(f"Cleaned up temp file: {entry.path}")
+                    except FileNotFoundError:
+                        pass
                     except Exception as e:
-                        logger.warning(f"Failed to clean up {file_path}: {str(e)}")
+                        logger.warning(f"Failed to clean up {entry.path}: {str(e)}")
 
+        try:
+            # 파일 IO는 이벤트 루프 밖에서 실행
+            await asyncio.to_thread(scan_and_remove)
             logger.info(f"Cleaned up temp files for environment {environment_id}")
         except Exception as e:
             logger.error(f"Failed to cleanup temp files: {str(e)}")
@@ -454,32 +756,32 @@ class DockerfileGenerator:
             return []
 
         try:
+            # 필터링은 데몬에서 수행 (목록 응답에 Created/Size가 포함되어 추가 inspect 불필요)
             def get_images():
-                return self.docker_client.images.list()
+                return self.docker_client.images.list(filters=KUBDEV_IMAGE_FILTERS if kubdev_only else None)
 
-            loop = asyncio.get_event_loop()
-            images = await loop.run_in_executor(None, get_images)
+            images = await self._run_docker(get_images)
 
             image_list = []
             for image in images:
                 tags = image.tags or ["<none>:<none>"]
 
-                # KubeDev 이미지만 필터링
+                # 같은 이미지에 붙은 다른 태그는 제외 (이미지 참조는 항상 소문자)
                 if kubdev_only:
-                    kubdev_tags = [tag for tag in tags if "kubdev" in tag.lower()]
-                    if not kubdev_tags:
-                        continue
-                    tags = kubdev_tags
+                    tags = [tag for tag in tags if KUBDEV_IMAGE_KEYWORD in tag]
 
+                attrs = image.attrs
+                size = attrs.get("Size", 0)
                 image_list.append({
                     "id": image.id,
                     "tags": tags,
-                    "created": image.attrs.get("Created"),
-                    "size": image.attrs.get("Size", 0),
-                    "size_mb": round(image.attrs.get("Size", 0) / (1024 * 1024), 2)
+                    "created": attrs.get("Created"),
+                    "size": size,
+                    "size_mb": round(size / (1024 * 1024), 2)
                 })
 
-            return sorted(image_list, key=lambda x: x["created"], reverse=True)
+            image_list.sort(key=itemgetter("created"), reverse=True)
+            return image_list
         except Exception as e:
             logger.error(f"Failed to list images: {str(e)}")
             return []
@@ -493,8 +795,7 @@ class DockerfileGenerator:
                 self.docker_client.images.remove(image_tag, force=True)
                 return True
 
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, remove_image)
+            await self._run_docker(remove_image)
 
             logger.info(f"Removed Docker image: {image_tag}")
             return True, f"Successfully removed image: {image_tag}"
@@ -503,16 +804,33 @@ class DockerfileGenerator:
             logger.error(error_msg)
             return False, error_msg
 
-    def get_docker_info(self) -> Dict[str, Any]:
-        """Docker 시스템 정보 조회"""
+    async def get_docker_info(self) -> Dict[str, Any]:
+        """Docker 시스템 정보 조회 (캐시가 만료되면 이전 값을 반환하고 백그라운드에서 갱신)"""
+        global _docker_info_refresh_task
         if not self.docker_available:
             return {"available": False, "error": "Docker not available"}
 
+        if _docker_info_cache is None:
+            return await self._refresh_docker_info()
+
+        expires_at, info = _docker_info_cache
+        if expires_at <= time.monotonic() and (
+            _docker_info_refresh_task is None or _docker_info_refresh_task.done()
+        ):
+            _docker_info_refresh_task = asyncio.create_task(self._refresh_docker_info())
+        return info
+
+    async def _refresh_docker_info(self) -> Dict[str, Any]:
+        """info()와 version()을 동시에 조회해 캐시 갱신"""
+        global _docker_info_cache
         try:
-            info = self.docker_client.info()
-            return {
+            info, version = await asyncio.gather(
+                self._run_docker(lambda: self.docker_client.info()),
+                self._run_docker(lambda: self.docker_client.version())
+            )
+            result = {
                 "available": True,
-                "version": self.docker_client.version(),
+                "version": version,
                 "containers": info.get("Containers", 0),
                 "images": info.get("Images", 0),
                 "server_version": info.get("ServerVersion"),
@@ -520,6 +838,8 @@ class DockerfileGenerator:
                 "total_memory": info.get("MemTotal", 0),
                 "cpus": info.get("NCPU", 0)
             }
+            _docker_info_cache = (time.monotonic() + DOCKER_INFO_CACHE_TTL, result)
+            return result
         except Exception as e:
             logger.error(f"Failed to get Docker info: {str(e)}")
-            return {"available": False, "error": str(e)}
\ No newline at end of file
+            return {"available": False, "error": str(e)}
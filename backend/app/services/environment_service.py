@@ -4,26 +4,144 @@ Environment Service
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+from sqlalchemy import insert, select, func, text, literal_column
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import structlog
 import yaml
 
 from app.models.environment import EnvironmentInstance, EnvironmentStatus
 from app.models.project_template import ProjectTemplate
+from app.models.resource_metrics import ResourceMetric, ResourceMetricRollup5m
 from app.models.user import User
-from app.services.kubernetes_service import KubernetesService
+from app.services.kubernetes_service import get_kubernetes_service
 from app.services.notification_service import notification_service
 from app.core.config import settings
 
 
+class TemplateSnapshot(NamedTuple):
+    """배포에 필요한 템플릿 필드만 담은 읽기 전용 스냅샷"""
+    name: str
+    base_image: str
+    resource_limits: Dict[str, Any]
+    environment_variables: Dict[str, Any]
+    exposed_ports: List[Any]
+
+
+_TEMPLATE_SNAPSHOT_COLUMNS = (
+    ProjectTemplate.name,
+    ProjectTemplate.base_image,
+    ProjectTemplate.resource_limits,
+    ProjectTemplate.environment_variables,
+    ProjectTemplate.exposed_ports,
+)
+
+# 템플릿 ID -> 스냅샷 캐시 (같은 템플릿으로 반복 배포 시 SELECT/ORM 객체 생성 생략)
+# 템플릿 수정/삭제 시 invalidate_template_snapshot_cache로 무효화하고, 다른 경로의 변경은 TTL로 반영
+TEMPLATE_SNAPSHOT_CACHE_TTL = 300.0
+TEMPLATE_SNAPSHOT_CACHE_MAXSIZE = 256
+_template_snapshot_cache: Dict[int, Tuple[float, TemplateSnapshot]] = {}
+
+
+def invalidate_template_snapshot_cache(template_id: Optional[int] = None) -> None:
+    """템플릿 변경 시 스냅샷 캐시 무효화 (template_id가 없으면 전체)"""
+    if template_id is None:
+        _template_snapshot_cache.clear()
+    else:
+        _template_snapshot_cache.pop(template_id, None)
+
+
+def get_template_snapshot(db: Session, template_id: int) -> Optional[TemplateSnapshot]:
+    """캐시된 템플릿 스냅샷 조회 (없으면 필요한 컬럼만 SELECT)"""
+    now = time.monotonic()
+    cached = _template_snapshot_cache.get(template_id)
+    if cached and cached[0] > now:
+        return cached[1]
+
+    row = db.execute(
+        select(*_TEMPLATE_SNAPSHOT_COLUMNS).where(ProjectTemplate.id == template_id)
+    ).first()
+    if not row:
+        return None
+    snapshot = TemplateSnapshot(*row)
+
+    if len(_template_snapshot_cache) >= TEMPLATE_SNAPSHOT_CACHE_MAXSIZE:
+        _template_snapshot_cache.clear()
+    _template_snapshot_cache[template_id] = (now + TEMPLATE_SNAPSHOT_CACHE_TTL, snapshot)
+    return snapshot
+
+
+# 메트릭 집계 구간 (초)
+METRICS_ROLLUP_BUCKET_SECONDS = 300
+
+
+def _metrics_bucket(ts):
+    """타임스탬프를 5분 구간 시작 시각으로 내림"""
+    seconds = literal_column(str(METRICS_ROLLUP_BUCKET_SECONDS))
+    return func.to_timestamp(func.floor(func.extract("epoch", ts) / seconds) * seconds)
+
+
+def rollup_recent_metrics(db: Session) -> None:
+    """
+    최근 5분이 걸친 구간들의 메트릭 집계를 다시 계산해 rollup 테이블에 upsert (커밋은 호출자가 수행)
+    구간 경계부터 다시 읽으므로 각 구간은 항상 전체 행으로 계산됨
+    """
+    bucket = _metrics_bucket(ResourceMetric.timestamp).label("bucket_start")
+    recent = (
+        select(
+            ResourceMetric.environment_id,
+            bucket,
+            func.avg(ResourceMetric.cpu_usage_percent),
+            func.max(ResourceMetric.cpu_usage_percent),
+            func.avg(ResourceMetric.memory_usage_percent),
+            func.max(ResourceMetric.memory_usage_percent),
+            func.avg(ResourceMetric.storage_usage_percent),
+            func.max(ResourceMetric.storage_usage_percent),
+            func.count(),
+        )
+        .where(ResourceMetric.timestamp >= _metrics_bucket(func.now() - text("interval '5 minutes'")))
+        .group_by(ResourceMetric.environment_id, bucket)
+    )
+    stmt = pg_insert(ResourceMetricRollup5m).from_select(
+        [
+            "environment_id", "bucket_start",
+            "avg_cpu_usage", "max_cpu_usage",
+            "avg_memory_usage", "max_memory_usage",
+            "avg_storage_usage", "max_storage_usage",
+            "samples",
+        ],
+        recent,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["environment_id", "bucket_start"],
+        set_={
+            col: stmt.excluded[col]
+            for col in (
+                "avg_cpu_usage", "max_cpu_usage",
+                "avg_memory_usage", "max_memory_usage",
+                "avg_storage_usage", "max_storage_usage",
+                "samples",
+            )
+        },
+    )
+    db.execute(stmt)
+
+
+def bulk_insert_metrics(db: Session, rows: List[Dict[str, Any]]) -> None:
+    """메트릭 행을 한 번의 배치 INSERT로 저장 (행 단위 ORM add 대신, 커밋은 호출자가 수행)"""
+    if rows:
+        db.execute(insert(ResourceMetric), rows)
+
+
 class EnvironmentService:
     """개발 환경 관리 서비스"""
 
     def __init__(self, db: Session, logger: Optional[structlog.stdlib.BoundLogger] = None):
         self.db = db
-        self.k8s_service = KubernetesService()
+        self.k8s_service = get_kubernetes_service()
         self.log = logger or structlog.get_logger(__name__)
 
     async def refresh_environment_metrics(self) -> None:
@@ -72,45 +190,36 @@ class EnvironmentService:
         log = self.log.bind(environment_id=environment_id)
         log.info("Starting environment deployment")
 
-        environment = self.db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.id == environment_id
-        ).first()
+        environment = self.db.get(EnvironmentInstance, environment_id)
 
         if not environment:
             log.error("Deployment failed: environment not found in DB")
             raise Exception("Environment not found")
 
-        template = self.db.query(ProjectTemplate).filter(
-            ProjectTemplate.id == environment.template_id
-        ).first()
+        template = get_template_snapshot(self.db, environment.template_id)
 
         if not template:
             log.error("Deployment failed: template not found", template_id=environment.template_id)
             raise Exception("Template not found")
 
+        # 리소스 제한 (템플릿 값이 없으면 기본값, 쿼터와 컨테이너 제한에 같은 값 사용)
+        template_limits = template.resource_limits or {}
+        cpu_limit = template_limits.get("cpu", settings.DEFAULT_CPU_LIMIT)
+        memory_limit = template_limits.get("memory", settings.DEFAULT_MEMORY_LIMIT)
+        storage_limit = template_limits.get("storage", settings.DEFAULT_STORAGE_LIMIT)
+        resource_limits = {"cpu": cpu_limit, "memory": memory_limit}
+
         try:
-            # 환경 상태 업데이트
+            # 환경 상태 업데이트 (커밋은 배포 완료/실패 시 한 번만 수행)
             environment.status = EnvironmentStatus.CREATING
             environment.status_message = "Deploying to Kubernetes..."
-            self.db.commit()
+            self.db.flush()
             log.info("Set environment status to CREATING")
 
             # 네임스페이스 생성 (없으면)
             await self.k8s_service.create_namespace(environment.k8s_namespace)
             log.info("Namespace ensured", namespace=environment.k8s_namespace)
 
-            # ResourceQuota 생성 (자원 사용량 제한)
-            quota_name = f"quota-{environment.k8s_deployment_name}"
-            await self.k8s_service.create_resource_quota(
-                namespace=environment.k8s_namespace,
-                quota_name=quota_name,
-                cpu_limit=template.resource_limits.get("cpu", settings.DEFAULT_CPU_LIMIT),
-                memory_limit=template.resource_limits.get("memory", settings.DEFAULT_MEMORY_LIMIT),
-                storage_limit=template.resource_limits.get("storage", settings.DEFAULT_STORAGE_LIMIT),
-                pod_limit=5
-            )
-            log.info("ResourceQuota created", quota_name=quota_name)
-
             # 환경변수 준비
             env_vars = {
                 "ENVIRONMENT_ID": str(environment.id),
@@ -169,57 +278,80 @@ echo "📁 작업 경로: /workspace"
                 env_vars["GIT_CLONE_SCRIPT"] = git_clone_script
                 log.info("Git auto-clone configured", repo=environment.git_repository, branch=git_branch)
 
-            # 리소스 제한 설정
-            resource_limits = template.resource_limits or {
-                "cpu": settings.DEFAULT_CPU_LIMIT,
-                "memory": settings.DEFAULT_MEMORY_LIMIT
-            }
 
-            # Deployment 생성
-            deployment_result = await self.k8s_service.create_deployment(
-                namespace=environment.k8s_namespace,
-                deployment_name=environment.k8s_deployment_name,
-                image=template.base_image,
-                environment_vars=env_vars,
-                resource_limits=resource_limits,
-                git_repo=environment.git_repository,
-                git_branch=environment.git_branch or "main"
-            )
-            log.info("Deployment created", deployment_name=environment.k8s_deployment_name)
-
-            # Service 생성
-            service_result = await self.k8s_service.create_service(
-                namespace=environment.k8s_namespace,
-                service_name=environment.k8s_service_name,
-                deployment_name=environment.k8s_deployment_name,
-                port=8080
-            )
-            log.info("Service created", service_name=environment.k8s_service_name)
-
-            # Ingress 생성 (외부 접속용)
+            quota_name = f"quota-{environment.k8s_deployment_name}"
             ingress_host = f"{environment.k8s_deployment_name}.kubdev.local"
             ingress_name = f"ing-{environment.k8s_deployment_name}"
 
-            await self.k8s_service.create_ingress(
-                namespace=environment.k8s_namespace,
-                ingress_name=ingress_name,
-                service_name=environment.k8s_service_name,
-                host=ingress_host,
-                service_port=8080
-            )
-            log.info("Ingress created", ingress_name=ingress_name, host=ingress_host)
+            # 이 호출에서 실제로 생성한 리소스만 롤백 대상 (동시 시작/재배포로 이미 있던 리소스는 건드리지 않음)
+            created: List[str] = []
+            try:
+                # ResourceQuota/Service/Ingress는 서로 의존하지 않으므로 동시에 생성
+                # (Service는 라벨 셀렉터, Ingress는 Service 이름으로만 연결되어 Deployment가 없어도 생성 가능)
+                quota_result, service_result, ingress_result = await asyncio.gather(
+                    self.k8s_service.create_resource_quota(
+                        namespace=environment.k8s_namespace,
+                        quota_name=quota_name,
+                        cpu_limit=cpu_limit,
+                        memory_limit=memory_limit,
+                        storage_limit=storage_limit,
+                        pod_limit=5
+                    ),
+                    self.k8s_service.create_service(
+                        namespace=environment.k8s_namespace,
+                        service_name=environment.k8s_service_name,
+                        deployment_name=environment.k8s_deployment_name,
+                        port=8080
+                    ),
+                    self.k8s_service.create_ingress(
+                        namespace=environment.k8s_namespace,
+                        ingress_name=ingress_name,
+                        service_name=environment.k8s_service_name,
+                        host=ingress_host,
+                        service_port=8080
+                    ),
+                    return_exceptions=True
+                )
+                if not isinstance(service_result, Exception):
+                    created.append("service")
+                if not isinstance(ingress_result, Exception):
+                    created.append("ingress")
+                for result in (quota_result, service_result, ingress_result):
+                    if isinstance(result, Exception):
+                        raise result
+                log.info("ResourceQuota, Service and Ingress created",
+                         quota_name=quota_name, service_name=environment.k8s_service_name,
+                         ingress_name=ingress_name, host=ingress_host)
+
+                # Deployment는 파드가 쿼터를 적용받도록 ResourceQuota 생성 이후에 생성
+                deployment_result = await self.k8s_service.create_deployment(
+                    namespace=environment.k8s_namespace,
+                    deployment_name=environment.k8s_deployment_name,
+                    image=template.base_image,
+                    environment_vars=env_vars,
+                    resource_limits=resource_limits,
+                    git_repo=environment.git_repository,
+                    git_branch=environment.git_branch or "main"
+                )
+                log.info("Deployment created", deployment_name=environment.k8s_deployment_name)
+            except Exception:
+                await self._rollback_k8s_resources(environment, ingress_name, created, log)
+                raise
 
             # 환경 정보 업데이트
             environment.k8s_ingress_name = ingress_name
             environment.access_url = f"http://{ingress_host}"
             environment.status = EnvironmentStatus.RUNNING
             environment.status_message = "Environment is ready"
-            environment.started_at = datetime.utcnow()
+            # 시각은 한 번만 읽어 재사용 (컬럼이 timezone=True이므로 UTC aware 값 사용)
+            now = datetime.now(timezone.utc)
+            environment.started_at = now
 
             if not environment.expires_at:
-                environment.expires_at = datetime.utcnow() + timedelta(hours=settings.ENVIRONMENT_TIMEOUT_HOURS)
+                environment.expires_at = now + timedelta(hours=settings.ENVIRONMENT_TIMEOUT_HOURS)
 
-            environment.port_mappings = template.exposed_ports or []
+            # 캐시된 스냅샷과 리스트를 공유하지 않도록 복사
+            environment.port_mappings = list(template.exposed_ports or [])
             self.db.commit()
             log.info("Environment deployment successful, waiting for ready state")
 
@@ -234,7 +366,9 @@ echo "📁 작업 경로: /workspace"
             except Exception as notify_error:
                 log.error("Failed to send Slack notification for create event", error=str(notify_error))
 
-            asyncio.create_task(self._wait_for_deployment_ready(environment_id))
+            asyncio.create_task(self._wait_for_deployment_ready(
+                environment.id, environment.k8s_namespace, environment.k8s_deployment_name
+            ))
 
             return {
                 "environment_id": environment.id,
@@ -251,56 +385,88 @@ echo "📁 작업 경로: /workspace"
             self.db.commit()
             raise
 
-    async def _wait_for_deployment_ready(self, environment_id: int, max_wait_time: int = 300):
-        """Deployment가 Ready 상태가 될 때까지 대기"""
+    async def _rollback_k8s_resources(self, environment: EnvironmentInstance, ingress_name: str,
+                                      created: List[str], log: structlog.stdlib.BoundLogger) -> None:
+        """배포 도중 실패 시 이 호출에서 생성한 Service/Ingress만 정리 (없는 리소스는 무시)
+
+        Deployment는 생성이 마지막 단계라 성공했다면 롤백할 일이 없고, 실패(409 포함)했다면
+        다른 호출이 만든 것이므로 삭제하지 않음.
+        """
+        deletions = {
+            "service": lambda: self.k8s_service.delete_service(environment.k8s_namespace, environment.k8s_service_name),
+            "ingress": lambda: self.k8s_service.delete_ingress(environment.k8s_namespace, ingress_name),
+        }
+        results = await asyncio.gather(
+            *(deletions[kind]() for kind in created),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                log.warning("Failed to roll back partially created resource", error=str(result))
+
+    def _set_environment_status(self, environment_id: int, status: EnvironmentStatus, status_message: str) -> None:
+        """행을 다시 로드하지 않고 상태 컬럼만 UPDATE 후 커밋"""
+        updated = self.db.query(EnvironmentInstance).filter(
+            EnvironmentInstance.id == environment_id
+        ).update({"status": status, "status_message": status_message}, synchronize_session=False)
+        self.db.commit()
+        if not updated:
+            self.log.error("Cannot update environment status: environment not found", environment_id=environment_id)
+
+    async def _wait_for_deployment_ready(self, environment_id: int, namespace: str, deployment_name: str,
+                                         max_wait_time: int = 300):
+        """Deployment가 Ready 상태가 될 때까지 대기 (상태를 기록할 때만 DB에 접근)"""
         log = self.log.bind(environment_id=environment_id)
         log.info("Waiting for deployment to become ready")
-        environment = self.db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.id == environment_id
-        ).first()
 
-        if not environment:
-            log.error("Cannot wait for deployment: environment not found")
-            return
+        # 벽시계 대신 단조 시계로 마감 시각 계산 (시간 동기화로 시계가 바뀌어도 대기 시간 유지)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_wait_time
 
-        start_time = datetime.utcnow()
+        # watch 스트림으로 Ready 즉시 감지 (고정 간격 폴링 대기 없음)
+        ready = False
+        try:
+            ready = await self.k8s_service.watch_deployment_ready(
+                namespace=namespace,
+                deployment_name=deployment_name,
+                timeout=max_wait_time
+            )
+        except Exception as e:
+            log.warning("Deployment watch unavailable, falling back to polling", error=str(e))
 
-        while (datetime.utcnow() - start_time).seconds < max_wait_time:
+        # watch를 쓸 수 없거나 스트림이 일찍 끊긴 경우 남은 시간 동안 지수 백오프로 폴링 (1초 → 최대 30초)
+        delay = 1
+        while not ready and loop.time() < deadline:
             try:
                 status = await self.k8s_service.get_deployment_status(
-                    namespace=environment.k8s_namespace,
-                    deployment_name=environment.k8s_deployment_name
+                    namespace=namespace,
+                    deployment_name=deployment_name
                 )
-
-                if status.get("ready_replicas", 0) >= 1:
-                    log.info("Deployment is ready")
-                    environment.status = EnvironmentStatus.RUNNING
-                    environment.status_message = "Environment is running and ready"
-                    self.db.commit()
-                    break
-
-                log.info("Deployment not ready yet, waiting...", ready_replicas=status.get("ready_replicas", 0))
-                await asyncio.sleep(30)
-
             except Exception as e:
                 log.error("Health check failed while waiting for deployment", error=str(e), exc_info=True)
-                environment.status = EnvironmentStatus.ERROR
-                environment.status_message = f"Health check failed: {str(e)}"
-                self.db.commit()
+                self._set_environment_status(environment_id, EnvironmentStatus.ERROR, f"Health check failed: {str(e)}")
+                return
+
+            if status.get("ready_replicas", 0) >= 1:
+                ready = True
                 break
+
+            log.info("Deployment not ready yet, waiting...", ready_replicas=status.get("ready_replicas", 0), retry_in=delay)
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            delay = min(delay * 2, 30)
+
+        if ready:
+            log.info("Deployment is ready")
+            self._set_environment_status(environment_id, EnvironmentStatus.RUNNING, "Environment is running and ready")
         else:
             log.warning("Deployment timeout: environment did not become ready")
-            environment.status = EnvironmentStatus.ERROR
-            environment.status_message = "Deployment timeout - environment did not become ready"
-            self.db.commit()
+            self._set_environment_status(environment_id, EnvironmentStatus.ERROR, "Deployment timeout - environment did not become ready")
 
     async def start_environment(self, environment_id: int) -> Dict[str, Any]:
         """환경 시작"""
         log = self.log.bind(environment_id=environment_id)
         log.info("Starting environment")
-        environment = self.db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.id == environment_id
-        ).first()
+        environment = self.db.get(EnvironmentInstance, environment_id)
 
         if not environment:
             log.error("Start failed: environment not found")
@@ -323,8 +489,9 @@ echo "📁 작업 경로: /workspace"
                 log.info("Scaling up existing deployment")
                 # TODO: Implement scale-up logic in k8s_service
                 environment.status = EnvironmentStatus.RUNNING
-                environment.started_at = datetime.utcnow()
-                environment.last_accessed_at = datetime.utcnow()
+                now = datetime.now(timezone.utc)
+                environment.started_at = now
+                environment.last_accessed_at = now
                 self.db.commit()
             
             log.info("Environment started successfully")
@@ -341,9 +508,7 @@ echo "📁 작업 경로: /workspace"
         """환경 중지 - Deployment를 0으로 스케일 다운"""
         log = self.log.bind(environment_id=environment_id)
         log.info("Stopping environment by scaling down to 0")
-        environment = self.db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.id == environment_id
-        ).first()
+        environment = self.db.get(EnvironmentInstance, environment_id)
 
         if not environment:
             log.error("Stop failed: environment not found")
@@ -358,7 +523,7 @@ echo "📁 작업 경로: /workspace"
             )
 
             environment.status = EnvironmentStatus.STOPPED
-            environment.stopped_at = datetime.utcnow()
+            environment.stopped_at = datetime.now(timezone.utc)
             environment.status_message = "Environment stopped - scaled down to 0"
             self.db.commit()
             log.info("Environment stopped successfully")
@@ -383,9 +548,7 @@ echo "📁 작업 경로: /workspace"
         """환경 재시작 - Deployment 스케일 다운 후 스케일 업으로 Pod 재생성"""
         log = self.log.bind(environment_id=environment_id)
         log.info("Restarting environment")
-        environment = self.db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.id == environment_id
-        ).first()
+        environment = self.db.get(EnvironmentInstance, environment_id)
 
         if not environment:
             log.error("Restart failed: environment not found")
@@ -394,14 +557,15 @@ echo "📁 작업 경로: /workspace"
         try:
             # 1단계: 0으로 스케일 다운
             log.info("Scaling deployment to 0 for restart", deployment_name=environment.k8s_deployment_name)
-            await self.k8s_service.scale_deployment(
+            scaled_down = await self.k8s_service.scale_deployment(
                 namespace=environment.k8s_namespace,
                 deployment_name=environment.k8s_deployment_name,
                 replicas=0
             )
 
-            # 짧은 대기 (Pod 종료 시간)
-            await asyncio.sleep(5)
+            # 고정 대기 대신 기존 Pod가 실제로 종료될 때까지만 대기 (스케일 다운하지 못했으면 기다릴 Pod 없음)
+            if scaled_down:
+                await self._wait_for_pods_gone(environment.k8s_namespace, environment.k8s_deployment_name, log)
 
             # 2단계: 1로 스케일 업 (Pod 재생성 및 PVC 재마운트)
             log.info("Scaling deployment to 1 for restart", deployment_name=environment.k8s_deployment_name)
@@ -424,29 +588,40 @@ echo "📁 작업 경로: /workspace"
             self.db.commit()
             raise
 
+    async def _wait_for_pods_gone(self, namespace: str, deployment_name: str,
+                                  log: structlog.stdlib.BoundLogger, timeout: float = 15) -> None:
+        """Deployment의 Pod가 모두 종료될 때까지 짧은 백오프로 확인 (0.5초 → 최대 2초, 시간 초과 시 그대로 진행)"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = 0.5
+        while True:
+            try:
+                remaining_pods = await self.k8s_service.count_deployment_pods(namespace, deployment_name)
+            except Exception as e:
+                log.warning("Failed to check pod termination, continuing restart", error=str(e))
+                return
+
+            if remaining_pods == 0:
+                return
+            if loop.time() >= deadline:
+                log.warning("Pods still terminating after timeout, continuing restart", remaining_pods=remaining_pods)
+                return
+
+            await asyncio.sleep(min(delay, max(deadline - loop.time(), 0)))
+            delay = min(delay * 2, 2)
+
     async def delete_environment(self, environment_id: int) -> Dict[str, Any]:
         """환경 완전 삭제 - Namespace 전체 삭제로 모든 리소스 회수"""
         log = self.log.bind(environment_id=environment_id)
         log.info("Deleting environment permanently - deleting entire namespace")
-        environment = self.db.query(EnvironmentInstance).filter(
-            EnvironmentInstance.id == environment_id
-        ).first()
+        environment = self.db.get(EnvironmentInstance, environment_id)
 
         if not environment:
             log.error("Delete failed: environment not found")
             raise Exception("Environment not found")
 
         try:
-            # 네임스페이스 전체 삭제 (모든 리소스 자동 정리)
-            log.info("Deleting entire namespace to clean up all resources", namespace=environment.k8s_namespace)
-            await self.k8s_service.delete_namespace(environment.k8s_namespace)
-
-            # 슬랙 알림 전송 (DB에서 삭제되기 전에 정보 사용)
-            try:
-                message = f"🗑️ 환경 삭제: '{environment.name}' (ID: {environment.id}, 사용자: {environment.user.name})이(가) 영구적으로 삭제되었습니다."
-                await notification_service.send_slack_notification(message)
-            except Exception as notify_error:
-                log.error("Failed to send Slack notification for delete event", error=str(notify_error))
+            await self._release_environment(environment, log)
 
             # 데이터베이스에서 환경 기록 삭제
             log.info("Deleting environment from database")
@@ -459,6 +634,50 @@ echo "📁 작업 경로: /workspace"
             log.error("Failed to delete environment", error=str(e), exc_info=True)
             raise Exception(f"Failed to delete environment: {str(e)}")
 
+    async def delete_environments(self, environments: List[EnvironmentInstance],
+                                  concurrency: int) -> List[Optional[Exception]]:
+        """
+        여러 환경 일괄 삭제 - K8s 네임스페이스 삭제만 동시에 실행하고
+        DB 삭제는 같은 세션에서 순차적으로 처리해 한 번에 커밋 (환경별 오류 목록 반환)
+        """
+        sem = asyncio.Semaphore(concurrency)
+
+        async def _release(environment):
+            async with sem:
+                try:
+                    await self._release_environment(environment, self.log.bind(environment_id=environment.id))
+                    return None
+                except Exception as e:
+                    self.log.error("Failed to delete environment", environment_id=environment.id, error=str(e))
+                    return e
+
+        errors = await asyncio.gather(*[_release(env) for env in environments])
+
+        for environment, error in zip(environments, errors):
+            if error is None:
+                self.db.delete(environment)
+        try:
+            self.db.commit()
+        except Exception as e:
+            self.db.rollback()
+            self.log.error("Failed to delete environments from database", error=str(e), exc_info=True)
+            errors = [error or e for error in errors]
+        return errors
+
+    async def _release_environment(self, environment: EnvironmentInstance,
+                                   log: structlog.stdlib.BoundLogger) -> None:
+        """환경의 네임스페이스 삭제 및 삭제 알림 (DB는 건드리지 않음)"""
+        # 네임스페이스 전체 삭제 (모든 리소스 자동 정리)
+        log.info("Deleting entire namespace to clean up all resources", namespace=environment.k8s_namespace)
+        await self.k8s_service.delete_namespace(environment.k8s_namespace)
+
+        # 슬랙 알림 전송 (DB에서 삭제되기 전에 정보 사용)
+        try:
+            message = f"🗑️ 환경 삭제: '{environment.name}' (ID: {environment.id}, 사용자: {environment.user.name})이(가) 영구적으로 삭제되었습니다."
+            await notification_service.send_slack_notification(message)
+        except Exception as notify_error:
+            log.error("Failed to send Slack notification for delete event", error=str(notify_error))
+
     async def create_environment_from_yaml(
         self,
         template_id: int,
@@ -480,9 +699,7 @@ echo "📁 작업 경로: /workspace"
         log.info("Creating environment from YAML")
 
         # 1. 템플릿 존재 확인
-        template = self.db.query(ProjectTemplate).filter(
-            ProjectTemplate.id == template_id
-        ).first()
+        template = self.db.get(ProjectTemplate, template_id)
 
         if not template:
             log.warning("Template not found", template_id=template_id)
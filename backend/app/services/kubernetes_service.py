@@ -4,20 +4,263 @@ K8s 클러스터와의 상호작용을 관리하는 서비스
 """
 
 import asyncio
+import functools
+import heapq
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import structlog
-from typing import Dict, List, Any, Optional
-from kubernetes import client, config
+from types import MappingProxyType
+from typing import Dict, List, Any, Optional, Tuple
+from kubernetes import client, config, watch
 from kubernetes.client.rest import ApiException
 
+from app.core.config import settings
+from app.services.cache_service import cache_service
+
 log = structlog.get_logger(__name__)
 
+# 노드 InternalIP 캐시 (단일 노드 minikube 환경에서는 사실상 변하지 않음)
+NODE_IP_CACHE_TTL = 300.0
+_node_ip_cache: Optional[Tuple[float, str]] = None
+_node_ip_lock = asyncio.Lock()
+
+# 관리자 대시보드용 클러스터/환경 상태 캐시 TTL (초)
+K8S_DASHBOARD_CACHE_TTL = 10.0
+
+# 대시보드가 몇 초마다 폴링하는 단건 조회의 메모이제이션 TTL (초)
+K8S_READ_CACHE_TTL = 1.0
+K8S_READ_CACHE_MAXSIZE = 1024
+
+
+def _ttl_cached(ttl: float):
+    """같은 인자의 조회 결과를 ttl초 동안 재사용하는 메서드 데코레이터 (동시 미스는 한 번만 조회)
+
+    키는 self를 제외한 인자 값 순서대로 구성하므로 호출은 시그니처 순서를 따라야 함.
+    wrapper.invalidate(*args)로 특정 키를 지울 수 있음.
+    """
+    def decorator(fn):
+        cache: Dict[Tuple, Tuple[float, Any]] = {}
+        locks: Dict[Tuple, asyncio.Lock] = {}
+
+        @functools.wraps(fn)
+        async def wrapper(self, *args, **kwargs):
+            key = args + tuple(kwargs.values())
+            entry = cache.get(key)
+            if entry and entry[0] > time.monotonic():
+                return entry[1]
+
+            async with locks.setdefault(key, asyncio.Lock()):
+                # 대기 중 다른 요청이 이미 조회했으면 재사용
+                entry = cache.get(key)
+                if entry and entry[0] > time.monotonic():
+                    return entry[1]
+                value = await fn(self, *args, **kwargs)
+                if len(cache) >= K8S_READ_CACHE_MAXSIZE:
+                    cache.clear()
+                    locks.clear()
+                cache[key] = (time.monotonic() + ttl, value)
+                return value
+
+        wrapper.invalidate = lambda *args: cache.pop(args, None)
+        return wrapper
+    return decorator
+
+
+# K8s 수량 접미사 → 기본 단위(코어/바이트) 배수
+_QUANTITY_MULTIPLIERS = {
+    "": 1, "n": 1e-9, "u": 1e-6, "m": 1e-3,
+    "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18,
+    "Ki": 1024, "Mi": 1024 ** 2, "Gi": 1024 ** 3, "Ti": 1024 ** 4, "Pi": 1024 ** 5, "Ei": 1024 ** 6,
+}
+_QUANTITY_RE = re.compile(r"^(\d+(?:\.\d+)?)([a-zA-Z]*)$")
+
+
+def _parse_quantity(quantity: Optional[str]) -> Optional[float]:
+    """K8s 수량 문자열("500m", "1.5", "2Gi" 등)을 기본 단위 값으로 변환 (해석할 수 없으면 None)"""
+    if not quantity:
+        return None
+    match = _QUANTITY_RE.match(str(quantity))
+    if not match:
+        return None
+    multiplier = _QUANTITY_MULTIPLIERS.get(match.group(2))
+    if multiplier is None:
+        return None
+    return float(match.group(1)) * multiplier
+
+
+# KubeDevEnvironment 소유자 라벨 (/me/workspaces가 라벨 셀렉터로 조회하므로 모든 생성 경로에서 부여)
+KUBEDEV_USER_LABEL = "kubedev.io/user"
+_LABEL_INVALID = re.compile(r"[^a-z0-9-]")
+
+
+def _with_user_label(custom_object: Dict[str, Any]) -> Dict[str, Any]:
+    """KubeDevEnvironment면 spec.userName으로 소유자 라벨을 채워 넣음 (이미 있으면 유지)"""
+    user_name = (custom_object.get("spec") or {}).get("userName")
+    if custom_object.get("kind") != "KubeDevEnvironment" or not user_name:
+        return custom_object
+    metadata = custom_object.setdefault("metadata", {})
+    labels = metadata.get("labels") or {}
+    labels.setdefault(KUBEDEV_USER_LABEL, _LABEL_INVALID.sub("-", user_name.lower())[:63].strip("-"))
+    metadata["labels"] = labels
+    return custom_object
+
+
+# 모든 환경 ResourceQuota에 공통인 고정 항목 (읽기 전용)
+_QUOTA_FIXED_HARD = MappingProxyType({
+    "services": "5",
+    "persistentvolumeclaims": "3",
+    "secrets": "10",
+    "configmaps": "10",
+})
+
+
+def _quota_status_from_object(quota) -> Dict[str, Any]:
+    """ResourceQuota 객체로 사용량/사용률 정보 구성 (이미 조회한 객체를 다시 읽지 않도록 분리)"""
+    hard = (quota.status and quota.status.hard) or {}
+    used = (quota.status and quota.status.used) or {}
+
+    def pct(resource):
+        # 환경 쿼터는 limits.* 로 생성되므로 우선 사용하고, 없으면 축약형(cpu/memory) 사용
+        if resource not in hard:
+            resource = resource.split(".", 1)[1]
+        # 단위가 달라도("500m"/"1", "1500Mi"/"2Gi") 기본 단위로 맞춰 비교
+        used_value = _parse_quantity(used.get(resource))
+        hard_value = _parse_quantity(hard.get(resource))
+        if used_value is None or not hard_value:
+            return None
+        return round(used_value * 100 / hard_value, 2)
+
+    return {
+        "status": "available",
+        "hard": hard,
+        "used": used,
+        "utilization": {
+            "cpu_percent": pct("limits.cpu"),
+            "memory_percent": pct("limits.memory")
+        }
+    }
+
+
+def _event_timestamp(ev) -> Optional[str]:
+    """이벤트의 마지막 발생 시각 (ISO 문자열)"""
+    ts = ev.last_timestamp or ev.event_time or ev.first_timestamp or ev.metadata.creation_timestamp
+    return ts.isoformat() if ts else None
+
+
+def _event_sort_key(ev) -> str:
+    return _event_timestamp(ev) or ""
+
+
+# 인포머 watch 요청 한 번의 서버 측 타임아웃 (끝나면 마지막 resourceVersion부터 다시 watch)
+INFORMER_WATCH_TIMEOUT = 300
+# watch/list 실패 후 다시 목록을 받기까지 대기 시간 (초)
+INFORMER_RETRY_INTERVAL = 5.0
+# Deployment Ready 대기 watch 한 번의 최대 길이 (초), 전체 대기 시간 안에서 반복
+READY_WATCH_CHUNK = 30
+
+
+class _ResourceInformer:
+    """list + watch로 리소스 목록을 메모리에 유지 (조회 시 API 서버 대신 로컬 인덱스 사용)"""
+
+    def __init__(self, name: str, list_fn, **list_kwargs):
+        self.name = name
+        self._list_fn = list_fn
+        self._list_kwargs = list_kwargs
+        self._items: Dict[Tuple[Optional[str], str], Any] = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        # 캐시 내용이 바뀔 때마다 증가 (조회 측에서 변화가 없으면 이전 계산 결과 재사용)
+        self._generation = 0
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """watch 스레드 시작 (이미 실행 중이면 무시)"""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name=f"k8s-informer-{self.name}", daemon=True)
+            self._thread.start()
+
+    @property
+    def generation(self) -> Optional[int]:
+        """캐시 변경 횟수 (동기화 전이면 None)"""
+        return self._generation if self._synced.is_set() else None
+
+    def items(self) -> Optional[List[Any]]:
+        """캐시된 객체 목록 (첫 동기화 전이거나 watch가 끊긴 상태면 None)"""
+        if not self._synced.is_set():
+            return None
+        with self._lock:
+            return list(self._items.values())
+
+    def list_now(self) -> List[Any]:
+        """인포머 캐시를 거치지 않고 API 서버에서 바로 목록 조회 (동기)"""
+        return self._list(resource_version="0").items
+
+    def _list(self, **kwargs):
+        # resource_version="0": etcd까지 가지 않고 API 서버의 watch 캐시에서 응답
+        return self._list_fn(**self._list_kwargs, **kwargs)
+
+    @staticmethod
+    def _key(obj) -> Tuple[Optional[str], str]:
+        return obj.metadata.namespace, obj.metadata.name
+
+    def _run(self):
+        while True:
+            try:
+                resource_version = self._relist()
+                while True:
+                    w = watch.Watch()
+                    for event in w.stream(
+                        self._list_fn,
+                        resource_version=resource_version,
+                        timeout_seconds=INFORMER_WATCH_TIMEOUT,
+                        **self._list_kwargs
+                    ):
+                        obj = event["object"]
+                        with self._lock:
+                            if event["type"] == "DELETED":
+                                self._items.pop(self._key(obj), None)
+                            else:
+                                self._items[self._key(obj)] = obj
+                            self._generation += 1
+                    # 타임아웃으로 끝난 watch는 마지막으로 본 버전부터 이어서 감시
+                    resource_version = w.resource_version or resource_version
+            except Exception as e:
+                # 410 Gone(버전 만료) 등 watch를 이어갈 수 없으면 목록부터 다시 받음
+                self._synced.clear()
+                log.warning("Informer watch interrupted, relisting", informer=self.name, error=str(e))
+                time.sleep(INFORMER_RETRY_INTERVAL)
+
+    def _relist(self) -> str:
+        result = self._list(resource_version="0")
+        with self._lock:
+            self._items = {self._key(obj): obj for obj in result.items}
+            self._generation += 1
+        self._synced.set()
+        log.info("Informer synced", informer=self.name, count=len(result.items))
+        return result.metadata.resource_version
+
 
 class KubernetesService:
-    """Kubernetes 클러스터 관리 서비스"""
+    """Kubernetes 클러스터 관리 서비스
+
+    동기 kubernetes 클라이언트 호출은 모두 _call을 거쳐 스레드에서 실행 (API 왕복 동안 이벤트 루프를 막지 않음)
+    """
 
     def __init__(self):
         """K8s 클라이언트 초기화"""
+        # 진행 중인 전체 조회 {키: Task} (동시에 들어온 같은 조회는 결과를 공유)
+        self._inflight: Dict[str, asyncio.Task] = {}
+        # 마지막 클러스터 현황 계산 결과와 당시 인포머 변경 횟수 (변화가 없으면 재계산 생략)
+        self._overview_cache: Dict[str, Any] = {"generations": None, "payload": None}
+        # 동시에 API 서버로 나가는 요청 수 제한 (asyncio.gather 팬아웃이 API 서버 스로틀링에 걸리지 않도록)
+        self._k8s_sem = asyncio.Semaphore(settings.K8S_MAX_CONCURRENCY)
+        # 오래 걸리는 Ready 대기 watch 전용 스레드 (기본 executor를 점유해 다른 K8s 호출이 밀리지 않도록)
+        self._watch_executor = ThreadPoolExecutor(
+            max_workers=settings.K8S_MAX_READY_WATCHES, thread_name_prefix="k8s-ready-watch"
+        )
         try:
             try:
                 config.load_kube_config()
@@ -31,6 +274,8 @@ class KubernetesService:
             import os
             conf = client.Configuration.get_default_copy()
             conf.verify_ssl = False
+            # 동시 호출이 기본 풀(4개)에서 연결을 기다리며 줄 서지 않도록 확장
+            conf.connection_pool_maxsize = settings.K8S_CONNECTION_POOL_MAXSIZE
 
             proxy_host = os.getenv("KUBEDEV_PROXY_HOST")
             if proxy_host:
@@ -43,10 +288,26 @@ class KubernetesService:
             log.info("SSL certificate verification disabled for Kubernetes client.")
 
             self.k8s_available = True
-            self.v1 = client.CoreV1Api()
-            self.apps_v1 = client.AppsV1Api()
-            self.networking_v1 = client.NetworkingV1Api()
-            self.custom_api = client.CustomObjectsApi()
+            # API 객체마다 ApiClient(연결 풀)를 따로 만들지 않고 하나를 공유
+            self.api_client = client.ApiClient(configuration=conf)
+            self.v1 = client.CoreV1Api(self.api_client)
+            self.apps_v1 = client.AppsV1Api(self.api_client)
+            self.networking_v1 = client.NetworkingV1Api(self.api_client)
+            self.custom_api = client.CustomObjectsApi(self.api_client)
+
+            # 대시보드 조회용 인포머 (첫 조회 시 시작)
+            self._informers = {
+                "nodes": _ResourceInformer("nodes", self.v1.list_node),
+                # 파드는 KubeDev가 만든 것만 캐시 (클러스터의 다른 워크로드 파드까지 워커마다 메모리에 두지 않음)
+                "pods": _ResourceInformer(
+                    "pods", self.v1.list_pod_for_all_namespaces, label_selector="kubdev.managed=true"
+                ),
+                "deployments": _ResourceInformer(
+                    "deployments", self.apps_v1.list_deployment_for_all_namespaces,
+                    label_selector="kubdev.managed=true"
+                ),
+                "quotas": _ResourceInformer("quotas", self.v1.list_resource_quota_for_all_namespaces),
+            }
             log.info("Kubernetes clients initialized successfully")
         except Exception as e:
             log.warning("Kubernetes config not available. Some features may not work.", error=str(e))
@@ -77,12 +338,13 @@ class KubernetesService:
         )
 
         try:
-            api_response = self.custom_api.create_namespaced_custom_object(
+            api_response = await self._call(
+                self.custom_api.create_namespaced_custom_object,
                 group=group,
                 version=version,
                 namespace=namespace,
                 plural=plural,
-                body=custom_object,
+                body=_with_user_label(custom_object),
             )
             log.info("Custom object created successfully")
             return api_response
@@ -104,15 +366,44 @@ class KubernetesService:
         if not self.k8s_available:
             raise Exception("Kubernetes cluster is not available. Please check your kubeconfig.")
 
+    async def _call(self, fn, *args, **kwargs):
+        """동기 K8s API 호출을 동시 요청 수 제한 안에서 스레드로 실행"""
+        async with self._k8s_sem:
+            return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def _single_flight(self, key: str, loader) -> Any:
+        """같은 키의 조회가 진행 중이면 새로 조회하지 않고 그 결과를 기다림"""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(loader())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 한 호출자가 취소돼도 다른 호출자가 기다리는 조회는 계속되도록 shield
+        return await asyncio.shield(task)
+
+    async def _list_from_informer(self, name: str) -> List[Any]:
+        """인포머 캐시에서 목록 조회 (아직 동기화 전이면 API 서버에서 직접 조회)"""
+        informer = self._informers[name]
+        informer.start()
+        items = informer.items()
+        if items is None:
+            items = await self._call(informer.list_now)
+        return items
+
+    # 아래 create_* 매니페스트는 client.V1* 객체 대신 API JSON 형태의 dict로 작성
+    # (모델 생성/검증 후 다시 dict로 직렬화하는 과정 없이 그대로 전송)
+
     async def create_namespace(self, namespace: str) -> bool:
         """네임스페이스 생성"""
         self._check_k8s_availability()
         log.info("Creating namespace", namespace=namespace)
         try:
-            namespace_manifest = client.V1Namespace(
-                metadata=client.V1ObjectMeta(name=namespace, labels={"kubdev.managed": "true"})
-            )
-            self.v1.create_namespace(namespace_manifest)
+            namespace_manifest = {
+                "apiVersion": "v1",
+                "kind": "Namespace",
+                "metadata": {"name": namespace, "labels": {"kubdev.managed": "true"}},
+            }
+            await self._call(self.v1.create_namespace, namespace_manifest)
             log.info("Namespace created successfully", namespace=namespace)
             return True
         except ApiException as e:
@@ -122,16 +413,31 @@ class KubernetesService:
             log.error("Failed to create namespace", namespace=namespace, error=str(e), exc_info=True)
             raise Exception(f"Failed to create namespace: {str(e)}")
 
-    async def create_resource_quota(self, namespace: str, quota_name: str, **kwargs) -> bool:
+    async def create_resource_quota(self, namespace: str, quota_name: str, cpu_limit: str, memory_limit: str,
+                                    storage_limit: str, pod_limit: int = 5) -> bool:
         """리소스 쿼터 생성"""
         self._check_k8s_availability()
-        log.info("Creating resource quota", namespace=namespace, name=quota_name, spec=kwargs)
+        # 고정 항목은 모듈 상수를 그대로 쓰고 환경마다 달라지는 값만 채움
+        # (파드는 limits만 지정해 requests가 limits와 같아지므로 requests.*도 같은 값으로 제한)
+        hard = {
+            **_QUOTA_FIXED_HARD,
+            "limits.cpu": cpu_limit,
+            "limits.memory": memory_limit,
+            "requests.cpu": cpu_limit,
+            "requests.memory": memory_limit,
+            "requests.storage": storage_limit,
+            "pods": str(pod_limit),
+        }
+        log.info("Creating resource quota", namespace=namespace, name=quota_name, spec=hard)
         try:
-            quota_manifest = client.V1ResourceQuota(
-                metadata=client.V1ObjectMeta(name=quota_name, namespace=namespace),
-                spec=client.V1ResourceQuotaSpec(hard=kwargs)
-            )
-            self.v1.create_namespaced_resource_quota(namespace, quota_manifest)
+            quota_manifest = {
+                "apiVersion": "v1",
+                "kind": "ResourceQuota",
+                "metadata": {"name": quota_name, "namespace": namespace},
+                "spec": {"hard": hard},
+            }
+            await self._call(self.v1.create_namespaced_resource_quota, namespace, quota_manifest)
+            KubernetesService.get_resource_quota_status.invalidate(namespace, quota_name)
             log.info("Resource quota created successfully", namespace=namespace, name=quota_name)
             return True
         except ApiException as e:
@@ -146,29 +452,30 @@ class KubernetesService:
         self._check_k8s_availability()
         log.info("Creating deployment", namespace=namespace, name=deployment_name, image=image)
         try:
-            env_vars = [client.V1EnvVar(name=k, value=str(v)) for k, v in kwargs.get("environment_vars", {}).items()]
-            container = client.V1Container(
-                name="dev-environment",
-                image=image,
-                ports=[client.V1ContainerPort(container_port=8080)],
-                env=env_vars,
-                resources=client.V1ResourceRequirements(
-                    limits=kwargs.get("resource_limits", {})
-                )
-            )
-            template = client.V1PodTemplateSpec(
-                metadata=client.V1ObjectMeta(labels={"app": deployment_name, "kubdev.managed": "true"}),
-                spec=client.V1PodSpec(containers=[container])
-            )
-            deployment = client.V1Deployment(
-                metadata=client.V1ObjectMeta(name=deployment_name, namespace=namespace, labels={"kubdev.managed": "true"}),
-                spec=client.V1DeploymentSpec(
-                    replicas=1,
-                    selector=client.V1LabelSelector(match_labels={"app": deployment_name}),
-                    template=template
-                )
-            )
-            self.apps_v1.create_namespaced_deployment(namespace, deployment)
+            env_vars = [{"name": k, "value": str(v)} for k, v in kwargs.get("environment_vars", {}).items()]
+            deployment = {
+                "apiVersion": "apps/v1",
+                "kind": "Deployment",
+                "metadata": {"name": deployment_name, "namespace": namespace, "labels": {"kubdev.managed": "true"}},
+                "spec": {
+                    "replicas": 1,
+                    "selector": {"matchLabels": {"app": deployment_name}},
+                    "template": {
+                        "metadata": {"labels": {"app": deployment_name, "kubdev.managed": "true"}},
+                        "spec": {
+                            "containers": [{
+                                "name": "dev-environment",
+                                "image": image,
+                                "ports": [{"containerPort": 8080}],
+                                "env": env_vars,
+                                "resources": {"limits": kwargs.get("resource_limits", {})},
+                            }],
+                        },
+                    },
+                },
+            }
+            await self._call(self.apps_v1.create_namespaced_deployment, namespace, deployment)
+            KubernetesService.get_deployment_status.invalidate(namespace, deployment_name)
             log.info("Deployment created successfully", namespace=namespace, name=deployment_name)
             return True
         except ApiException as e:
@@ -180,15 +487,17 @@ class KubernetesService:
         self._check_k8s_availability()
         log.info("Creating service", namespace=namespace, name=service_name)
         try:
-            service = client.V1Service(
-                metadata=client.V1ObjectMeta(name=service_name, namespace=namespace, labels={"kubdev.managed": "true"}),
-                spec=client.V1ServiceSpec(
-                    selector={"app": deployment_name},
-                    ports=[client.V1ServicePort(port=port, target_port=8080)],
-                    type="ClusterIP"
-                )
-            )
-            self.v1.create_namespaced_service(namespace, service)
+            service = {
+                "apiVersion": "v1",
+                "kind": "Service",
+                "metadata": {"name": service_name, "namespace": namespace, "labels": {"kubdev.managed": "true"}},
+                "spec": {
+                    "selector": {"app": deployment_name},
+                    "ports": [{"port": port, "targetPort": 8080}],
+                    "type": "ClusterIP",
+                },
+            }
+            await self._call(self.v1.create_namespaced_service, namespace, service)
             log.info("Service created successfully", namespace=namespace, name=service_name)
             return True
         except ApiException as e:
@@ -200,27 +509,32 @@ class KubernetesService:
         self._check_k8s_availability()
         log.info("Creating ingress", namespace=namespace, name=ingress_name, host=host)
         try:
-            path = client.V1HTTPIngressPath(
-                path="/",
-                path_type="Prefix",
-                backend=client.V1IngressBackend(
-                    service=client.V1IngressServiceBackend(name=service_name, port=client.V1ServiceBackendPort(number=service_port))
-                )
-            )
-            rule = client.V1IngressRule(host=host, http=client.V1HTTPIngressRuleValue(paths=[path]))
-            ingress = client.V1Ingress(
-                metadata=client.V1ObjectMeta(
-                    name=ingress_name,
-                    namespace=namespace,
-                    labels={"kubdev.managed": "true"},
-                    annotations={
+            ingress = {
+                "apiVersion": "networking.k8s.io/v1",
+                "kind": "Ingress",
+                "metadata": {
+                    "name": ingress_name,
+                    "namespace": namespace,
+                    "labels": {"kubdev.managed": "true"},
+                    "annotations": {
                         "kubernetes.io/ingress.class": "nginx",
                         "nginx.ingress.kubernetes.io/rewrite-target": "/"
-                    }
-                ),
-                spec=client.V1IngressSpec(rules=[rule])
-            )
-            self.networking_v1.create_namespaced_ingress(namespace, ingress)
+                    },
+                },
+                "spec": {
+                    "rules": [{
+                        "host": host,
+                        "http": {
+                            "paths": [{
+                                "path": "/",
+                                "pathType": "Prefix",
+                                "backend": {"service": {"name": service_name, "port": {"number": service_port}}},
+                            }],
+                        },
+                    }],
+                },
+            }
+            await self._call(self.networking_v1.create_namespaced_ingress, namespace, ingress)
             log.info("Ingress created successfully", namespace=namespace, name=ingress_name)
             return True
         except ApiException as e:
@@ -232,7 +546,8 @@ class KubernetesService:
         self._check_k8s_availability()
         log.info("Deleting deployment", namespace=namespace, name=deployment_name)
         try:
-            self.apps_v1.delete_namespaced_deployment(deployment_name, namespace)
+            await self._call(self.apps_v1.delete_namespaced_deployment, deployment_name, namespace)
+            KubernetesService.get_deployment_status.invalidate(namespace, deployment_name)
             log.info("Deployment deleted successfully", namespace=namespace, name=deployment_name)
             return True
         except ApiException as e:
@@ -247,7 +562,7 @@ class KubernetesService:
         self._check_k8s_availability()
         log.info("Deleting service", namespace=namespace, name=service_name)
         try:
-            self.v1.delete_namespaced_service(service_name, namespace)
+            await self._call(self.v1.delete_namespaced_service, service_name, namespace)
             log.info("Service deleted successfully", namespace=namespace, name=service_name)
             return True
         except ApiException as e:
@@ -257,6 +572,22 @@ class KubernetesService:
             log.error("Failed to delete service", namespace=namespace, name=service_name, error=str(e), exc_info=True)
             raise Exception(f"Failed to delete service: {str(e)}")
 
+    async def delete_ingress(self, namespace: str, ingress_name: str) -> bool:
+        """인그레스 삭제"""
+        self._check_k8s_availability()
+        log.info("Deleting ingress", namespace=namespace, name=ingress_name)
+        try:
+            await self._call(self.networking_v1.delete_namespaced_ingress, ingress_name, namespace)
+            log.info("Ingress deleted successfully", namespace=namespace, name=ingress_name)
+            return True
+        except ApiException as e:
+            if e.status == 404:
+                log.warning("Ingress not found for deletion", namespace=namespace, name=ingress_name)
+                return True
+            log.error("Failed to delete ingress", namespace=namespace, name=ingress_name, error=str(e), exc_info=True)
+            raise Exception(f"Failed to delete ingress: {str(e)}")
+
+    @_ttl_cached(K8S_READ_CACHE_TTL)
     async def get_deployment_status(self, namespace: str, deployment_name: str) -> Dict[str, Any]:
         """디플로이먼트 상태 조회"""
         try:
@@ -267,7 +598,7 @@ class KubernetesService:
 
         log.info("Getting deployment status", namespace=namespace, name=deployment_name)
         try:
-            deployment = self.apps_v1.read_namespaced_deployment(deployment_name, namespace)
+            deployment = await self._call(self.apps_v1.read_namespaced_deployment, deployment_name, namespace)
             status = {
                 "name": deployment.metadata.name,
                 "namespace": deployment.metadata.namespace,
@@ -284,6 +615,42 @@ class KubernetesService:
             log.error("Unexpected error getting deployment status", namespace=namespace, name=deployment_name, error=str(e), exc_info=True)
             return {"name": deployment_name, "namespace": namespace, "status": "Error", "ready_replicas": 0, "total_replicas": 0, "error": str(e)}
 
+    async def watch_deployment_ready(self, namespace: str, deployment_name: str, timeout: int = 300) -> bool:
+        """Deployment가 Ready가 될 때까지 watch 스트림으로 대기 (Ready면 True, 시간 초과/스트림 종료 시 False)"""
+        self._check_k8s_availability()
+        log.info("Watching deployment readiness", namespace=namespace, name=deployment_name, timeout=timeout)
+
+        # 전용 스레드가 모두 사용 중이면 대기열에서 기다린 시간도 전체 대기 시간에 포함
+        deadline = time.monotonic() + timeout
+
+        def wait_ready() -> bool:
+            # 짧은 watch를 반복 (각 watch의 첫 이벤트로 현재 상태가 오므로 이미 Ready면 바로 반환)
+            while (remaining := deadline - time.monotonic()) > 0:
+                w = watch.Watch()
+                try:
+                    for event in w.stream(
+                        self.apps_v1.list_namespaced_deployment,
+                        namespace,
+                        field_selector=f"metadata.name={deployment_name}",
+                        timeout_seconds=max(1, int(min(READY_WATCH_CHUNK, remaining)))
+                    ):
+                        deployment = event["object"]
+                        if (deployment.status.ready_replicas or 0) >= 1:
+                            return True
+                finally:
+                    w.stop()
+            return False
+
+        return await asyncio.get_running_loop().run_in_executor(self._watch_executor, wait_ready)
+
+    async def count_deployment_pods(self, namespace: str, deployment_name: str) -> int:
+        """Deployment에 속한 파드 수 (종료 중인 파드 포함)"""
+        self._check_k8s_availability()
+        pods = await self._call(
+            self.v1.list_namespaced_pod, namespace=namespace, label_selector=f"app={deployment_name}"
+        )
+        return len(pods.items)
+
     async def get_pod_logs(self, namespace: str, deployment_name: str, tail_lines: int = 100) -> List[str]:
         """파드 로그 조회"""
         try:
@@ -293,18 +660,61 @@ class KubernetesService:
             return [f"Kubernetes unavailable: {str(e)}"]
         log.info("Getting pod logs", namespace=namespace, deployment=deployment_name, lines=tail_lines)
         try:
-            pods = self.v1.list_namespaced_pod(namespace=namespace, label_selector=f"app={deployment_name}")
-            if not pods.items:
+            pod_name = await self._find_deployment_pod(namespace, deployment_name)
+            if pod_name is None:
                 log.warning("No pods found for deployment", namespace=namespace, deployment=deployment_name)
                 return [f"No pods found for deployment: {deployment_name}"]
-            pod = pods.items[0]
-            logs = self.v1.read_namespaced_pod_log(name=pod.metadata.name, namespace=namespace, tail_lines=tail_lines)
-            log.info("Pod logs retrieved successfully", namespace=namespace, pod=pod.metadata.name)
+            logs = await self._call(
+                self.v1.read_namespaced_pod_log, name=pod_name, namespace=namespace, tail_lines=tail_lines
+            )
+            log.info("Pod logs retrieved successfully", namespace=namespace, pod=pod_name)
             return logs.split('\n') if logs else []
         except ApiException as e:
             log.error("Failed to get pod logs", namespace=namespace, deployment=deployment_name, error=str(e), exc_info=True)
             return [f"Error getting logs: {str(e)}"]
 
+    async def stream_pod_logs(self, namespace: str, deployment_name: str, tail_lines: int = 100,
+                              follow: bool = False, chunk_size: int = 4096):
+        """파드 로그를 받는 대로 바이트 청크로 전달하는 async generator (전체 로그를 문자열로 모으지 않음)"""
+        try:
+            self._check_k8s_availability()
+        except Exception as e:
+            # 응답 스트림이 이미 시작된 뒤이므로 예외 대신 안내 문구 전달 (get_pod_logs와 동일)
+            yield f"Kubernetes unavailable: {str(e)}\n".encode()
+            return
+        pod_name = await self._find_deployment_pod(namespace, deployment_name)
+        if pod_name is None:
+            yield f"No pods found for deployment: {deployment_name}\n".encode()
+            return
+
+        log.info("Streaming pod logs", namespace=namespace, pod=pod_name, lines=tail_lines, follow=follow)
+        resp = await self._call(
+            self.v1.read_namespaced_pod_log, name=pod_name, namespace=namespace,
+            tail_lines=tail_lines, follow=follow, _preload_content=False
+        )
+        try:
+            # 청크 하나를 읽는 동안만 스레드 사용 (follow 스트림이 동시 호출 제한 슬롯을 잡고 있지 않도록)
+            chunks = resp.stream(chunk_size)
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            resp.close()
+            resp.release_conn()
+
+    async def _find_deployment_pod(self, namespace: str, deployment_name: str) -> Optional[str]:
+        """로그를 읽을 Deployment 파드 이름 (Running 파드 우선, 없으면 아무 파드나)"""
+        for field_selector in ("status.phase=Running", None):
+            pods = await self._call(
+                self.v1.list_namespaced_pod, namespace=namespace, label_selector=f"app={deployment_name}",
+                field_selector=field_selector, limit=1
+            )
+            if pods.items:
+                return pods.items[0].metadata.name
+        return None
+
     async def get_cluster_overview(self) -> Dict[str, Any]:
         """클러스터 전체 현황 조회"""
         try:
@@ -315,16 +725,27 @@ class KubernetesService:
 
         log.info("Getting cluster overview")
         try:
-            nodes = self.v1.list_node()
-            pods = self.v1.list_pod_for_all_namespaces()
-            ready_nodes = sum(1 for n in nodes.items for c in n.status.conditions if c.type == "Ready" and c.status == "True")
+            # 노드/파드 인포머에 변경이 없으면 이전 결과를 그대로 반환
+            generations = (self._informers["nodes"].generation, self._informers["pods"].generation)
+            if None not in generations and generations == self._overview_cache["generations"]:
+                return self._overview_cache["payload"]
+
+            nodes, pods = await asyncio.gather(
+                self._list_from_informer("nodes"),
+                self._list_from_informer("pods"),
+            )
+            ready_nodes = sum(1 for n in nodes for c in n.status.conditions if c.type == "Ready" and c.status == "True")
             overview = {
-                "total_nodes": len(nodes.items),
+                "total_nodes": len(nodes),
                 "ready_nodes": ready_nodes,
-                "total_pods": len(pods.items),
+                "total_pods": len(pods),  # KubeDev 관리 파드 수
             }
             log.info("Cluster overview retrieved", **overview)
-            return {"cluster_info": overview}
+            payload = {"cluster_info": overview}
+            if None not in generations:
+                # 계산 중 변경이 있었다면 다음 조회에서 변경 횟수가 달라 다시 계산됨
+                self._overview_cache = {"generations": generations, "payload": payload}
+            return payload
         except ApiException as e:
             log.error("Failed to get cluster overview", error=str(e), exc_info=True)
             raise Exception(f"Failed to get cluster overview: {str(e)}")
@@ -334,7 +755,10 @@ class KubernetesService:
             return {"cluster_info": {"total_nodes": 3, "ready_nodes": 2, "total_pods": 12}, "mock": True}
 
     async def get_all_environments_status(self) -> List[Dict[str, Any]]:
-        """모든 KubeDev 환경 상태 조회"""
+        """모든 KubeDev 환경 상태 조회 (동시 요청은 한 번의 조회로 합침)"""
+        return await self._single_flight("environments_status", self._load_all_environments_status)
+
+    async def _load_all_environments_status(self) -> List[Dict[str, Any]]:
         try:
             self._check_k8s_availability()
         except Exception as e:
@@ -345,14 +769,23 @@ class KubernetesService:
             ]
         log.info("Getting status for all environments")
         try:
-            deployments = self.apps_v1.list_deployment_for_all_namespaces(label_selector="kubdev.managed=true")
+            deployments, quotas = await asyncio.gather(
+                self._list_from_informer("deployments"),
+                self._list_from_informer("quotas"),
+            )
+            # 네임스페이스별 첫 ResourceQuota의 사용률은 목록에서 받은 객체로 바로 계산 (개별 재조회 없음)
+            quota_by_namespace: Dict[str, Dict[str, Any]] = {}
+            for quota in quotas:
+                if quota.metadata.namespace not in quota_by_namespace:
+                    quota_by_namespace[quota.metadata.namespace] = _quota_status_from_object(quota)
             environments = [
                 {
                     "namespace": dep.metadata.namespace,
                     "deployment": dep.metadata.name,
                     "status": "Running" if dep.status.ready_replicas else "Pending",
+                    "resource_quota": quota_by_namespace.get(dep.metadata.namespace),
                 }
-                for dep in deployments.items
+                for dep in deployments
             ]
             log.info("Retrieved status for all environments", count=len(environments))
             return environments
@@ -366,6 +799,18 @@ class KubernetesService:
                 {"namespace": "mock-ns-2", "deployment": "mock-dep-b", "status": "Pending"},
             ]
 
+    async def get_cluster_overview_cached(self) -> Dict[str, Any]:
+        """클러스터 전체 현황 조회 (대시보드 폴링용 공유 캐시)"""
+        return await cache_service.get_or_load(
+            "k8s:cluster_overview", self.get_cluster_overview, ttl=K8S_DASHBOARD_CACHE_TTL
+        )
+
+    async def get_all_environments_status_cached(self) -> List[Dict[str, Any]]:
+        """모든 KubeDev 환경 상태 조회 (대시보드 폴링용 공유 캐시)"""
+        return await cache_service.get_or_load(
+            "k8s:environments_status", self.get_all_environments_status, ttl=K8S_DASHBOARD_CACHE_TTL
+        )
+
     async def get_live_resource_metrics(self, namespace: str) -> Dict[str, Any]:
         """실시간 리소스 메트릭 조회 (메트릭 서버 필요)"""
         try:
@@ -377,7 +822,7 @@ class KubernetesService:
 
         try:
             # 해당 네임스페이스의 Pod들 조회
-            pods = self.v1.list_namespaced_pod(namespace=namespace)
+            pods = await self._call(self.v1.list_namespaced_pod, namespace=namespace)
 
             metrics_data = {
                 "namespace": namespace,
@@ -405,6 +850,7 @@ class KubernetesService:
                 "pods": []
             }
 
+    @_ttl_cached(K8S_READ_CACHE_TTL)
     async def get_resource_quota_status(self, namespace: str, quota_name: str) -> Dict[str, Any]:
         """리소스 쿼터 상태 조회"""
         try:
@@ -415,28 +861,8 @@ class KubernetesService:
         log.info("Getting resource quota status", namespace=namespace, quota_name=quota_name)
 
         try:
-            quota = self.v1.read_namespaced_resource_quota(quota_name, namespace)
-            hard = quota.status.hard or {}
-            used = quota.status.used or {}
-
-            def pct(resource):
-                if resource in hard and resource in used:
-                    try:
-                        return round((float(used[resource].strip('Mi').strip('Gi')) /
-                                      float(hard[resource].strip('Mi').strip('Gi'))) * 100, 2)
-                    except Exception:
-                        return None
-                return None
-
-            return {
-                "status": "available",
-                "hard": hard,
-                "used": used,
-                "utilization": {
-                    "cpu_percent": pct("cpu"),
-                    "memory_percent": pct("memory")
-                }
-            }
+            quota = await self._call(self.v1.read_namespaced_resource_quota, quota_name, namespace)
+            return _quota_status_from_object(quota)
         except ApiException as e:
             if e.status == 404:
                 return {"status": "not_found"}
@@ -455,7 +881,8 @@ class KubernetesService:
 
         try:
             # 현재 Deployment 조회
-            deployment = self.apps_v1.read_namespaced_deployment(
+            deployment = await self._call(
+                self.apps_v1.read_namespaced_deployment,
                 name=deployment_name,
                 namespace=namespace
             )
@@ -464,12 +891,14 @@ class KubernetesService:
             deployment.spec.replicas = replicas
 
             # Deployment 업데이트
-            self.apps_v1.patch_namespaced_deployment(
+            await self._call(
+                self.apps_v1.patch_namespaced_deployment,
                 name=deployment_name,
                 namespace=namespace,
                 body=deployment
             )
 
+            KubernetesService.get_deployment_status.invalidate(namespace, deployment_name)
             log.info("Deployment scaled successfully", namespace=namespace, deployment=deployment_name, replicas=replicas)
             return True
 
@@ -487,7 +916,7 @@ class KubernetesService:
 
         try:
             # 네임스페이스 삭제 (모든 리소스가 함께 삭제됨)
-            self.v1.delete_namespace(name=namespace)
+            await self._call(self.v1.delete_namespace, name=namespace)
             log.info("Namespace deleted successfully", namespace=namespace)
             return True
 
@@ -523,12 +952,13 @@ class KubernetesService:
                 # 다른 종류의 CRD를 위한 간단한 복수형 추론 규칙
                 plural = f"{kind.lower()}s"
 
-            api_response = self.custom_api.create_namespaced_custom_object(
+            api_response = await self._call(
+                self.custom_api.create_namespaced_custom_object,
                 group=group,
                 version=version,
                 namespace=namespace,
                 plural=plural,
-                body=custom_object,
+                body=_with_user_label(custom_object),
             )
             log.info("Custom object created successfully", kind=kind, name=name)
             return api_response
@@ -554,7 +984,8 @@ class KubernetesService:
         log.info("Getting custom object", group=group, version=version, namespace=namespace, plural=plural, name=name)
 
         try:
-            api_response = self.custom_api.get_namespaced_custom_object(
+            api_response = await self._call(
+                self.custom_api.get_namespaced_custom_object,
                 group=group,
                 version=version,
                 namespace=namespace,
@@ -582,7 +1013,7 @@ class KubernetesService:
         self._check_k8s_availability()
         try:
             # Get service to extract port information
-            service = self.v1.read_namespaced_service(service_name, namespace)
+            service = await self._call(self.v1.read_namespaced_service, service_name, namespace)
 
             # Get first port
             if not service.spec.ports or len(service.spec.ports) == 0:
@@ -597,25 +1028,20 @@ class KubernetesService:
                 log.info("Generated NodePort URL", service=service_name, namespace=namespace, url=url, node_port=node_port)
                 return url
             else:
-                # For ClusterIP services on Minikube, use minikube service to get the URL
-                log.info("ClusterIP service found - attempting minikube service URL", service=service_name, namespace=namespace, service_type=service.spec.type)
-                try:
-                    import subprocess
-                    # Get minikube service URL
-                    cmd = ["minikube", "service", service_name, "-n", namespace, "--url"]
-                    result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
-
-                    if result.returncode == 0 and result.stdout.strip():
-                        url = result.stdout.strip().split('\n')[0]  # Get first URL if multiple
-                        log.info("Got minikube service URL", service=service_name, namespace=namespace, url=url)
-                        return url
-                    else:
-                        log.warning("Failed to get minikube service URL", service=service_name, namespace=namespace,
-                                  stderr=result.stderr, returncode=result.returncode)
-                        return None
-                except Exception as e:
-                    log.warning("Failed to execute minikube service command", service=service_name, namespace=namespace, error=str(e))
+                # For ClusterIP/LoadBalancer services on Minikube, resolve <node InternalIP>:<nodePort>
+                # in-process (same result as `minikube service --url`, without spawning a process)
+                log.info("Non-NodePort service found - resolving node URL", service=service_name, namespace=namespace, service_type=service.spec.type)
+                node_port = service.spec.ports[0].node_port
+                if not node_port:
+                    log.warning("Service has no node port allocated", service=service_name, namespace=namespace)
+                    return None
+                node_ip = await self.get_first_node_internal_ip()
+                if not node_ip:
+                    log.warning("Failed to resolve node InternalIP", service=service_name, namespace=namespace)
                     return None
+                url = f"http://{node_ip}:{node_port}"
+                log.info("Generated node URL", service=service_name, namespace=namespace, url=url)
+                return url
 
         except ApiException as e:
             log.warning("Failed to get service URL", service=service_name, namespace=namespace, error=str(e))
@@ -624,34 +1050,39 @@ class KubernetesService:
             log.warning("Unexpected error getting service URL", service=service_name, namespace=namespace, error=str(e))
             return None
 
+    async def get_first_node_internal_ip(self) -> Optional[str]:
+        """첫 번째 노드의 InternalIP 조회 (TTL 캐시)"""
+        global _node_ip_cache
+        self._check_k8s_availability()
+        if _node_ip_cache and time.monotonic() - _node_ip_cache[0] < NODE_IP_CACHE_TTL:
+            return _node_ip_cache[1]
+
+        async with _node_ip_lock:
+            # 대기 중 다른 요청이 이미 갱신했으면 재사용
+            if _node_ip_cache and time.monotonic() - _node_ip_cache[0] < NODE_IP_CACHE_TTL:
+                return _node_ip_cache[1]
+            try:
+                # 노드 IP만 필요하므로 etcd 대신 API 서버 watch 캐시에서 조회
+                nodes = await self._call(self.v1.list_node, resource_version="0")
+            except ApiException as e:
+                log.warning("Failed to list nodes", error=str(e))
+                return None
+            for node in nodes.items:
+                for address in (node.status.addresses or []):
+                    if address.type == "InternalIP":
+                        _node_ip_cache = (time.monotonic(), address.address)
+                        return address.address
+            return None
+
     def _cpu_to_millicores(self, raw: Optional[str]) -> Optional[int]:
         """Convert CPU quantity to millicores"""
-        if not raw:
-            return None
-        try:
-            if raw.endswith("m"):
-                return int(raw[:-1])
-            return int(float(raw) * 1000)
-        except Exception:
-            return None
+        cores = _parse_quantity(raw)
+        return round(cores * 1000) if cores is not None else None
 
     def _memory_to_mb(self, raw: Optional[str]) -> Optional[float]:
         """Convert memory quantity to MB"""
-        if not raw:
-            return None
-        try:
-            value = raw.lower()
-            if value.endswith("ki"):
-                return round(float(value[:-2]) / 1024, 2)
-            if value.endswith("mi"):
-                return float(value[:-2])
-            if value.endswith("gi"):
-                return float(value[:-2]) * 1024
-            if value.endswith("ti"):
-                return float(value[:-2]) * 1024 * 1024
-            return float(value) / (1024 * 1024)
-        except Exception:
-            return None
+        size = _parse_quantity(raw)
+        return round(size / (1024 * 1024), 2) if size is not None else None
 
     async def list_managed_pods(self, label_selector: str = "kubdev.managed=true") -> List[Dict[str, Any]]:
         """List pods managed by the platform across namespaces"""
@@ -687,7 +1118,7 @@ class KubernetesService:
         log.info("Listing managed pods", label_selector=label_selector)
 
         try:
-            pods = self.v1.list_pod_for_all_namespaces(label_selector=label_selector)
+            pods = await self._call(self.v1.list_pod_for_all_namespaces, label_selector=label_selector)
             pod_list = []
             for pod in pods.items:
                 container_statuses = pod.status.container_statuses or []
@@ -745,7 +1176,8 @@ class KubernetesService:
             log.warning("Kubernetes unavailable, returning empty pod metrics", namespace=namespace, error=str(e))
             return {}
         try:
-            metrics = self.custom_api.list_namespaced_custom_object(
+            metrics = await self._call(
+                self.custom_api.list_namespaced_custom_object,
                 group="metrics.k8s.io",
                 version="v1beta1",
                 namespace=namespace,
@@ -794,7 +1226,7 @@ class KubernetesService:
                 }
             ]
         try:
-            events = self.v1.list_namespaced_event(namespace=namespace)
+            events = await self._call(self.v1.list_namespaced_event, namespace=namespace)
         except ApiException as e:
             log.error("Failed to list namespace events", namespace=namespace, error=str(e), exc_info=True)
             return []
@@ -813,10 +1245,10 @@ class KubernetesService:
                 }
             ]
 
-        event_items = []
-        for ev in events.items:
-            ts = ev.last_timestamp or ev.event_time or ev.first_timestamp or ev.metadata.creation_timestamp
-            event_items.append({
+        # 전체 정렬 대신 최근 limit개만 선택하고, 선택된 이벤트만 dict로 변환
+        recent = heapq.nlargest(limit, events.items, key=_event_sort_key)
+        return [
+            {
                 "name": ev.metadata.name,
                 "reason": ev.reason,
                 "message": ev.message,
@@ -824,11 +1256,10 @@ class KubernetesService:
                 "count": ev.count,
                 "involved_object": ev.involved_object.name if ev.involved_object else None,
                 "kind": ev.involved_object.kind if ev.involved_object else None,
-                "timestamp": ts.isoformat() if ts else None,
-            })
-
-        event_items = sorted(event_items, key=lambda e: e.get("timestamp") or "", reverse=True)
-        return event_items[:limit]
+                "timestamp": _event_timestamp(ev),
+            }
+            for ev in recent
+        ]
 
     async def get_recent_events(self, namespaces: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """Return recent events across namespaces (filtered)"""
@@ -851,7 +1282,7 @@ class KubernetesService:
                 }
             ]
         try:
-            events = self.v1.list_event_for_all_namespaces()
+            events = await self._call(self.v1.list_event_for_all_namespaces)
         except ApiException as e:
             log.error("Failed to list cluster events", error=str(e), exc_info=True)
             return []
@@ -872,12 +1303,15 @@ class KubernetesService:
                 }
             ]
 
-        event_items = []
-        for ev in events.items:
-            if namespaces and ev.metadata.namespace not in namespaces:
-                continue
-            ts = ev.last_timestamp or ev.event_time or ev.first_timestamp or ev.metadata.creation_timestamp
-            event_items.append({
+        event_list = events.items
+        if namespaces:
+            namespace_set = set(namespaces)
+            event_list = [ev for ev in event_list if ev.metadata.namespace in namespace_set]
+
+        # 전체 정렬 대신 최근 limit개만 선택하고, 선택된 이벤트만 dict로 변환
+        recent = heapq.nlargest(limit, event_list, key=_event_sort_key)
+        return [
+            {
                 "namespace": ev.metadata.namespace,
                 "name": ev.metadata.name,
                 "reason": ev.reason,
@@ -886,11 +1320,10 @@ class KubernetesService:
                 "count": ev.count,
                 "involved_object": ev.involved_object.name if ev.involved_object else None,
                 "kind": ev.involved_object.kind if ev.involved_object else None,
-                "timestamp": ts.isoformat() if ts else None,
-            })
-
-        event_items = sorted(event_items, key=lambda e: e.get("timestamp") or "", reverse=True)
-        return event_items[:limit]
+                "timestamp": _event_timestamp(ev),
+            }
+            for ev in recent
+        ]
 
     async def stream_pod_snapshots(self, label_selector: str = "kubdev.managed=true", interval_seconds: int = 5):
         """Async generator yielding pod snapshots for SSE-style streaming"""
@@ -902,3 +1335,15 @@ class KubernetesService:
                 "timestamp": datetime.utcnow().isoformat()
             }
             await asyncio.sleep(interval_seconds)
+
+
+# 공유 인스턴스 (요청마다 kubeconfig 로드/클라이언트 생성 방지)
+_k8s_service: Optional[KubernetesService] = None
+
+
+def get_kubernetes_service() -> KubernetesService:
+    """공유 KubernetesService 반환 (클러스터 연결 실패 상태면 다음 호출에서 재연결 시도)"""
+    global _k8s_service
+    if _k8s_service is None or not _k8s_service.k8s_available:
+        _k8s_service = KubernetesService()
+    return _k8s_service
@@ -0,0 +1,87 @@
+"""
+User Service
+접속 코드 기반 사용자 생성 공통 로직
+"""
+
+from typing import Optional, Tuple
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.security import generate_access_code
+from app.models.user import User, UserRole
+import logging
+
+logger = logging.getLogger(__name__)
+
+# 접속 코드 충돌 시 재시도 횟수
+ACCESS_CODE_MAX_ATTEMPTS = 10
+
+
+class AccessCodeGenerationError(Exception):
+    """고유한 접속 코드를 생성하지 못한 경우"""
+
+
+def _is_access_code_conflict(e: IntegrityError) -> bool:
+    return "hashed_password" in str(e.orig)
+
+
+async def create_user_with_code(
+    db: AsyncSession,
+    *,
+    name: str,
+    role: UserRole,
+    created_by: Optional[int] = None
+) -> Tuple[User, str]:
+    """
+    5자리 접속 코드로 사용자 생성 (커밋은 호출자가 수행)
+    미리 중복 조회하지 않고 UNIQUE 제약 위반 시에만 SAVEPOINT를 되돌리고 코드를 다시 생성
+    """
+    for _ in range(ACCESS_CODE_MAX_ATTEMPTS):
+        access_code = generate_access_code(length=5)
+        try:
+            async with db.begin_nested():
+                # INSERT ... RETURNING으로 서버 기본값(created_at)까지 한 번에 조회
+                new_user = await db.scalar(
+                    insert(User).values(
+                        hashed_password=access_code, name=name, role=role,
+                        is_active=True, created_by=created_by
+                    ).returning(User)
+                )
+        except IntegrityError as e:
+            if not _is_access_code_conflict(e):
+                raise
+            continue
+        return new_user, access_code
+
+    logger.error("Failed to generate unique access code after multiple attempts")
+    raise AccessCodeGenerationError("Failed to generate unique access code")
+
+
+def create_user_with_code_sync(
+    db: Session,
+    *,
+    name: str,
+    role: UserRole,
+    created_by: Optional[int] = None
+) -> Tuple[User, str]:
+    """create_user_with_code의 동기 세션 버전 (커밋은 호출자가 수행)"""
+    for _ in range(ACCESS_CODE_MAX_ATTEMPTS):
+        access_code = generate_access_code(length=5)
+        try:
+            with db.begin_nested():
+                new_user = db.scalar(
+                    insert(User).values(
+                        hashed_password=access_code, name=name, role=role,
+                        is_active=True, created_by=created_by
+                    ).returning(User)
+                )
+        except IntegrityError as e:
+            if not _is_access_code_conflict(e):
+                raise
+            continue
+        return new_user, access_code
+
+    logger.error("Failed to generate unique access code after multiple attempts")
+    raise AccessCodeGenerationError("Failed to generate unique access code")
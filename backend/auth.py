@@ -1,5 +1,5 @@
 from fastapi import Header, HTTPException
-from typing import Optional
+from typing import Mapping, Optional
 
 DEV_API_KEYS = {
     "admin-key-123": {"role": "admin", "user": {"id": 1, "name": "admin"}},
@@ -7,25 +7,29 @@ DEV_API_KEYS = {
     "test-key-789": {"role": "test", "user": {"id": 3, "name": "test"}},
 }
 
+# Resolved user dicts built once at import; callers must treat them as read-only
+_RESOLVED_USERS = {token: {**info["user"], "role": info["role"]} for token, info in DEV_API_KEYS.items()}
+_DEV_USER = {"id": 2, "name": "dev", "role": "dev"}
 
-async def get_current_user(authorization: Optional[str] = Header(None)):
+
+async def get_current_user(authorization: Optional[str] = Header(None)) -> Mapping:
     # Development convenience: if no Authorization, act as dev user
     if not authorization:
-        return {"id": 2, "name": "dev", "role": "dev"}
-
-    try:
-        scheme, token = authorization.split(" ", 1)
-    except ValueError:
-        raise HTTPException(status_code=401, detail="Invalid Authorization header")
-
-    if scheme.lower() != "bearer":
-        raise HTTPException(status_code=401, detail="Invalid auth scheme")
-
-    info = DEV_API_KEYS.get(token)
-    if not info:
+        return _DEV_USER
+
+    # Common case: exact "Bearer <token>" prefix, no split/try needed
+    if authorization.startswith("Bearer "):
+        token = authorization[7:]
+    else:
+        try:
+            scheme, token = authorization.split(" ", 1)
+        except ValueError:
+            raise HTTPException(status_code=401, detail="Invalid Authorization header")
+
+        if scheme.lower() != "bearer":
+            raise HTTPException(status_code=401, detail="Invalid auth scheme")
+
+    user = _RESOLVED_USERS.get(token)
+    if user is None:
         raise HTTPException(status_code=401, detail="Invalid API key")
-
-    user = info["user"].copy()
-    user["role"] = info["role"]
     return user
-
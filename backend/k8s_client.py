@@ -1,26 +1,277 @@
+import logging
 import os
-from typing import Dict, Any, List
-from kubernetes import client, config
-import datetime
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, Any, Final, List, Optional, Tuple
+from kubernetes import client, config, watch
 
+log = logging.getLogger(__name__)
 
-def load_kube():
+
+_API_CLIENT: Optional[client.ApiClient] = None
+_API_CLIENT_LOCK = threading.Lock()
+
+# urllib3 pool size for the shared ApiClient (the client default of 4 makes concurrent requests queue)
+POOL_MAXSIZE = int(os.getenv("KUBEDEV_K8S_POOL_MAXSIZE", "0")) or max(10, (os.cpu_count() or 4) * 5)
+
+
+@lru_cache(maxsize=1)
+def load_kube() -> bool:
+    # kubeconfig is resolved once per process; only "no usable config" is tolerated,
+    # anything else (e.g. a malformed kubeconfig) surfaces immediately
     try:
         config.load_incluster_config()
-    except Exception:
+    except config.ConfigException:
         try:
             config.load_kube_config()
-        except Exception:
-            pass
+        except config.ConfigException as e:
+            log.warning("No Kubernetes config found, using client defaults: %s", e)
+            return False
+    return True
+
+
+def _api_client() -> client.ApiClient:
+    # One ApiClient (and urllib3 pool) shared by every API object in this module
+    global _API_CLIENT
+    if _API_CLIENT is None:
+        with _API_CLIENT_LOCK:
+            if _API_CLIENT is None:
+                load_kube()
+                cfg = client.Configuration.get_default_copy()
+                cfg.connection_pool_maxsize = POOL_MAXSIZE
+                _API_CLIENT = client.ApiClient(configuration=cfg)
+    return _API_CLIENT
+
+
+# API wrappers are stateless on top of the shared ApiClient, so build each one once
+@lru_cache(maxsize=None)
+def _custom() -> client.CustomObjectsApi:
+    return client.CustomObjectsApi(_api_client())
+
+
+@lru_cache(maxsize=None)
+def _apps() -> client.AppsV1Api:
+    return client.AppsV1Api(_api_client())
+
+
+@lru_cache(maxsize=None)
+def _core() -> client.CoreV1Api:
+    return client.CoreV1Api(_api_client())
+
+
+# KubeDevEnvironment CRD coordinates
+_GROUP: Final = "kubedev.my-project.com"
+_VERSION: Final = "v1alpha1"
+_PLURAL: Final = "kubedevenvironments"
+_API_VERSION: Final = f"{_GROUP}/{_VERSION}"
+
+# Mock mode for local tests without a cluster (read once at import)
+_MOCK = os.getenv("KUBEDEV_MOCK", "").lower() in ("1", "true", "yes")
+
+# Label on each CR identifying its owner, used for server-side filtering
+USER_LABEL = "kubedev.io/user"
+_LABEL_INVALID = re.compile(r'[^a-z0-9-]')
+
+
+def user_label_value(user_name: str) -> str:
+    return _LABEL_INVALID.sub('-', user_name.lower())[:63].strip('-')
+
+
+# (epoch second, formatted timestamp) of the last mock creationTimestamp
+_last_ts: Tuple[int, str] = (0, "")
+
+
+def _iso_now() -> str:
+    # Kubernetes-style UTC timestamp (second precision), formatted at most once per second
+    global _last_ts
+    now = time.time_ns() // 1_000_000_000
+    if now != _last_ts[0]:
+        _last_ts = (now, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now)))
+    return _last_ts[1]
+
+
+# Watch timeout per request (seconds); the watch resumes from the last seen resourceVersion
+INFORMER_WATCH_TIMEOUT = 300
+# Delay before relisting after a watch error (seconds)
+INFORMER_RETRY_INTERVAL = 5.0
+# Page size for LIST calls
+LIST_PAGE_SIZE = 500
+_EQUALITY_SELECTOR = re.compile(r'^\s*([^=!\s]+)\s*(==|=|!=)\s*([^=!\s]*)\s*$')
+_EXISTENCE_SELECTOR = re.compile(r'^\s*(!?)\s*([^=!\s()]+)\s*$')
+
+
+def _parse_selector(label_selector: Optional[str]) -> Optional[List[Tuple[str, bool, Optional[str]]]]:
+    # Equality ("k=v", "k!=v") and existence ("k", "!k") terms -> [(key, positive, value or None)];
+    # None means "cannot evaluate locally"
+    terms = []
+    for term in (label_selector or '').split(','):
+        if not term.strip():
+            continue
+        m = _EQUALITY_SELECTOR.match(term)
+        if m:
+            key, op, value = m.groups()
+            terms.append((key, op != '!=', value))
+            continue
+        m = _EXISTENCE_SELECTOR.match(term)
+        if not m:
+            return None
+        negated, key = m.groups()
+        terms.append((key, not negated, None))
+    return terms
+
+
+def _labels_match(labels: Dict[str, str], terms: List[Tuple[str, bool, Optional[str]]]) -> bool:
+    return all(
+        ((key in labels) if value is None else (labels.get(key) == value)) == positive
+        for key, positive, value in terms
+    )
+
+
+def _list_all(co: client.CustomObjectsApi, namespace: str, **kwargs) -> Tuple[List[Dict[str, Any]], str]:
+    # Paginated LIST; the first page is served from the apiserver watch cache (resourceVersion=0),
+    # follow-up pages only carry the continue token (the server rejects resourceVersion with it)
+    items: List[Dict[str, Any]] = []
+    page = co.list_namespaced_custom_object(
+        _GROUP, _VERSION, namespace, _PLURAL, limit=LIST_PAGE_SIZE,
+        resource_version="0", resource_version_match="NotOlderThan", **kwargs
+    )
+    resource_version = page['metadata'].get('resourceVersion', '')
+    while True:
+        items.extend(page.get('items', []))
+        cont = page['metadata'].get('continue')
+        if not cont:
+            return items, resource_version
+        page = co.list_namespaced_custom_object(
+            _GROUP, _VERSION, namespace, _PLURAL, limit=LIST_PAGE_SIZE, _continue=cont, **kwargs
+        )
+
+
+class KubeDevInformer:
+    """In-memory KubeDevEnvironment cache for one namespace, kept current by LIST + WATCH"""
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._store: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._synced = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name=f"kubedev-informer-{self.namespace}", daemon=True
+                )
+                self._thread.start()
+
+    @property
+    def synced(self) -> bool:
+        return self._synced.is_set()
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        # While the watch is down the store may be stale; callers fall back to the apiserver
+        if not self.synced:
+            return None
+        return self._store.get((self.namespace, name))
+
+    def list(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self._store.values())
+
+    def put(self, obj: Dict[str, Any]) -> None:
+        # Write-through from our own create; older versions never replace newer ones
+        key = (self.namespace, obj['metadata']['name'])
+        with self._lock:
+            current = self._store.get(key)
+            if current is None or _newer_or_equal(obj, current):
+                self._store[key] = obj
+
+    def discard(self, name: str) -> None:
+        with self._lock:
+            self._store.pop((self.namespace, name), None)
+
+    def _run(self) -> None:
+        co = _custom()
+        while True:
+            try:
+                resource_version = self._relist(co)
+                while True:
+                    w = watch.Watch()
+                    for event in w.stream(
+                        co.list_namespaced_custom_object, _GROUP, _VERSION, self.namespace, _PLURAL,
+                        resource_version=resource_version, allow_watch_bookmarks=True,
+                        timeout_seconds=INFORMER_WATCH_TIMEOUT,
+                    ):
+                        obj = event['raw_object']
+                        resource_version = obj.get('metadata', {}).get('resourceVersion') or resource_version
+                        if event['type'] == 'BOOKMARK':
+                            continue
+                        key = (self.namespace, obj['metadata']['name'])
+                        with self._lock:
+                            if event['type'] == 'DELETED':
+                                self._store.pop(key, None)
+                            else:
+                                self._store[key] = obj
+            except Exception as e:
+                # 410 Gone and connection errors alike: serve direct API calls until the relist succeeds
+                self._synced.clear()
+                log.warning("KubeDevEnvironment watch failed, relisting: %s", e)
+                time.sleep(INFORMER_RETRY_INTERVAL)
+
+    def _relist(self, co: client.CustomObjectsApi) -> str:
+        items, resource_version = _list_all(co, self.namespace)
+        with self._lock:
+            self._store = {(self.namespace, it['metadata']['name']): it for it in items}
+        self._synced.set()
+        return resource_version
+
+
+def _newer_or_equal(a: Dict[str, Any], b: Dict[str, Any]) -> bool:
+    try:
+        return int(a['metadata']['resourceVersion']) >= int(b['metadata']['resourceVersion'])
+    except (KeyError, TypeError, ValueError):
+        return True
+
+
+_INFORMERS: Dict[str, KubeDevInformer] = {}
+_INFORMERS_LOCK = threading.Lock()
+
+
+def _informer(namespace: str) -> KubeDevInformer:
+    # Started lazily on the first read of a namespace (never in mock mode, where there is no
+    # apiserver to list from; the informer then stays unsynced and reads go to the API directly)
+    informer = _INFORMERS.get(namespace)
+    if informer is None:
+        with _INFORMERS_LOCK:
+            informer = _INFORMERS.get(namespace)
+            if informer is None:
+                informer = KubeDevInformer(namespace)
+                _INFORMERS[namespace] = informer
+    if not _MOCK:
+        informer.start()
+    return informer
+
+
+# Recent 404s from the apiserver {(namespace, name): expiry} so polling of a missing CR
+# does not reach the apiserver on every request
+NOT_FOUND_TTL = 1.0
+NOT_FOUND_MAXSIZE = 1024
+_NOT_FOUND: Dict[Tuple[str, str], float] = {}
 
 
 def create_kubedev_environment(name: str, namespace: str, spec: Dict[str, Any]) -> Dict[str, Any]:
-    # Mock mode for local tests without a cluster
-    if os.getenv("KUBEDEV_MOCK", "").lower() in ("1", "true", "yes"):
+    if _MOCK:
         return {
-            "apiVersion": "kubedev.my-project.com/v1alpha1",
+            "apiVersion": _API_VERSION,
             "kind": "KubeDevEnvironment",
-            "metadata": {"name": name, "namespace": namespace, "creationTimestamp": datetime.datetime.utcnow().isoformat() + "Z"},
+            "metadata": {
+                "name": name,
+                "namespace": namespace,
+                "labels": {USER_LABEL: user_label_value(spec.get('userName', ''))},
+                "creationTimestamp": _iso_now(),
+            },
             "spec": spec,
             "status": {
                 "phase": "Pending",
@@ -30,52 +281,69 @@ def create_kubedev_environment(name: str, namespace: str, spec: Dict[str, Any])
             },
         }
 
-    load_kube()
-    co = client.CustomObjectsApi()
-    group = "kubedev.my-project.com"
-    version = "v1alpha1"
-    plural = "kubedevenvironments"
+    co = _custom()
     body = {
-        "apiVersion": f"{group}/{version}",
+        "apiVersion": _API_VERSION,
         "kind": "KubeDevEnvironment",
-        "metadata": {"name": name, "namespace": namespace},
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": {USER_LABEL: user_label_value(spec.get('userName', ''))},
+        },
         "spec": spec,
     }
-    created = co.create_namespaced_custom_object(group, version, namespace, plural, body)
+    created = co.create_namespaced_custom_object(_GROUP, _VERSION, namespace, _PLURAL, body)
+    # Make the new CR visible to cached reads before its watch event arrives
+    _informer(namespace).put(created)
+    _NOT_FOUND.pop((namespace, name), None)
     return created
 
 
 def get_kubedev_environment(name: str, namespace: str) -> Dict[str, Any]:
-    load_kube()
-    co = client.CustomObjectsApi()
-    group = "kubedev.my-project.com"
-    version = "v1alpha1"
-    plural = "kubedevenvironments"
-    return co.get_namespaced_custom_object(group, version, namespace, plural, name)
+    cached = _informer(namespace).get(name)
+    if cached is not None:
+        return cached
+    # Cache miss or not yet synced: ask the apiserver (raises 404 if the CR really is gone)
+    key = (namespace, name)
+    expiry = _NOT_FOUND.get(key)
+    if expiry is not None and expiry > time.monotonic():
+        raise client.exceptions.ApiException(status=404, reason="Not Found")
+    co = _custom()
+    try:
+        return co.get_namespaced_custom_object(_GROUP, _VERSION, namespace, _PLURAL, name)
+    except client.exceptions.ApiException as e:
+        if e.status == 404:
+            if len(_NOT_FOUND) >= NOT_FOUND_MAXSIZE:
+                _NOT_FOUND.clear()
+            _NOT_FOUND[key] = time.monotonic() + NOT_FOUND_TTL
+        raise
+
 
+def list_kubedev_environments(namespace: str, label_selector: Optional[str] = None) -> List[Dict[str, Any]]:
+    informer = _informer(namespace)
+    terms = _parse_selector(label_selector)
+    if informer.synced and terms is not None:
+        return [
+            it for it in informer.list()
+            if _labels_match(it['metadata'].get('labels') or {}, terms)
+        ]
 
-def list_kubedev_environments(namespace: str) -> List[Dict[str, Any]]:
-    load_kube()
-    co = client.CustomObjectsApi()
-    group = "kubedev.my-project.com"
-    version = "v1alpha1"
-    plural = "kubedevenvironments"
-    items = co.list_namespaced_custom_object(group, version, namespace, plural)
-    return items.get('items', [])
+    co = _custom()
+    if label_selector:
+        items, _ = _list_all(co, namespace, label_selector=label_selector)
+    else:
+        items, _ = _list_all(co, namespace)
+    return items
 
 
 def delete_kubedev_environment(name: str, namespace: str) -> None:
-    load_kube()
-    co = client.CustomObjectsApi()
-    group = "kubedev.my-project.com"
-    version = "v1alpha1"
-    plural = "kubedevenvironments"
-    co.delete_namespaced_custom_object(group, version, namespace, plural, name)
+    co = _custom()
+    co.delete_namespaced_custom_object(_GROUP, _VERSION, namespace, _PLURAL, name)
+    _informer(namespace).discard(name)
 
 
 def scale_deployment(namespace: str, name: str, replicas: int) -> None:
-    load_kube()
-    apps = client.AppsV1Api()
+    apps = _apps()
     # Patch the scale subresource
     body = {"spec": {"replicas": replicas}}
     try:
@@ -86,8 +354,7 @@ def scale_deployment(namespace: str, name: str, replicas: int) -> None:
 
 
 def delete_namespace(name: str) -> None:
-    load_kube()
-    core = client.CoreV1Api()
+    core = _core()
     try:
         core.delete_namespace(name)
     except client.exceptions.ApiException as e:
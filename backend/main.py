@@ -8,6 +8,7 @@ import asyncio
 
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 
 # Setup logging first
 logging.basicConfig(
@@ -44,7 +45,7 @@ except Exception as e:
 
 try:
     logger.info("Importing database modules...")
-    from app.core.database import check_database_connection, create_all_tables, SessionLocal
+    from app.core.database import check_database_connection, create_all_tables, dispose_engines, SessionLocal
     logger.info("Database modules imported successfully")
 except Exception as e:
     logger.error(f"Failed to import database modules: {e}")
@@ -62,7 +63,7 @@ except Exception as e:
 
 # 환경 서비스는 초기화 시점에 DB 세션이 필요하므로 지연 임포트 대신 전역에서 로드
 from sqlalchemy.orm import Session
-from app.services.environment_service import EnvironmentService
+from app.services.environment_service import EnvironmentService, rollup_recent_metrics
 
 # 데이터베이스 테이블 생성 (개발 환경)
 try:
@@ -79,7 +80,8 @@ app = FastAPI(
     description="Kubernetes 기반 자동 개발 환경 프로비저닝 시스템",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=ORJSONResponse
 )
 
 
@@ -128,8 +130,8 @@ async def health_check():
 
         # K8s 클러스터 연결 확인
         try:
-            from app.services.kubernetes_service import KubernetesService
-            k8s_service = KubernetesService()
+            from app.services.kubernetes_service import get_kubernetes_service
+            k8s_service = get_kubernetes_service()
             cluster_info = await k8s_service.get_cluster_overview()
             if cluster_info:
                 health_status["kubernetes"] = "connected"
@@ -172,6 +174,19 @@ if __name__ == "__main__":
     uvicorn.run(app, host=host, port=port)
 
 
+def _rollup_metrics() -> None:
+    """대시보드 요약용 5분 단위 집계 갱신 (스레드에서 실행하므로 전용 세션 사용)"""
+    db: Session = SessionLocal()
+    try:
+        rollup_recent_metrics(db)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 async def metrics_refresher_loop(interval_seconds: int = 30):
     """주기적으로 모든 환경의 메트릭을 수집하여 DB에 저장"""
     while True:
@@ -179,6 +194,9 @@ async def metrics_refresher_loop(interval_seconds: int = 30):
             db: Session = SessionLocal()
             service = EnvironmentService(db)
             await service.refresh_environment_metrics()
+
+            # 집계 upsert가 이벤트 루프를 막지 않도록 스레드에서 실행
+            await asyncio.to_thread(_rollup_metrics)
         except Exception as e:
             logger.error("Metrics refresher loop error", error=str(e))
         finally:
@@ -193,3 +211,13 @@ async def metrics_refresher_loop(interval_seconds: int = 30):
 async def start_background_tasks():
     asyncio.create_task(metrics_refresher_loop(interval_seconds=30))
 
+    # 사용자 생성 시 첫 요청이 파일 IO를 기다리지 않도록 템플릿 YAML 미리 로드
+    from app.api.endpoints.user import preload_template_yamls
+    await preload_template_yamls()
+
+
+@app.on_event("shutdown")
+async def close_database_pools():
+    # 풀에 남은 DB 연결을 정상 종료
+    await dispose_engines()
+
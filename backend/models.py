@@ -1,21 +1,40 @@
-from typing import List, Optional, Literal
-from pydantic import BaseModel, Field, HttpUrl
+import re
+from typing import Annotated, List, Optional, Literal
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, StringConstraints
 
 
-class GitSpec(BaseModel):
-    repoUrl: HttpUrl
+_URL_RE = re.compile(r"\Ahttps?://[^\s/$.?#][^\s]*\Z", re.IGNORECASE)
+
+
+def _validate_url(v: str) -> str:
+    if not _URL_RE.match(v):
+        raise ValueError("must be an http(s) URL")
+    return v
+
+
+# Plain-str http(s) URL: a regex check instead of building a pydantic Url object per request
+HttpUrlStr = Annotated[str, StringConstraints(max_length=2048), AfterValidator(_validate_url)]
+
+
+class _Model(BaseModel):
+    # Request/response payloads are built once and never mutated
+    model_config = ConfigDict(extra="ignore", frozen=True)
+
+
+class GitSpec(_Model):
+    repoUrl: HttpUrlStr
     ref: Optional[str] = None
 
 
-class Commands(BaseModel):
+class Commands(_Model):
     init: Optional[str] = None
     start: Optional[str] = None
 
 
-class WorkspaceCreateRequest(BaseModel):
+class WorkspaceCreateRequest(_Model):
     name: str = Field(..., description="Environment name identifier")
     template_id: Optional[str] = Field(None, description="Template identifier")
-    git_repository: Optional[HttpUrl] = Field(None, description="Git repository URL")
+    git_repository: Optional[HttpUrlStr] = Field(None, description="Git repository URL")
     ref: Optional[str] = Field(None, description="Git ref")
     image: Optional[str] = Field(None, description="Container image override")
     start_command: Optional[str] = Field(None, description="Start command")
@@ -25,14 +44,14 @@ class WorkspaceCreateRequest(BaseModel):
     mode: Optional[Literal["personal", "team"]] = Field(default="personal", description="Workspace mode")
 
 
-class WorkspaceCreateResponse(BaseModel):
+class WorkspaceCreateResponse(_Model):
     id: str
     status: str
     namespace: Optional[str] = None
     ideUrl: Optional[str] = None
 
 
-class WorkspaceItem(BaseModel):
+class WorkspaceItem(_Model):
     id: str
     userName: str
     status: Optional[str] = None
@@ -42,11 +61,11 @@ class WorkspaceItem(BaseModel):
     templateId: Optional[str] = None
 
 
-class AdminBatchCreateRequest(BaseModel):
+class AdminBatchCreateRequest(_Model):
     name: str
     users: List[str]
     template_id: Optional[str] = None
-    git_repository: Optional[HttpUrl] = None
+    git_repository: Optional[HttpUrlStr] = None
     ref: Optional[str] = None
     image: Optional[str] = None
     start_command: Optional[str] = None
@@ -56,6 +75,6 @@ class AdminBatchCreateRequest(BaseModel):
     mode: Optional[Literal["personal", "team"]] = "personal"
 
 
-class AdminBatchCreateResponse(BaseModel):
+class AdminBatchCreateResponse(_Model):
     created: List[WorkspaceCreateResponse]
     failed: List[str]
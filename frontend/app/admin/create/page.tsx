@@ -5,7 +5,7 @@ import { useRouter } from "next/navigation"
 import { Button } from "@/components/ui/button"
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from "@/components/ui/card"
 import { Input } from "@/components/ui/input"
-import { createAdminAccount, createUserAccount, createUserWithEnvironmentStream, getTemplates, type StreamEvent, type ProjectTemplate } from "@/lib/api"
+import { createAdminAccount, createUserAccount, createUserWithEnvironmentStream, getTemplates, type StreamEvent, type ProjectTemplateSummary } from "@/lib/api"
 
 export default function AdminCreatePage() {
   const router = useRouter()
@@ -14,7 +14,7 @@ export default function AdminCreatePage() {
   const [isEnvironmentSet, setIsEnvironmentSet] = useState(false)
 
   const [userId, setUserId] = useState("")
-  const [templates, setTemplates] = useState<ProjectTemplate[]>([])
+  const [templates, setTemplates] = useState<ProjectTemplateSummary[]>([])
   const [selectedTemplate, setSelectedTemplate] = useState<number>(0)
   const [isLoadingTemplates, setIsLoadingTemplates] = useState(false)
 
@@ -380,6 +380,12 @@ export interface ProjectTemplate {
   updated_at?: string;
 }
 
+// 템플릿 목록 항목 (대용량 설정 필드 제외)
+export type ProjectTemplateSummary = Pick<
+  ProjectTemplate,
+  "id" | "name" | "description" | "version" | "status" | "is_public" | "usage_count" | "created_at" | "updated_at"
+>;
+
 export interface PodInsight {
   namespace: string;
   name: string;
@@ -421,7 +427,7 @@ export interface EnvironmentInsight {
 export async function getTemplates(
   page: number = 1,
   size: number = 50
-): Promise<ApiResponse<{ templates: ProjectTemplate[]; total: number; page: number; size: number }>> {
+): Promise<ApiResponse<{ templates: ProjectTemplateSummary[]; total: number; page: number; size: number }>> {
   try {
     const response = await fetch(
       `${API_BASE_URL}/templates/?page=${page}&size=${size}`